@@ -0,0 +1,108 @@
+"""Color lookups and frames of a heatmap with more color combinations than the terminal has pairs.
+
+The lookup of a combination already allocated is timed against the lookup of a named color, for
+terminal color indexes and for RGB colors. A heatmap of rows drawing each cell with a color pair
+for its value is then rendered with values drifting every frame, with fewer and more combinations
+in view than the color pairs. Pairs are taken back from the least recently used combinations, and
+the rows that drew with them are drawn again. Run with `python -m benchmarks.colors`.
+"""
+from __future__ import annotations
+
+import curses
+import time
+
+from tktui.tktui import TkTui
+from tktui.backends import MemoryBackend
+from tktui.widget import Widget
+
+SCREEN_HEIGHT = 50
+SCREEN_WIDTH = 160
+LOOKUPS = 200_000
+FRAMES = 200
+# the combinations a heatmap of 256 color pairs shows, as many fg colors on 16 bg colors
+COMBINATIONS = (64, 240, 1_024)
+
+
+class CountingBackend(MemoryBackend):
+    def __init__(self, height: int, width: int) -> None:
+        super().__init__(height, width)
+        self.pairs_given = 0
+
+    def init_pair(self, pair_number: int, fg: int, bg: int) -> None:
+        super().init_pair(pair_number, fg, bg)
+        self.pairs_given += 1
+
+
+class HeatRow(Widget):
+    """A row of the heatmap, each cell drawn with the colors of its value."""
+    def __init__(self, parent: TkTui, y: int, combinations: int) -> None:
+        super().__init__(parent, 0, y, 1, SCREEN_WIDTH, border=False)
+        self.combinations = combinations
+        self.values = [(y * SCREEN_WIDTH + x) % combinations for x in range(SCREEN_WIDTH)]
+        self.draws = 0
+
+    def redraw(self) -> None:
+        super().redraw()
+        self.draws += 1
+        win = self.box.win
+        color = self.color
+        for x, value in enumerate(self.values[:-1]):
+            win.addstr(0, x, "#", color(value // 16, value % 16))
+
+
+def lookups() -> None:
+    backend = MemoryBackend(SCREEN_HEIGHT, SCREEN_WIDTH)
+    app = TkTui(backend=backend)
+    colors = app.colors
+    colors.pair(curses.COLOR_RED, curses.COLOR_BLACK)
+    colors.pair("#ff8000", "#000000")
+
+    for name, lookup in (
+        ("named", lambda: colors["WHITE_BLUE"]),
+        ("(fg, bg)", lambda: colors.pair(curses.COLOR_RED, curses.COLOR_BLACK)),
+        ("RGB", lambda: colors.pair("#ff8000", "#000000")),
+    ):
+        start = time.perf_counter()
+        for _ in range(LOOKUPS):
+            lookup()
+        elapsed = (time.perf_counter() - start) / LOOKUPS
+        print(f"{name:>9} {elapsed * 1e9:>9.0f}")
+    backend.close()
+
+
+def heatmap(combinations: int) -> tuple[float, float, float]:
+    """Time per frame, pairs given other colors and rows drawn per frame."""
+    backend = CountingBackend(SCREEN_HEIGHT, SCREEN_WIDTH)
+    app = TkTui(backend=backend)
+    rows = [HeatRow(app, y, combinations) for y in range(SCREEN_HEIGHT)]
+    for row in rows:
+        row.redraw()
+    app.render()
+
+    pairs_given = backend.pairs_given
+    start = time.perf_counter()
+    for frame in range(FRAMES):
+        # a few rows get new values every frame
+        for row in rows[frame % 5::5]:
+            row.values = [(value + 1) % combinations for value in row.values]
+            row.redraw()
+        app.render()
+    elapsed = (time.perf_counter() - start) / FRAMES
+    draws = sum(row.draws for row in rows) - len(rows)
+
+    backend.close()
+    return elapsed, (backend.pairs_given - pairs_given) / FRAMES, draws / FRAMES
+
+
+def main() -> None:
+    print(f"{'lookup':>9} {'ns':>9}")
+    lookups()
+
+    print(f"\n{'combinations':>12} {'us/frame':>9} {'pairs given/frame':>18} {'rows drawn/frame':>17}")
+    for combinations in COMBINATIONS:
+        elapsed, pairs_given, draws = heatmap(combinations)
+        print(f"{combinations:>12} {elapsed * 1e6:>9.0f} {pairs_given:>18.1f} {draws:>17.1f}")
+
+
+if __name__ == "__main__":
+    main()
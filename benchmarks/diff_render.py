@@ -0,0 +1,76 @@
+"""Bytes written and time per frame of the cell diff renderer.
+
+A screen of counter labels where a few of them tick every frame. The cell diff output is compared
+with repainting every dirty window in full, which is what refreshing the windows one by one costs
+when their content is not diffed. Run with `python -m benchmarks.diff_render`.
+"""
+from __future__ import annotations
+
+import random
+import time
+
+from tktui.tktui import TkTui
+from tktui.backends import CellDiffRenderer, MemoryBackend
+from tktui.backends.memory import _Buffer
+from tktui.widgets.label import Label
+
+SCREEN_HEIGHT = 60
+SCREEN_WIDTH = 200
+FRAMES = 200
+# how many of the labels change each frame
+UPDATES_PER_FRAME = (1, 10, 100)
+
+
+def window_repaint_bytes(renderer: CellDiffRenderer, labels: list[Label]) -> int:
+    """Output of repainting the windows of the labels, a cursor move and a full row at a time."""
+    total = 0
+    for label in labels:
+        rect = label.box.rect
+        move = len(f"\x1b[{rect.y + 1};{rect.x + 1}H")
+        sgr = len(renderer.sgr(label.box.default_bkgd))
+        total += rect.height * (move + sgr + rect.width)
+    return total
+
+
+def main() -> None:
+    rng = random.Random(0)
+    print(f"{'updates':>8} {'repaint (B/frame)':>18} {'diff (B/frame)':>15} {'diff (us/frame)':>16}")
+
+    for updates in UPDATES_PER_FRAME:
+        backend = MemoryBackend(SCREEN_HEIGHT, SCREEN_WIDTH)
+        app = TkTui(backend=backend)
+        labels = [
+            Label(app, x * 10, y * 3, text="0000")
+            for y in range(SCREEN_HEIGHT // 3)
+            for x in range(SCREEN_WIDTH // 10)
+        ]
+
+        renderer = CellDiffRenderer(backend.pair_content)
+        front = _Buffer(SCREEN_HEIGHT, SCREEN_WIDTH)
+        app._root.draw()
+        app.render()
+        renderer.render(front, backend.screen, range(SCREEN_HEIGHT))
+
+        repaint_bytes = diff_bytes = 0
+        diff_time = 0.0
+        for frame in range(FRAMES):
+            changed = rng.sample(labels, updates)
+            for label in changed:
+                label.update_text(f"{frame:04}")
+            app.render()
+
+            start = time.perf_counter()
+            out = renderer.render(front, backend.screen, range(SCREEN_HEIGHT))
+            diff_time += time.perf_counter() - start
+
+            diff_bytes += len(out.encode())
+            repaint_bytes += window_repaint_bytes(renderer, changed)
+
+        print(
+            f"{updates:>8} {repaint_bytes / FRAMES:>18.0f} {diff_bytes / FRAMES:>15.0f}"
+            f" {diff_time / FRAMES * 1e6:>16.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""Time of laying out large grids, cold and after small changes.
+
+A frame holds an n x n grid of widgets with weighted columns. The cold layout measures every
+widget, a changed widget and a resized frame reuse the cached track sizes. The full relayout
+forgets the cached tracks first, which is what every change would cost without them. Run with
+`python -m benchmarks.grid_layout`.
+"""
+from __future__ import annotations
+
+import time
+
+from tktui.tktui import TkTui
+from tktui.frame import Frame
+from tktui.geometry import GridAxis, Rect
+from tktui.widget import Widget
+from tktui.backends import MemoryBackend
+
+SIDES = (10, 50, 100)
+REPEATS = 20
+
+
+def build(side: int) -> tuple[TkTui, Frame, list[Widget]]:
+    # room for the widgets to grow and the frame to shrink
+    app = TkTui(backend=MemoryBackend(2 * side + 2, 4 * side + 2))
+    frame = Frame(app)
+    for column in range(side):
+        frame.columnconfigure(column, weight=1)
+
+    widgets = []
+    for i in range(side * side):
+        widget = Widget(frame, 0, 0, 1, 1, border=False)
+        widget.grid(row=i // side, column=i % side, sticky="nsew")
+        widgets.append(widget)
+    return app, frame, widgets
+
+
+def per_layout(fn) -> float:
+    start = time.perf_counter()
+    for i in range(REPEATS):
+        fn(i)
+    return (time.perf_counter() - start) / REPEATS
+
+
+def main() -> None:
+    print(f"{'grid':>8} {'cold (ms)':>10} {'one widget (ms)':>16} {'resize (ms)':>12} {'full relayout (ms)':>19}")
+
+    for side in SIDES:
+        app, frame, widgets = build(side)
+        start = time.perf_counter()
+        app.update_layout()
+        cold = time.perf_counter() - start
+
+        # a widget in the last row grows and shrinks, the rows above it stay in place
+        widget = widgets[-1]
+
+        def change_widget(i: int) -> None:
+            widget.resize(1 + i % 2, 1)
+            app.update_layout()
+
+        # the weighted columns take the space of the frame, every widget moves
+        def resize_frame(i: int) -> None:
+            frame._place(Rect(0, 0, side, 2 * side + i % 2))
+            app._schedule_layout(frame)
+            app.update_layout()
+
+        def full_relayout(i: int) -> None:
+            frame._grid_rows, frame._grid_columns = GridAxis(), GridAxis()
+            for column in range(side):
+                frame.columnconfigure(column, weight=1)
+            frame._grid_stale.update(dict.fromkeys(widgets))
+            widget.resize(1 + i % 2, 1)
+            app.update_layout()
+
+        print(
+            f"{f'{side}x{side}':>8} {cold * 1e3:>10.2f} {per_layout(change_widget) * 1e3:>16.2f}"
+            f" {per_layout(resize_frame) * 1e3:>12.2f} {per_layout(full_relayout) * 1e3:>19.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
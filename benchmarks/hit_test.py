@@ -0,0 +1,55 @@
+"""Click latency of the mouse hit test against the number of widgets on the screen.
+
+Compares the linear scan over every subscribed widget that `TkTui.mouse_event` used to do with a
+query of the `SpatialIndex`. Run with `python -m benchmarks.hit_test`.
+"""
+from __future__ import annotations
+
+import random
+import timeit
+
+from tktui.geometry import Rect
+from tktui.spatial import SpatialIndex
+
+SCREEN_HEIGHT = 200
+SCREEN_WIDTH = 400
+WIDGET_COUNTS = (10, 100, 1_000, 10_000)
+CLICKS = 1_000
+
+
+def random_rects(count: int, rng: random.Random) -> list[Rect]:
+    rects = []
+    for _ in range(count):
+        height = rng.randint(3, 10)
+        width = rng.randint(5, 30)
+        y = rng.randrange(0, SCREEN_HEIGHT - height)
+        x = rng.randrange(0, SCREEN_WIDTH - width)
+        rects.append(Rect(y, x, height, width))
+    return rects
+
+
+def linear_scan(rects: list[Rect], y: int, x: int) -> list[Rect]:
+    return [rect for rect in rects if rect.contains(y, x)]
+
+
+def main() -> None:
+    rng = random.Random(0)
+    clicks = [(rng.randrange(SCREEN_HEIGHT), rng.randrange(SCREEN_WIDTH)) for _ in range(CLICKS)]
+
+    print(f"{'widgets':>8} {'scan (us/click)':>16} {'index (us/click)':>17} {'speedup':>8}")
+    for count in WIDGET_COUNTS:
+        rects = random_rects(count, rng)
+        index: SpatialIndex[Rect] = SpatialIndex()
+        for rect in rects:
+            index.insert(rect, rect)
+
+        scan = timeit.timeit(lambda: [linear_scan(rects, y, x) for y, x in clicks], number=1)
+        query = timeit.timeit(lambda: [index.query(y, x) for y, x in clicks], number=1)
+
+        scan_us = scan / CLICKS * 1e6
+        query_us = query / CLICKS * 1e6
+        print(f"{count:>8} {scan_us:>16.2f} {query_us:>17.2f} {scan_us / query_us:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""Throughput of typed and pasted input, rendered per key against once per batch.
+
+The text goes into a label through a key handler, or a paste handler for the bracketed paste. The
+per key case renders after every key like the loop used to. Run with
+`python -m benchmarks.input_batch`.
+"""
+from __future__ import annotations
+
+import time
+
+from tktui.tktui import TkTui
+from tktui.backends import MemoryBackend
+from tktui.widgets.label import Label
+
+SIZES = (100, 1_000, 10_000)
+
+
+def build() -> tuple[TkTui, MemoryBackend, Label]:
+    backend = MemoryBackend(40, 120)
+    app = TkTui(backend=backend)
+    label = Label(app, 0, 0, width=100, text=" ")
+    app.in_focus = label
+    app._running = True
+    app._root.draw()
+    app.render()
+    return app, backend, label
+
+
+def per_key(text: str) -> tuple[float, int]:
+    app, backend, label = build()
+    app.register_for_key_event(label, lambda event: label.update_text(chr(event.key)))
+    backend.push_key(text)
+
+    start = time.perf_counter()
+    for char in app._read_input():
+        # typed keys only, no mouse or paste
+        assert isinstance(char, int)
+        app._handle_char(char)
+        app.render()
+    return time.perf_counter() - start, backend.updates
+
+
+def batched(text: str) -> tuple[float, int]:
+    app, backend, label = build()
+    app.register_for_key_event(label, lambda event: label.update_text(chr(event.key)))
+    backend.push_key(text)
+
+    start = time.perf_counter()
+    app._process_input()
+    app.render()
+    return time.perf_counter() - start, backend.updates
+
+
+def pasted(text: str) -> tuple[float, int]:
+    app, backend, label = build()
+    app.register_for_paste_event(label, lambda event: label.update_text(event.text[-100:]))
+    backend.push_paste(text)
+
+    start = time.perf_counter()
+    app._process_input()
+    app.render()
+    return time.perf_counter() - start, backend.updates
+
+
+def main() -> None:
+    print(f"{'keys':>8} {'case':>10} {'total (ms)':>11} {'us/key':>8} {'renders':>8}")
+    for size in SIZES:
+        # no q, it quits the app
+        text = ("abcdefghijklmnoprstuvwxyz" * size)[:size]
+        for name, case in (("per key", per_key), ("batched", batched), ("pasted", pasted)):
+            total, updates = case(text)
+            print(f"{size:>8} {name:>10} {total * 1e3:>11.2f} {total / size * 1e6:>8.2f} {updates - 1:>8}")
+
+
+if __name__ == "__main__":
+    main()
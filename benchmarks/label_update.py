@@ -0,0 +1,85 @@
+"""Cells copied to the screen and time per update of a label whose text keeps changing.
+
+A counter label on a full screen is updated with values of the same width, with values changing
+width, and while packed in a frame. The label only writes the cells of the lines that changed, and
+a shrink only repaints the lines of the parent it uncovered instead of the whole parent. The cells
+staged on the virtual screen are counted against the cells of the screen. A packed frame shrink
+wraps its slaves, a label changing width moves the frame too and the lines under the frame are
+repainted. Run with `python -m benchmarks.label_update`.
+"""
+from __future__ import annotations
+
+import time
+
+from tktui.tktui import TkTui
+from tktui.frame import Frame
+from tktui.backends import MemoryBackend
+from tktui.widgets.label import Label
+
+SCREEN_HEIGHT = 60
+SCREEN_WIDTH = 200
+UPDATES = 2_000
+
+
+def same_width(update: int) -> str:
+    return f"processed {update:>6} items"
+
+
+def changing_width(update: int) -> str:
+    # 1, 12, 123 ... digits, growing and shrinking the label
+    return f"processed {str(update)[:1 + update % 4]} items"
+
+
+def run(text, packed: bool) -> tuple[float, float]:
+    backend = MemoryBackend(SCREEN_HEIGHT, SCREEN_WIDTH)
+    app = TkTui(backend=backend)
+    # the rest of the screen is covered by labels that do not change
+    for y in range(0, SCREEN_HEIGHT - 3, 3):
+        for x in range(40, SCREEN_WIDTH - 20, 20):
+            Label(app, x, y, text=f"static {x:03},{y:02}")
+
+    if packed:
+        frame = Frame(app, height=SCREEN_HEIGHT, width=38, border=True)
+        frame.pack(side="left", anchor="nw")
+        label = Label(frame, 0, 0, text=text(0))
+        label.pack(anchor="w")
+        Label(frame, 0, 0, text="below the counter").pack(anchor="w")
+    else:
+        label = Label(app, 0, 0, text=text(0))
+    app.render()
+
+    staged = 0
+    stage = backend._stage
+
+    def counting_stage(buffer, src_y, src_x, height, width, dst_y, dst_x) -> None:
+        nonlocal staged
+        staged += height * width
+        stage(buffer, src_y, src_x, height, width, dst_y, dst_x)
+
+    backend._stage = counting_stage
+    start = time.perf_counter()
+    for update in range(1, UPDATES + 1):
+        label.update_text(text(update))
+        app.render()
+    elapsed = (time.perf_counter() - start) / UPDATES
+
+    backend.close()
+    return staged / UPDATES, elapsed
+
+
+def main() -> None:
+    print(f"screen of {SCREEN_HEIGHT * SCREEN_WIDTH} cells")
+    print(f"{'case':>24} {'staged (cells/update)':>22} {'time (us/update)':>17}")
+    cases = (
+        ("same width", same_width, False),
+        ("changing width", changing_width, False),
+        ("packed, same width", same_width, True),
+        ("packed, changing width", changing_width, True),
+    )
+    for name, text, packed in cases:
+        staged, elapsed = run(text, packed)
+        print(f"{name:>24} {staged:>22.0f} {elapsed * 1e6:>17.1f}")
+
+
+if __name__ == "__main__":
+    main()
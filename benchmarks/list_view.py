@@ -0,0 +1,62 @@
+"""Memory and time per scroll step of a ListView against its number of rows.
+
+The rows are made up by the row provider, the list only keeps the ones in view. Memory is what
+creating the list allocated, measured with tracemalloc. Run with `python -m benchmarks.list_view`.
+"""
+from __future__ import annotations
+
+import time
+import tracemalloc
+
+from tktui.tktui import TkTui
+from tktui.backends import MemoryBackend
+from tktui.widgets.list_view import ListView
+
+SCREEN_HEIGHT = 60
+SCREEN_WIDTH = 120
+STEPS = 1_000
+# even the shortest list is taller than the screen by more than the steps, every step scrolls
+ROW_COUNTS = (2_000, 10_000, 1_000_000, 10_000_000)
+
+
+def row_text(row: int) -> str:
+    return f"job {row:>8}  queued  worker-{row % 64:02}"
+
+
+def run(row_count: int) -> tuple[int, float, float]:
+    backend = MemoryBackend(SCREEN_HEIGHT, SCREEN_WIDTH)
+    app = TkTui(backend=backend)
+
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    list_view = ListView(app, 0, 0, SCREEN_HEIGHT, SCREEN_WIDTH, row_count=row_count, row_provider=row_text)
+    app.render()
+    memory = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+
+    start = time.perf_counter()
+    for _ in range(STEPS):
+        list_view.yview_scroll(1)
+        app.render()
+    scroll = (time.perf_counter() - start) / STEPS
+
+    start = time.perf_counter()
+    for step in range(STEPS):
+        # jump anywhere in the list, every row in view is new
+        list_view.yview_moveto((step * 7919 % STEPS) / STEPS)
+        app.render()
+    jump = (time.perf_counter() - start) / STEPS
+
+    backend.close()
+    return memory, scroll, jump
+
+
+def main() -> None:
+    print(f"{'rows':>10} {'memory (B)':>11} {'scroll (us/step)':>17} {'jump (us/step)':>15}")
+    for row_count in ROW_COUNTS:
+        memory, scroll, jump = run(row_count)
+        print(f"{row_count:>10} {memory:>11} {scroll * 1e6:>17.1f} {jump * 1e6:>15.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""Throughput and memory of a LogView tailing a stream of lines.
+
+Lines are fed in batches, each batch being one frame drawn by the loop, and the time per line
+includes making the line and drawing. A frame costs about the same however many lines came in, only the rows in view
+are drawn. The ring buffer keeps memory flat however many lines went through it, memory is what is
+still allocated after the stream, measured with tracemalloc. Run with
+`python -m benchmarks.log_view`.
+"""
+from __future__ import annotations
+
+import time
+import tracemalloc
+
+from tktui.tktui import TkTui
+from tktui.backends import MemoryBackend
+from tktui.widgets.log_view import LogView
+
+SCREEN_HEIGHT = 50
+SCREEN_WIDTH = 160
+MAX_LINES = 10_000
+TOTAL_LINES = (100_000, 1_000_000)
+# lines fed per frame, e.g. 10k lines per second at 1000, 100 and 10 frames per second
+LINES_PER_FRAME = (10, 100, 1_000)
+FRAMES = 500
+
+
+def log_line(n: int) -> str:
+    return f"2024-05-01T12:00:{n % 60:02}.{n % 1000:03}Z INFO worker-{n % 32:02} request {n} served in {n % 97} ms"
+
+
+def feed(total: int, per_frame: int, trace: bool) -> tuple[float, int]:
+    """Time per line, and with trace the bytes still allocated after the stream."""
+    backend = MemoryBackend(SCREEN_HEIGHT, SCREEN_WIDTH)
+    app = TkTui(backend=backend)
+
+    if trace:
+        tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    log_view = LogView(app, 0, 0, SCREEN_HEIGHT, SCREEN_WIDTH, max_lines=MAX_LINES)
+    start = time.perf_counter()
+    for frame in range(total // per_frame):
+        log_view.extend(log_line(n) for n in range(frame * per_frame, (frame + 1) * per_frame))
+        # an iteration of the loop: the idle callbacks draw the new lines, then the screen
+        app._run_timers()
+        app.render()
+    elapsed = (time.perf_counter() - start) / total
+    memory = tracemalloc.get_traced_memory()[0] - before
+    if trace:
+        tracemalloc.stop()
+
+    backend.close()
+    return elapsed, memory
+
+
+def main() -> None:
+    print(f"ring of {MAX_LINES} lines, {SCREEN_HEIGHT - 2} in view")
+    print(f"{'lines':>9} {'memory (KiB)':>13}")
+    for total in TOTAL_LINES:
+        _, memory = feed(total, max(LINES_PER_FRAME), trace=True)
+        print(f"{total:>9} {memory / 1024:>13.0f}")
+
+    print(f"\n{'per frame':>10} {'us/frame':>9} {'us/line':>8} {'lines/s':>10}")
+    for per_frame in LINES_PER_FRAME:
+        elapsed, _ = feed(FRAMES * per_frame, per_frame, trace=False)
+        print(
+            f"{per_frame:>10} {elapsed * per_frame * 1e6:>9.0f} {elapsed * 1e6:>8.2f}"
+            f" {1 / elapsed:>10.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
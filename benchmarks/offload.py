@@ -0,0 +1,76 @@
+"""Responsiveness of the loop with a slow key handler, inline against offloaded to an executor.
+
+A burst of keys reaches a handler taking HANDLER_MS, like a query made on every key typed in a
+search box. Inline the loop is blocked for the whole burst. Offloaded it only submits the calls,
+the results come back through call_soon_threadsafe, and with cancel_stale only the result for the
+last key is shown. Run with `python -m benchmarks.offload`.
+"""
+from __future__ import annotations
+
+import time
+
+from tktui.tktui import TkTui
+from tktui.backends import MemoryBackend
+from tktui.events import Event, KeyEvent
+from tktui.widgets.label import Label
+
+HANDLER_MS = 20
+KEYS = 50
+
+
+def search(event: KeyEvent) -> str:
+    time.sleep(HANDLER_MS / 1000)
+    return f"results for {chr(event.key)}"
+
+
+def run(mode: str) -> tuple[float, float, int]:
+    """Time the loop was blocked by the burst, time until the results are shown and the number
+    of results shown."""
+    backend = MemoryBackend(10, 40)
+    app = TkTui(backend=backend)
+    label = Label(app, 0, 0, text="results for -")
+    app.in_focus = label
+    shown = 0
+    last = ""
+
+    def show(event: Event, result: str) -> None:
+        nonlocal shown, last
+        shown += 1
+        last = result
+        label.update_text(result)
+
+    if mode == "inline":
+        app.register_for_key_event(label, lambda event: show(event, search(event)))
+    else:
+        app.register_for_key_event(label, app.offload(search, done=show, cancel_stale=mode == "cancel stale"))
+
+    keys = [ord("A") + key for key in range(KEYS)]
+    expected = f"results for {chr(keys[-1])}"
+    start = time.perf_counter()
+    for key in keys:
+        app.key_event(key)
+    blocked = time.perf_counter() - start
+
+    # the loop, until the result of the last key is shown. Without cancel_stale all the results
+    # are shown, in the order the calls end
+    while (shown < KEYS) if mode == "offload" else (last != expected):
+        app._wait(0.1)
+        app._run_posted()
+        app.render()
+    done = time.perf_counter() - start
+
+    app._shutdown_executor()
+    backend.close()
+    return blocked, done, shown
+
+
+def main() -> None:
+    print(f"{KEYS} keys, {HANDLER_MS} ms handler")
+    print(f"{'mode':>13} {'blocked (ms)':>13} {'shown (ms)':>11} {'results shown':>14}")
+    for mode in ("inline", "offload", "cancel stale"):
+        blocked, done, shown = run(mode)
+        print(f"{mode:>13} {blocked * 1e3:>13.1f} {done * 1e3:>11.1f} {shown:>14}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""Cost of a window dragged to resize the terminal, debounced against resizing on every event.
+
+The terminal size changes EVENTS times EVENT_MS apart, like a window manager drag. The screen has
+a packed sidebar and body with a grid of labels, and widgets placed at positions. Rebuilding the
+whole tree at the new size on every event is compared with resizing the windows in place on every
+event and with the debounced resize, which collapses the burst into a few resizes. The time is the
+time spent in the app, without the time waited between events. Run with
+`python -m benchmarks.resize`.
+"""
+from __future__ import annotations
+
+import time
+
+from tktui.tktui import TkTui
+from tktui.frame import Frame
+from tktui.backends import MemoryBackend
+from tktui.widget import Widget
+from tktui.widgets.label import Label
+
+SCREEN_HEIGHT = 50
+SCREEN_WIDTH = 160
+ROWS = 12
+COLUMNS = 8
+EVENTS = 100
+EVENT_MS = 5
+
+
+def build(backend: MemoryBackend) -> TkTui:
+    app = TkTui(backend=backend)
+    app._running = True
+    sidebar = Frame(app, border=True, border_title="sidebar")
+    sidebar.req_width = 20
+    sidebar.pack(side="left", fill="y")
+    body = Frame(app, border=True, border_title="body")
+    body.pack(side="left", fill="both", expand=True)
+    for row in range(ROWS):
+        for column in range(COLUMNS):
+            Label(body, 0, 0, text=f"cell {row:02},{column}").grid(row=row, column=column)
+    for y in range(0, backend.height - 4, 4):
+        Widget(sidebar, 1, y + 1, 3, 18, border_title=f"item {y // 4}")
+    app.render()
+    return app
+
+
+def sizes() -> list[tuple[int, int]]:
+    # shrinking and growing back, the height wobbling
+    steps = [i if i < EVENTS // 2 else EVENTS - i for i in range(EVENTS)]
+    return [(SCREEN_HEIGHT - step % 7, SCREEN_WIDTH - step) for step in steps]
+
+
+def drag(mode: str) -> tuple[float, int, int]:
+    """Time spent in the app, resizes applied and renders."""
+    backend = MemoryBackend(SCREEN_HEIGHT, SCREEN_WIDTH)
+    app = build(backend)
+    updates = backend.updates
+    applied = 0
+    # the rebuilt apps render once each
+    rebuilt = 0
+    elapsed = 0.0
+
+    def root_size() -> tuple[int, int]:
+        return (app._root.box.height, app._root.box.width)
+
+    for height, width in sizes():
+        size = root_size()
+        start = time.perf_counter()
+        if mode == "rebuild":
+            backend.close()
+            backend = MemoryBackend(height, width)
+            app = build(backend)
+            applied += 1
+            rebuilt += 1
+        elif mode == "in place":
+            backend.set_terminal_size(height, width)
+            backend.flushinp()
+            app._apply_resize()
+            app.render()
+        else:
+            backend.set_terminal_size(height, width)
+            app._process_input()
+            app._run_timers()
+            app.render()
+        elapsed += time.perf_counter() - start
+        if mode != "rebuild":
+            applied += root_size() != size
+        time.sleep(EVENT_MS / 1000)
+
+    if mode == "debounced":
+        # the last resize, once the drag is over
+        while app._resize_id is not None:
+            time.sleep(EVENT_MS / 1000)
+            size = root_size()
+            start = time.perf_counter()
+            app._run_timers()
+            app.render()
+            elapsed += time.perf_counter() - start
+            applied += root_size() != size
+
+    renders = rebuilt or backend.updates - updates
+    backend.close()
+    return elapsed, applied, renders
+
+
+def main() -> None:
+    print(f"{EVENTS} resize events {EVENT_MS} ms apart, {ROWS * COLUMNS} labels")
+    print(f"{'mode':>10} {'app time (ms)':>14} {'resizes':>8} {'renders':>8}")
+    for mode in ("rebuild", "in place", "debounced"):
+        elapsed, applied, renders = drag(mode)
+        print(f"{mode:>10} {elapsed * 1e3:>14.0f} {applied:>8} {renders:>8}")
+
+
+if __name__ == "__main__":
+    main()
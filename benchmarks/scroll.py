@@ -0,0 +1,58 @@
+"""Time per scroll step of a ScrollFrame against the size of its content.
+
+A scroll frame of labels is scrolled a line at a time and rendered. Scrolling only copies the part
+of the pad in view, which is compared with drawing all the content again on every step, what a
+frame without a pad would have to do. Run with `python -m benchmarks.scroll`.
+"""
+from __future__ import annotations
+
+import time
+
+from tktui.tktui import TkTui
+from tktui.scroll_frame import ScrollFrame
+from tktui.backends import MemoryBackend
+from tktui.widgets.label import Label
+
+SCREEN_HEIGHT = 40
+SCREEN_WIDTH = 120
+LABEL_COUNTS = (100, 1_000, 5_000)
+STEPS = 200
+# drawing everything again is much slower, fewer steps of it are timed
+REDRAW_STEPS = 10
+
+
+def run(count: int) -> tuple[float, float]:
+    backend = MemoryBackend(SCREEN_HEIGHT, SCREEN_WIDTH)
+    app = TkTui(backend=backend)
+    scroll_frame = ScrollFrame(app, height=SCREEN_HEIGHT, width=SCREEN_WIDTH, border=True)
+    scroll_frame.pack(fill="both", expand=True)
+    for i in range(count):
+        Label(scroll_frame, 0, 0, text=f"label {i:05}").pack(anchor="w")
+    app.render()
+
+    start = time.perf_counter()
+    for _ in range(STEPS):
+        scroll_frame.yview_scroll(1)
+        app.render()
+    scroll = (time.perf_counter() - start) / STEPS
+
+    start = time.perf_counter()
+    for _ in range(REDRAW_STEPS):
+        scroll_frame.yview_scroll(1)
+        scroll_frame.redraw()
+        app.render()
+    redraw = (time.perf_counter() - start) / REDRAW_STEPS
+
+    backend.close()
+    return scroll, redraw
+
+
+def main() -> None:
+    print(f"{'labels':>8} {'scroll (us/step)':>17} {'redraw all (us/step)':>21}")
+    for count in LABEL_COUNTS:
+        scroll, redraw = run(count)
+        print(f"{count:>8} {scroll * 1e6:>17.1f} {redraw * 1e6:>21.1f}")
+
+
+if __name__ == "__main__":
+    main()
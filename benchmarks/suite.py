@@ -0,0 +1,267 @@
+"""Benchmarks of the tktui hot paths over a matrix of widget counts and nesting depths.
+
+Every case runs headless on a MemoryBackend and the results are written as JSON so that runs
+can be compared against each other. Run with `python -m benchmarks.suite [-o results.json]`.
+"""
+from __future__ import annotations
+
+import argparse
+from dataclasses import dataclass, asdict
+import curses
+import json
+import math
+import platform
+import random
+import sys
+import time
+import tracemalloc
+from typing import Callable
+
+from tktui.tktui import TkTui
+from tktui.frame import Frame
+from tktui.widget import Widget
+from tktui.backends import MemoryBackend
+
+WIDGET_COUNTS = (10, 100, 1_000, 10_000)
+DEPTHS = (1, 10, 50)
+EVENTS = 1_000
+
+
+@dataclass
+class Result:
+    case: str
+    widgets: int
+    depth: int
+    ops: int
+    total: float
+    unit: str = "s"
+
+    @property
+    def per_op(self) -> float:
+        return self.total / self.ops
+
+
+@dataclass
+class Scene:
+    app: TkTui
+    backend: MemoryBackend
+    frame: Frame
+    widgets: list[Widget]
+
+
+def screen_side(count: int) -> int:
+    """Side of a square screen fitting count 1x1 widgets."""
+    return max(24, math.ceil(math.sqrt(count)))
+
+
+def build_frames(app: TkTui, depth: int) -> Frame:
+    """Nest depth frames in the root and return the innermost one."""
+    frame = app._root
+    for _ in range(depth):
+        frame = Frame(frame)
+    return frame
+
+
+def build_widgets(frame: Frame, count: int, side: int) -> list[Widget]:
+    return [Widget(frame, i % side, i // side, 1, 1, border=False) for i in range(count)]
+
+
+def build_scene(count: int, depth: int) -> Scene:
+    side = screen_side(count)
+    backend = MemoryBackend(side, side)
+    app = TkTui(backend=backend)
+    frame = build_frames(app, depth)
+    return Scene(app, backend, frame, build_widgets(frame, count, side))
+
+
+def timed(fn: Callable[[], object]) -> float:
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def bench_widget_construction(count: int, depth: int) -> Result:
+    side = screen_side(count)
+    app = TkTui(backend=MemoryBackend(side, side))
+    frame = build_frames(app, depth)
+    return Result("widget_construction", count, depth, count, timed(lambda: build_widgets(frame, count, side)))
+
+
+def bench_frame_construction(count: int, depth: int) -> Result:
+    side = screen_side(count)
+    app = TkTui(backend=MemoryBackend(side, side))
+    return Result("frame_construction", count, depth, depth, timed(lambda: build_frames(app, depth)))
+
+
+def bench_mouse_event(count: int, depth: int) -> Result:
+    scene = build_scene(count, depth)
+    for widget in scene.widgets:
+        scene.app.register_for_mouse_event(widget, lambda event: None)
+
+    rng = random.Random(0)
+    for _ in range(EVENTS):
+        widget = rng.choice(scene.widgets)
+        scene.backend.push_mouse(widget.box.x, widget.box.y, curses.BUTTON1_CLICKED)
+
+    def dispatch() -> None:
+        for _ in range(EVENTS):
+            scene.app.mouse_event()
+
+    return Result("mouse_event", count, depth, EVENTS, timed(dispatch))
+
+
+def bench_mouse_motion(count: int, depth: int) -> Result:
+    """A drag over the widgets read in one go, collapsed into its last position."""
+    scene = build_scene(count, depth)
+    for widget in scene.widgets:
+        scene.app.register_for_mouse_event(widget, lambda event: None, motion=True)
+
+    rng = random.Random(0)
+    for _ in range(EVENTS):
+        widget = rng.choice(scene.widgets)
+        scene.backend.push_mouse(widget.box.x, widget.box.y, curses.REPORT_MOUSE_POSITION)
+
+    def dispatch() -> None:
+        scene.app._running = True
+        scene.app._process_input()
+
+    return Result("mouse_motion", count, depth, EVENTS, timed(dispatch))
+
+
+def bench_key_event(count: int, depth: int) -> Result:
+    scene = build_scene(count, depth)
+    for widget in scene.widgets:
+        scene.app.register_for_key_event(widget, lambda event: None)
+    # the key events go up the frames the widget in focus is nested in
+    scene.app.in_focus = scene.widgets[-1]
+
+    def dispatch() -> None:
+        for _ in range(EVENTS):
+            scene.app.key_event(ord("a"))
+
+    return Result("key_event", count, depth, EVENTS, timed(dispatch))
+
+
+def bench_bind(count: int, depth: int) -> Result:
+    """Key sequences dispatched against a binding per widget, the same as a key_event handler each."""
+    scene = build_scene(count, depth)
+    for i, widget in enumerate(scene.widgets):
+        # a two key chord per widget, all in the global bindings
+        scene.app.bind(None, f"<Control-x>{chr(0x4e00 + i)}", lambda event: None)
+
+    rng = random.Random(0)
+    keys = [0x4e00 + rng.randrange(count) for _ in range(EVENTS)]
+
+    def dispatch() -> None:
+        for key in keys:
+            scene.app._handle_char(24)
+            scene.app._handle_char(key)
+
+    return Result("bind", count, depth, EVENTS, timed(dispatch))
+
+
+def bench_pack(count: int, depth: int) -> Result:
+    scene = build_scene(count, depth)
+
+    def pack() -> None:
+        for widget in scene.widgets:
+            widget.pack()
+        scene.app.update_layout()
+
+    return Result("pack", count, depth, count, timed(pack))
+
+
+def bench_grid(count: int, depth: int) -> Result:
+    scene = build_scene(count, depth)
+    side = screen_side(count)
+
+    def grid() -> None:
+        for i, widget in enumerate(scene.widgets):
+            widget.grid(row=i // side, column=i % side)
+        scene.app.update_layout()
+
+    return Result("grid", count, depth, count, timed(grid))
+
+
+def bench_render(count: int, depth: int) -> Result:
+    scene = build_scene(count, depth)
+
+    def render() -> None:
+        frame: Frame | None = scene.frame
+        while frame is not None:
+            frame.draw()
+            frame = frame.parent
+        for widget in scene.widgets:
+            widget.draw()
+        scene.app.render()
+
+    return Result("render", count, depth, 1, timed(render))
+
+
+def bench_memory(count: int, depth: int) -> Result:
+    """Bytes allocated per widget."""
+    side = screen_side(count)
+    app = TkTui(backend=MemoryBackend(side, side))
+    frame = build_frames(app, depth)
+
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    widgets = build_widgets(frame, count, side)
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+
+    allocated = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+    del widgets
+    return Result("memory", count, depth, count, allocated, unit="bytes")
+
+
+BENCHMARKS: dict[str, Callable[[int, int], Result]] = {
+    "widget_construction": bench_widget_construction,
+    "frame_construction": bench_frame_construction,
+    "mouse_event": bench_mouse_event,
+    "mouse_motion": bench_mouse_motion,
+    "key_event": bench_key_event,
+    "bind": bench_bind,
+    "pack": bench_pack,
+    "grid": bench_grid,
+    "render": bench_render,
+    "memory": bench_memory,
+}
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=(__doc__ or "").partition("\n")[0])
+    parser.add_argument("-w", "--widgets", type=int, nargs="+", default=WIDGET_COUNTS)
+    parser.add_argument("-d", "--depths", type=int, nargs="+", default=DEPTHS)
+    parser.add_argument("-b", "--bench", choices=BENCHMARKS, nargs="+", default=list(BENCHMARKS))
+    parser.add_argument("-o", "--output", help="file to write the JSON results to, stdout by default")
+    args = parser.parse_args(argv)
+
+    results = []
+    for name in args.bench:
+        for depth in args.depths:
+            for count in args.widgets:
+                result = BENCHMARKS[name](count, depth)
+                results.append({**asdict(result), "per_op": result.per_op})
+
+                if result.unit == "s":
+                    per_op = f"{result.per_op * 1e6:12.2f} us/op"
+                else:
+                    per_op = f"{result.per_op:12.0f} {result.unit}/op"
+                print(f"{result.case:>20} widgets={count:<6} depth={depth:<3} {per_op}", file=sys.stderr)
+
+    report = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""Memory and time of measuring text for labels whose value keeps changing.
+
+The first table is what measuring in cells costs over counting characters as before, which is
+cheaper but wrong for wide and combining text. A live label goes through a new value every update,
+neither cache hits and the memory they keep has to stay the same however many updates are made.
+It is larger for the cells, which keep 1024 lines where the characters kept 128 texts.
+The panel is where the line widths win: a multi line text with a single changing line only
+measures that line. Memory is measured apart from the time, tracemalloc slows the allocations down.
+Run with `python -m benchmarks.text_measure`.
+"""
+from __future__ import annotations
+
+from functools import lru_cache
+import time
+import tracemalloc
+from typing import Callable
+
+from tktui import text as text_module
+from tktui.text import TextMetrics, text_size
+
+UPDATES = (10_000, 100_000, 500_000)
+# a status panel where a single line changes at each update
+PANEL_LINES = 40
+PANEL_UPDATES = 20_000
+
+
+@lru_cache
+def whole_text_size(text: str) -> tuple[int, int]:
+    """The measurement of the texts before, in characters and cached on the whole text."""
+    lines = text.strip().split("\n")
+    return (len(lines), max(len(line) for line in lines))
+
+
+def ticker(updates: int) -> list[str]:
+    """The values of a counter label, each one different."""
+    return [f"{value * 7919 % 10_000_000:>8} 件 処理済み" for value in range(updates)]
+
+
+def clear_caches() -> None:
+    whole_text_size.cache_clear()
+    text_module._measure.cache_clear()
+    text_module.char_width.cache_clear()
+    text_module._is_extend.cache_clear()
+
+
+def retained(measure: Callable[[str], object], texts: list[str]) -> int:
+    """Bytes still allocated after measuring all the texts, starting from empty caches."""
+    clear_caches()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    for text in texts:
+        measure(text)
+    memory = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    return memory
+
+
+def per_text(measure: Callable[[str], object], texts: list[str]) -> float:
+    """Seconds per text measured, starting from empty caches."""
+    clear_caches()
+    start = time.perf_counter()
+    for text in texts:
+        measure(text)
+    return (time.perf_counter() - start) / len(texts)
+
+
+def main() -> None:
+    print(f"{'updates':>8} {'chars (KiB)':>12} {'cells (KiB)':>12} {'chars (us)':>11} {'cells (us)':>11}")
+    for updates in UPDATES:
+        texts = ticker(updates)
+        old_memory = retained(whole_text_size, texts)
+        new_memory = retained(text_size, texts)
+        old_time = per_text(whole_text_size, texts)
+        new_time = per_text(text_size, texts)
+        clear_caches()
+        print(
+            f"{updates:>8} {old_memory / 1024:>12.0f} {new_memory / 1024:>12.0f}"
+            f" {old_time * 1e6:>11.2f} {new_time * 1e6:>11.2f}"
+        )
+
+    panel = [f"worker {row:>3}: 待機中 {row * 31 % 97}" for row in range(PANEL_LINES)]
+    metrics = TextMetrics("\n".join(panel))
+    whole = incremental = 0.0
+    for update in range(PANEL_UPDATES):
+        panel[update % PANEL_LINES] = f"worker {update % PANEL_LINES:>3}: 処理中 {update}"
+        text = "\n".join(panel)
+
+        start = time.perf_counter()
+        text_size(text)
+        whole += time.perf_counter() - start
+
+        start = time.perf_counter()
+        metrics.update(text)
+        incremental += time.perf_counter() - start
+
+    print(
+        f"\n{PANEL_LINES} line panel, one line changing: whole text {whole / PANEL_UPDATES * 1e6:.1f} us,"
+        f" changed lines {incremental / PANEL_UPDATES * 1e6:.1f} us per update"
+    )
+
+
+if __name__ == "__main__":
+    main()
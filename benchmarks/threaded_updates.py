@@ -0,0 +1,88 @@
+"""Updates posted by producer threads, applied on the loop in batches rendered once.
+
+Worker threads post label updates with call_soon_threadsafe while the loop runs. The loop is woken
+up by the pipe, applies all the updates posted since the last batch and renders once. The time and
+number of renders are compared with rendering after every update, which is what the loop would do
+if it handled the updates one at a time. Run with `python -m benchmarks.threaded_updates`.
+"""
+from __future__ import annotations
+
+import threading
+import time
+
+from tktui.tktui import TkTui
+from tktui.backends import MemoryBackend
+from tktui.widgets.label import Label
+
+SCREEN_HEIGHT = 40
+SCREEN_WIDTH = 120
+LABELS = 40
+UPDATES_PER_PRODUCER = 5_000
+PRODUCERS = (1, 4, 16)
+
+
+def make_app() -> tuple[MemoryBackend, TkTui, list[Label]]:
+    backend = MemoryBackend(SCREEN_HEIGHT, SCREEN_WIDTH)
+    app = TkTui(backend=backend)
+    labels = [Label(app, (i % 4) * 30, (i // 4) * 3, text=f"worker {i:02}: {0:>8}") for i in range(LABELS)]
+    app.render()
+    return backend, app, labels
+
+
+def batched(producers: int) -> tuple[float, int]:
+    backend, app, labels = make_app()
+
+    def produce(worker: int) -> None:
+        label = labels[worker % LABELS]
+        for value in range(UPDATES_PER_PRODUCER):
+            app.call_soon_threadsafe(label.update_text, f"worker {worker:02}: {value:>8}")
+
+    threads = [threading.Thread(target=produce, args=(worker,)) for worker in range(producers)]
+
+    def stop() -> None:
+        for thread in threads:
+            thread.join()
+        app.call_soon_threadsafe(app.exit)
+
+    updates = backend.updates
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    threading.Thread(target=stop).start()
+    app.mainloop()
+    elapsed = time.perf_counter() - start
+
+    backend.close()
+    return elapsed, backend.updates - updates
+
+
+def one_by_one(producers: int) -> tuple[float, int]:
+    backend, app, labels = make_app()
+    updates = backend.updates
+    start = time.perf_counter()
+    for value in range(UPDATES_PER_PRODUCER):
+        for worker in range(producers):
+            labels[worker % LABELS].update_text(f"worker {worker:02}: {value:>8}")
+            app.render()
+    elapsed = time.perf_counter() - start
+
+    backend.close()
+    return elapsed, backend.updates - updates
+
+
+def main() -> None:
+    print(
+        f"{'producers':>9} {'updates':>8} {'one by one (ms)':>16} {'renders':>8}"
+        f" {'batched (ms)':>13} {'renders':>8}"
+    )
+    for producers in PRODUCERS:
+        single_time, single_renders = one_by_one(producers)
+        batch_time, batch_renders = batched(producers)
+        print(
+            f"{producers:>9} {producers * UPDATES_PER_PRODUCER:>8} {single_time * 1e3:>16.0f}"
+            f" {single_renders:>8} {batch_time * 1e3:>13.0f} {batch_renders:>8}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""Lateness of many periodic timers driven by the mainloop.
+
+Every timer refreshes a label at its own rate by scheduling itself again with after. The
+lateness is how long after its deadline a timer ran. Run with `python -m benchmarks.timers`.
+"""
+from __future__ import annotations
+
+import random
+import statistics
+import time
+
+from tktui.tktui import TkTui
+from tktui.backends import MemoryBackend
+from tktui.widgets.label import Label
+
+TIMER_COUNTS = (10, 100, 1_000, 5_000)
+# periods of the timers in milliseconds
+PERIODS = (10, 25, 50, 100, 250)
+DURATION_MS = 2_000
+
+
+def run(count: int) -> tuple[list[float], int]:
+    backend = MemoryBackend(60, 200)
+    app = TkTui(backend=backend)
+    labels = [Label(app, (i % 20) * 10, (i // 20) % 20 * 3, text="0000") for i in range(count)]
+    rng = random.Random(0)
+    lateness: list[float] = []
+
+    def refresh(label: Label, period: int, deadline: float, ticks: int) -> None:
+        now = time.monotonic()
+        lateness.append(now - deadline)
+        label.update_text(f"{ticks % 10_000:04}")
+        app.after(period, refresh, label, period, now + period / 1000, ticks + 1)
+
+    start = time.monotonic()
+    for label in labels:
+        period = rng.choice(PERIODS)
+        app.after(period, refresh, label, period, start + period / 1000, 0)
+    app.after(DURATION_MS, app.exit)
+
+    app.mainloop()
+    backend.close()
+    return lateness, backend.updates
+
+
+def main() -> None:
+    print(f"{'timers':>8} {'calls':>8} {'renders':>8} {'mean late (ms)':>15} {'p99 late (ms)':>14} {'max late (ms)':>14}")
+    for count in TIMER_COUNTS:
+        lateness, updates = run(count)
+        lateness.sort()
+        p99 = lateness[int(len(lateness) * 0.99)]
+        print(
+            f"{count:>8} {len(lateness):>8} {updates:>8} {statistics.mean(lateness) * 1e3:>15.2f}"
+            f" {p99 * 1e3:>14.2f} {lateness[-1] * 1e3:>14.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
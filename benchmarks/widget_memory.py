@@ -0,0 +1,119 @@
+"""Memory per widget, label, frame, event and pack info, with __slots__ against a __dict__.
+
+COUNT objects of each kind are made and the memory still allocated afterwards is measured with
+tracemalloc, divided by COUNT. Frames fill their parent, they are made on a screen of their own the
+size of a terminal. Widgets and frames also allocate the windows they draw in, so the instances are
+measured on their own too: shallow copies of the objects, with their box, as they are with
+__slots__, and with the same attributes set on a class without __slots__, the way they were kept
+in a __dict__ before. Run with `python -m benchmarks.widget_memory`.
+"""
+from __future__ import annotations
+
+import copy
+from functools import cache
+import math
+import tracemalloc
+from typing import Any, Callable
+
+from tktui.tktui import TkTui
+from tktui.frame import Frame
+from tktui.backends import MemoryBackend
+from tktui.events import KeyEvent, MouseEvent
+from tktui.geometry import PackInfo
+from tktui.widget import Widget
+from tktui.widgets.label import Label
+
+COUNT = 10_000
+FRAME_HEIGHT = 24
+FRAME_WIDTH = 80
+
+
+def slot_names(cls: type) -> list[str]:
+    """The attributes the __slots__ of the class and its bases hold, with private names mangled."""
+    names = []
+    for klass in cls.__mro__:
+        for name in klass.__dict__.get("__slots__", ()):
+            if name in ("__dict__", "__weakref__"):
+                continue
+            if name.startswith("__") and not name.endswith("__"):
+                name = f"_{klass.__name__.lstrip('_')}{name}"
+            names.append(name)
+    return names
+
+
+@cache
+def unslotted_class(cls: type) -> type:
+    """A class without __slots__ for cls. Its instances share the keys of their dict, like cls did."""
+    return type(cls.__name__, (), {})
+
+
+def unslotted(obj: Any) -> Any:
+    """A copy of the attributes of the object that are set, in a __dict__."""
+    clone = unslotted_class(type(obj))()
+    for name in slot_names(type(obj)):
+        if hasattr(obj, name):
+            setattr(clone, name, getattr(obj, name))
+    return clone
+
+
+def parts(obj: Any) -> list[Any]:
+    """The object and its box, which every widget and frame has one of."""
+    box = getattr(obj, "box", None)
+    return [obj] if box is None else [obj, box]
+
+
+def allocated(make: Callable[[int], Any]) -> tuple[float, list[Any]]:
+    """Bytes still allocated per object after making COUNT of them, and the objects."""
+    objects: list[Any] = [None] * COUNT
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    for i in range(COUNT):
+        objects[i] = make(i)
+    memory = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    return memory / COUNT, objects
+
+
+def measure(make: Callable[[int], Any]) -> tuple[float, float, float]:
+    """Bytes allocated per object, and bytes of the instances alone with slots and with a dict."""
+    total, objects = allocated(make)
+    slotted, _ = allocated(lambda i: [copy.copy(part) for part in parts(objects[i])])
+    with_dict, _ = allocated(lambda i: [unslotted(part) for part in parts(objects[i])])
+    # the lists holding the copies of each object cost the same in both
+    empty, _ = allocated(lambda i: [None for _ in parts(objects[i])])
+    return total, slotted - empty, with_dict - empty
+
+
+def main() -> None:
+    side = math.ceil(math.sqrt(COUNT))
+    # labels take 3 rows and 6 columns, with the border around the text they keep the room for
+    screens = {
+        "widgets": MemoryBackend(side * 3, side * 6),
+        "frames": MemoryBackend(FRAME_HEIGHT, FRAME_WIDTH),
+    }
+
+    cases: list[tuple[str, str, Callable[[TkTui, int], Any]]] = [
+        ("widget", "widgets", lambda app, i: Widget(app, i % side, i // side, 1, 1, border=False)),
+        ("label", "widgets", lambda app, i: Label(app, (i % side) * 6, i // side * 3, text="cell", border=False)),
+        ("frame", "frames", lambda app, i: Frame(app)),
+        ("key event", "widgets", lambda app, i: KeyEvent(0, 0, i)),
+        ("mouse event", "widgets", lambda app, i: MouseEvent(i % side, i // side, 0)),
+        ("pack info", "widgets", lambda app, i: PackInfo(padx=i)),
+    ]
+
+    print(f"{COUNT} objects of each kind, bytes per object")
+    print(f"{'object':>12} {'allocated':>10} {'slots':>8} {'dict':>8}")
+    screen = None
+    for name, screen_name, make in cases:
+        if screen_name != screen:
+            screen = screen_name
+            app = TkTui(backend=screens[screen])
+        total, slotted, with_dict = measure(lambda i: make(app, i))
+        print(f"{name:>12} {total:>10.0f} {slotted:>8.0f} {with_dict:>8.0f}")
+
+    for backend in screens.values():
+        backend.close()
+
+
+if __name__ == "__main__":
+    main()
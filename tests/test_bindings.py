@@ -0,0 +1,64 @@
+import unittest
+
+from tktui.tktui import TkTui
+from tktui.backends import MemoryBackend
+from tktui.events import KeyEvent
+from tktui.widget import Widget
+
+
+class KeySequenceReplayTest(unittest.TestCase):
+    """The keys of a sequence that ends without a binding reach the widget in focus."""
+
+    def setUp(self) -> None:
+        self.backend = MemoryBackend()
+        self.app = TkTui(backend=self.backend)
+        self.widget = Widget(self.app, 0, 0, 3, 3)
+        self.app.in_focus = self.widget
+        self.keys: list[int] = []
+        self.bound: list[str] = []
+
+        def on_key(event: KeyEvent) -> None:
+            self.keys.append(event.key)
+
+        self.app.register_for_key_event(self.widget, on_key)
+        self.app.bind(None, "gg", lambda event: self.bound.append("gg"))
+        self.app.bind(None, "<Control-x><Control-s>", lambda event: self.bound.append("save"))
+
+    def tearDown(self) -> None:
+        self.backend.close()
+
+    def type(self, keys: str) -> None:
+        for key in keys:
+            self.app._handle_char(ord(key))
+
+    def time_out(self) -> None:
+        # past the chord timeout of the keys typed so far
+        now = self.app._timers.clock() + self.app._bindings.chord_timeout / 1000
+        self.app._timers.clock = lambda: now
+        self.app._run_timers()
+
+    def test_broken_off(self) -> None:
+        self.type("agbg\x18zg")
+        self.time_out()
+        self.assertEqual(self.keys, [ord(key) for key in "agbg\x18zg"])
+        self.assertEqual(self.bound, [])
+
+    def test_timeout(self) -> None:
+        self.type("g")
+        self.assertEqual(self.keys, [])
+        self.time_out()
+        self.assertEqual(self.keys, [ord("g")])
+
+        self.type("\x18")
+        self.time_out()
+        self.assertEqual(self.keys, [ord("g"), 0x18])
+
+    def test_bound_sequences_are_not_replayed(self) -> None:
+        self.type("gg\x18\x13g")
+        self.time_out()
+        self.assertEqual(self.bound, ["gg", "save"])
+        self.assertEqual(self.keys, [ord("g")])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,88 @@
+import curses
+import unittest
+
+from tktui.tktui import TkTui
+from tktui.backends import MemoryBackend
+from tktui.widget import Widget
+
+
+class Cell(Widget):
+    """A widget drawing with fg on bg, counting its draws."""
+
+    def __init__(self, parent: TkTui, x: int, fg: int, bg: int) -> None:
+        self.fg, self.bg, self.draws = fg, bg, 0
+        super().__init__(parent, x, 0, 1, 3, border=False)
+
+    def redraw(self) -> None:
+        super().redraw()
+        self.draws += 1
+        self.box.win.addstr(0, 0, "ab", self.color(self.fg, self.bg))
+
+
+class ColorPairTest(unittest.TestCase):
+    """Pairs go to the combinations asked for, the least recently used taken back when none is left."""
+
+    def setUp(self) -> None:
+        # 7 pairs besides pair 0, 2 of them for the named default colors
+        self.backend = MemoryBackend(10, 40, color_pairs=8)
+        self.app = TkTui(backend=self.backend)
+        self.colors = self.app.colors
+        self.cells = [Cell(self.app, i * 3, i, curses.COLOR_BLACK) for i in range(5)]
+        for cell in self.cells:
+            cell.redraw()
+        self.app.render()
+
+    def tearDown(self) -> None:
+        self.backend.close()
+
+    def test_cached(self) -> None:
+        attr = self.colors.pair(2, curses.COLOR_BLACK)
+        self.assertEqual(self.colors.pair(2, curses.COLOR_BLACK), attr)
+        self.assertEqual(self.colors._free, [])
+
+    def test_least_recently_used_taken_back(self) -> None:
+        # the first cell asked for its pair the longest ago
+        for cell in self.cells[1:]:
+            self.colors.pair(cell.fg, cell.bg)
+        extra = Cell(self.app, 20, curses.COLOR_WHITE, curses.COLOR_YELLOW)
+        extra.redraw()
+        self.assertEqual(list(self.colors._stale), [self.cells[0]])
+
+        # drawn again on the next render, with colors that have a pair it takes nothing back
+        self.cells[0].fg, self.cells[0].bg = extra.fg, extra.bg
+        self.app.render()
+        self.assertEqual([cell.draws for cell in self.cells], [2, 1, 1, 1, 1])
+        self.assertEqual(list(self.colors._stale), [])
+        self.assertEqual(self.backend.attr(0, 0), self.backend.attr(0, 20))
+
+    def test_more_combinations_than_pairs(self) -> None:
+        extra = Cell(self.app, 20, curses.COLOR_WHITE, curses.COLOR_YELLOW)
+        extra.redraw()
+        # each widget losing its pair takes back the one of the next, but is redrawn once a render
+        self.app.render()
+        self.assertEqual([cell.draws for cell in self.cells], [2, 2, 2, 2, 2])
+        self.assertEqual(extra.draws, 2)
+
+    def test_named_colors_kept(self) -> None:
+        named = self.colors["WHITE_BLUE"]
+        for fg in range(8, 30):
+            self.colors.pair(fg, curses.COLOR_BLACK)
+        self.assertEqual(self.colors["WHITE_BLUE"], named)
+        self.assertEqual(self.colors.pair(curses.COLOR_WHITE, curses.COLOR_BLUE), named)
+
+    def test_redefined_names_release_their_pair(self) -> None:
+        for fg in range(8, 30):
+            self.colors.define("CYCLE", fg, curses.COLOR_BLACK)
+        self.assertEqual(len(self.colors._pinned), 3)
+        # the pairs not pinned are still there for the other combinations
+        for fg in range(30, 35):
+            self.colors.pair(fg, curses.COLOR_BLACK)
+        self.assertEqual(self.colors.pair(40, curses.COLOR_BLACK), self.colors.pair(40, curses.COLOR_BLACK))
+
+    def test_unknown_name(self) -> None:
+        with self.assertRaises(AttributeError):
+            self.colors["nope"]
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,149 @@
+import curses
+import unittest
+
+from tktui.tktui import TkTui
+from tktui.backends import MemoryBackend
+from tktui.events import Event, MouseEvent
+from tktui.frame import Frame
+from tktui.widget import Widget
+from tktui.widgets.label import Label
+
+MOTION = curses.REPORT_MOUSE_POSITION
+
+
+class PropagationTest(unittest.TestCase):
+    """Events go down from the root to their target in the capture phase and back up in the bubble."""
+
+    def setUp(self) -> None:
+        self.backend = MemoryBackend(12, 40)
+        self.app = TkTui(backend=self.backend)
+        self.frame = Frame(self.app)
+        self.under = Label(self.frame, 0, 0, text="aaaa")
+        # on top of the first label, which it covers at (3, 2)
+        self.over = Label(self.frame, 2, 1, text="cccc")
+        self.log: list[tuple[str, str]] = []
+
+        targets = {"root": self.app._root, "frame": self.frame, "under": self.under, "over": self.over}
+        for name, target in targets.items():
+            self.app.register_for_mouse_event(target, self.logger(name))
+            self.app.register_for_mouse_event(target, self.logger("capture " + name), capture=True)
+            self.app.register_for_key_event(target, self.logger(name))
+            self.app.register_for_key_event(target, self.logger("capture " + name), capture=True)
+        self.app.render()
+
+    def tearDown(self) -> None:
+        self.backend.close()
+
+    def logger(self, name: str):
+        def log(event: Event) -> None:
+            self.log.append((name, event.phase.value))
+        return log
+
+    def click(self, x: int, y: int) -> None:
+        self.backend.push_mouse(x, y, curses.BUTTON1_CLICKED)
+        self.app.mouse_event()
+
+    def test_capture_then_bubble(self) -> None:
+        self.click(3, 2)
+        self.assertEqual(self.log, [
+            ("capture root", "capture"),
+            ("capture frame", "capture"),
+            ("capture over", "target"),
+            ("over", "target"),
+            ("frame", "bubble"),
+            ("root", "bubble"),
+        ])
+        self.assertIs(self.app.in_focus, self.over)
+
+    def test_topmost_target(self) -> None:
+        self.under.lift()
+        self.app.render()
+        self.click(3, 2)
+        self.assertIn(("under", "target"), self.log)
+        self.assertNotIn(("over", "target"), self.log)
+
+    def test_stopped_in_capture(self) -> None:
+        self.app.register_for_mouse_event(self.frame, lambda event: event.stop(), capture=True)
+        self.click(3, 2)
+        self.assertEqual(self.log, [("capture root", "capture")])
+
+    def test_not_propagating(self) -> None:
+        self.over.propagates_mouse_event = False
+        self.click(3, 2)
+        self.assertEqual(self.log[-1], ("over", "target"))
+
+    def test_keys_follow_the_focus_chain(self) -> None:
+        self.app.in_focus = self.under
+        self.app._handle_char(ord("x"))
+        self.assertEqual(self.log, [
+            ("capture root", "capture"),
+            ("capture frame", "capture"),
+            ("capture under", "target"),
+            ("under", "target"),
+            ("frame", "bubble"),
+            ("root", "bubble"),
+        ])
+
+
+class MotionTest(unittest.TestCase):
+    """Mouse motion reaches the widgets that asked for it, collapsed into its last position."""
+
+    def setUp(self) -> None:
+        self.backend = MemoryBackend(12, 40)
+        self.app = TkTui(backend=self.backend)
+        self.app._running = True
+        self.tracked = Widget(self.app, 0, 0, 5, 10)
+        self.clicked = Widget(self.app, 20, 0, 5, 10)
+        self.log: list[tuple[str, int, int, int]] = []
+
+    def tearDown(self) -> None:
+        self.backend.close()
+
+    def logger(self, name: str):
+        def log(event: MouseEvent) -> None:
+            self.log.append((name, event.x, event.y, event.bstate))
+        return log
+
+    def test_reported_while_asked_for(self) -> None:
+        self.assertFalse(self.backend._mousemask & MOTION)
+        self.app.register_for_mouse_event(self.tracked, self.logger("tracked"), motion=True)
+        self.assertTrue(self.backend._mousemask & MOTION)
+
+    def test_coalesced(self) -> None:
+        self.app.register_for_mouse_event(self.tracked, self.logger("tracked"), motion=True)
+        self.app.register_for_mouse_event(self.clicked, self.logger("clicked"))
+        for x in range(100):
+            self.backend.push_mouse(x % 10, 1, MOTION)
+        self.backend.push_mouse(3, 2, curses.BUTTON1_CLICKED)
+        for x in range(50):
+            self.backend.push_mouse(x % 10, 3, MOTION)
+        self.backend.push_key("x")
+        # over a widget that did not ask for the motion
+        for _ in range(50):
+            self.backend.push_mouse(21, 3, MOTION)
+        self.backend.push_mouse(22, 2, curses.BUTTON1_CLICKED)
+        self.app._process_input()
+
+        self.assertEqual(self.log, [
+            ("tracked", 9, 1, MOTION),
+            ("tracked", 3, 2, curses.BUTTON1_CLICKED),
+            ("tracked", 9, 3, MOTION),
+            ("clicked", 22, 2, curses.BUTTON1_CLICKED),
+        ])
+
+    def test_per_phase(self) -> None:
+        self.app.register_for_mouse_event(self.tracked, self.logger("bubble"), motion=True)
+        self.app.register_for_mouse_event(self.tracked, self.logger("capture"), capture=True)
+        self.app.mouse_event((0, 1, 1, 0, MOTION))
+        self.assertEqual([name for name, *_ in self.log], ["bubble"])
+
+        self.log.clear()
+        self.app.register_for_mouse_event(self.tracked, self.logger("capture"), capture=True, motion=True)
+        self.app.register_for_mouse_event(self.tracked, self.logger("bubble"))
+        self.app.mouse_event((0, 1, 1, 0, MOTION))
+        self.assertEqual([name for name, *_ in self.log], ["capture"])
+        self.assertTrue(self.backend._mousemask & MOTION)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,96 @@
+import unittest
+
+from tktui.tktui import TkTui
+from tktui.backends import MemoryBackend
+from tktui.frame import Frame
+from tktui.geometry import Rect
+from tktui.widget import Widget
+from tktui.widgets.label import Label
+
+
+class PackTest(unittest.TestCase):
+    """Packed children take their side of the room the frame has left."""
+
+    def setUp(self) -> None:
+        self.backend = MemoryBackend(12, 40)
+        self.app = TkTui(backend=self.backend)
+        self.frame = Frame(self.app)
+        self.frame.pack(fill="both", expand=True)
+        self.top = Label(self.frame, 0, 0, text="top")
+        self.top.pack(side="top", fill="x")
+        self.left = Widget(self.frame, 0, 0, 4, 6)
+        self.left.pack(side="left", fill="y")
+        self.right = Widget(self.frame, 0, 0, 4, 6)
+        self.right.pack(side="right")
+        self.layout()
+
+    def tearDown(self) -> None:
+        self.backend.close()
+
+    def layout(self) -> None:
+        self.app.update_layout()
+        self.app.render()
+
+    def test_sides(self) -> None:
+        self.assertEqual(self.frame.box.rect, Rect(0, 0, 12, 40))
+        self.assertEqual(self.top.box.rect, Rect(0, 0, 3, 40))
+        self.assertEqual(self.left.box.rect, Rect(3, 0, 9, 6))
+        self.assertEqual(self.right.box.rect, Rect(3, 34, 4, 6))
+
+        screen = self.backend.text()
+        self.assertEqual(screen[1], "│top" + " " * 35 + "│")
+        self.assertEqual(screen[3], "┌────┐" + " " * 28 + "┌────┐")
+        self.assertEqual(screen[11], "└────┘" + " " * 34)
+
+    def test_growing_child(self) -> None:
+        self.top.update_text("top\nsecond")
+        self.layout()
+        self.assertEqual(self.top.box.rect, Rect(0, 0, 4, 40))
+        self.assertEqual(self.left.box.rect, Rect(4, 0, 8, 6))
+        self.assertEqual(self.right.box.rect, Rect(4, 34, 4, 6))
+        self.assertEqual(self.backend.text()[2], "│second" + " " * 32 + "│")
+
+
+class GridTest(unittest.TestCase):
+    """Gridded children take the cells of their rows and columns, the weighted ones the room left."""
+
+    def setUp(self) -> None:
+        self.backend = MemoryBackend(12, 40)
+        self.app = TkTui(backend=self.backend)
+        self.frame = Frame(self.app)
+        self.frame.pack(fill="both", expand=True)
+        self.frame.columnconfigure(1, weight=1)
+        self.cell = Label(self.frame, 0, 0, text="a")
+        self.cell.grid(row=0, column=0)
+        self.stretched = Label(self.frame, 0, 0, text="wide")
+        self.stretched.grid(row=0, column=1, sticky="ew")
+        self.spanning = Label(self.frame, 0, 0, text="spanning")
+        self.spanning.grid(row=1, column=0, columnspan=2, sticky="e")
+        self.layout()
+
+    def tearDown(self) -> None:
+        self.backend.close()
+
+    def layout(self) -> None:
+        self.app.update_layout()
+        self.app.render()
+
+    def test_cells(self) -> None:
+        self.assertEqual(self.cell.box.rect, Rect(0, 0, 3, 3))
+        # the weighted column takes what the first one leaves, sticking to both sides of it
+        self.assertEqual(self.stretched.box.rect, Rect(0, 3, 3, 37))
+        self.assertEqual(self.spanning.box.rect, Rect(3, 30, 3, 10))
+        self.assertEqual(self.backend.text()[4], " " * 30 + "│spanning│")
+
+    def test_growing_cell(self) -> None:
+        self.cell.update_text("aaaaaa")
+        self.layout()
+        self.assertEqual(self.frame._grid_columns.minimums(), [8, 6])
+        self.assertEqual(self.cell.box.rect, Rect(0, 0, 3, 8))
+        self.assertEqual(self.stretched.box.rect, Rect(0, 8, 3, 32))
+        self.assertEqual(self.spanning.box.rect, Rect(3, 30, 3, 10))
+        self.assertEqual(self.backend.text()[1][:10], "│aaaaaa││w")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,86 @@
+import curses
+import unittest
+
+from tktui.tktui import TkTui
+from tktui.backends import MemoryBackend
+from tktui.widgets.list_view import ListView
+
+
+class ListViewTest(unittest.TestCase):
+    """Only the rows in view are asked for and drawn, whatever the number of rows."""
+
+    def setUp(self) -> None:
+        self.backend = MemoryBackend(12, 30)
+        self.app = TkTui(backend=self.backend)
+        self.app._running = True
+        self.fetched: list[int] = []
+        self.selected: list[int] = []
+        self.rows: dict[int, str] = {}
+        self.list_view = ListView(
+            self.app, 0, 0, 7, 20,
+            row_count=10_000_000,
+            row_provider=self.row,
+            command=self.selected.append,
+        )
+        self.app.render()
+
+    def tearDown(self) -> None:
+        self.backend.close()
+
+    def row(self, index: int) -> str:
+        self.fetched.append(index)
+        return self.rows.get(index, f"row {index}")
+
+    def lines(self) -> list[str]:
+        """The lines inside the border, a wide character is one character taking two cells."""
+        return [line[1:].partition("│")[0] for line in self.backend.text()[1:6]]
+
+    def test_window(self) -> None:
+        self.assertEqual(self.fetched, [0, 1, 2, 3, 4])
+        self.assertEqual(self.lines()[0], "row 0".ljust(18))
+
+        self.fetched.clear()
+        self.list_view.yview_scroll(2)
+        self.app.render()
+        # the rows still in view are kept
+        self.assertEqual(self.fetched, [5, 6])
+        self.assertEqual(self.lines(), [f"row {row}".ljust(18) for row in range(2, 7)])
+
+    def test_keys(self) -> None:
+        self.app.in_focus = self.list_view
+        self.fetched.clear()
+        self.backend.push_key(curses.KEY_END)
+        self.app._process_input()
+        self.app.render()
+        self.assertEqual(self.list_view.selection, 9_999_999)
+        self.assertEqual(self.list_view.top, 9_999_995)
+        self.assertEqual(self.fetched, list(range(9_999_995, 10_000_000)))
+        self.assertEqual(self.selected, [9_999_999])
+
+    def test_click(self) -> None:
+        self.backend.push_mouse(3, 2, curses.BUTTON1_CLICKED)
+        self.app._process_input()
+        self.app.render()
+        self.assertEqual(self.selected, [1])
+        self.assertIs(self.app.in_focus, self.list_view)
+        self.assertTrue(self.backend.attr(2, 2) & curses.A_REVERSE)
+        self.assertFalse(self.backend.attr(3, 2) & curses.A_REVERSE)
+
+    def test_wide_rows(self) -> None:
+        self.rows[1] = "漢字" * 6
+        self.rows[2] = "😀x"
+        self.list_view.invalidate()
+        self.app.render()
+        # 9 wide characters fill the 18 cells of the line, the border stays in its column
+        self.assertEqual(self.lines()[1:3], ["漢字" * 4 + "漢", "😀x" + " " * 15])
+        self.assertEqual(self.backend.screen.chars[2][19], "│")
+        self.assertEqual(self.backend.screen.chars[3][19], "│")
+
+        self.rows[1] = "short"
+        self.list_view.invalidate(1)
+        self.app.render()
+        self.assertEqual(self.lines()[1], "short".ljust(18))
+
+
+if __name__ == "__main__":
+    unittest.main()
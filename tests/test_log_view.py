@@ -0,0 +1,63 @@
+import unittest
+
+from tktui.tktui import TkTui
+from tktui.backends import MemoryBackend
+from tktui.widgets.log_view import LogView
+
+
+class LogViewTest(unittest.TestCase):
+    """The tail of the lines fed, bounded in lines and bytes, following the end unless scrolled up."""
+
+    def setUp(self) -> None:
+        self.backend = MemoryBackend(12, 30)
+        self.app = TkTui(backend=self.backend)
+        self.log_view = LogView(self.app, 0, 0, 5, 20, max_lines=5, max_bytes=40)
+
+    def tearDown(self) -> None:
+        self.backend.close()
+
+    def frame(self) -> list[str]:
+        """The lines in view once the lines fed are drawn."""
+        self.app._run_timers()
+        self.app.render()
+        return [line[1:].partition("│")[0].rstrip() for line in self.backend.text()[1:4]]
+
+    def test_bounded_in_lines(self) -> None:
+        self.log_view.extend(f"line {i}" for i in range(8))
+        self.assertEqual(self.frame(), ["line 5", "line 6", "line 7"])
+        self.assertEqual(self.log_view.row_count, 5)
+
+    def test_bounded_in_bytes(self) -> None:
+        self.log_view.extend(["0123456789"] * 5)
+        self.frame()
+        self.assertEqual(self.log_view.row_count, 4)
+        self.assertLessEqual(self.log_view.byte_count, 40)
+
+        # a longer line than max_bytes is kept on its own, the line it fills is clipped in cells
+        self.log_view.append("漢字" * 10)
+        self.assertEqual(self.frame(), ["漢字" * 4 + "漢", "", ""])
+        self.assertEqual(self.log_view.row_count, 1)
+
+    def test_partial_lines(self) -> None:
+        self.log_view.write("ab")
+        self.log_view.write("c\nd")
+        self.assertEqual(self.frame(), ["abc", "", ""])
+        self.log_view.write("e\n")
+        self.assertEqual(self.frame(), ["abc", "de", ""])
+
+    def test_follow(self) -> None:
+        self.log_view.extend(f"line {i}" for i in range(5))
+        self.frame()
+        self.log_view.yview_scroll(-1)
+        self.log_view.append("new")
+        self.assertEqual(self.frame(), ["line 1", "line 2", "line 3"])
+        self.assertFalse(self.log_view.follow)
+
+        self.log_view.yview_scroll(5)
+        self.log_view.append("newer")
+        self.assertEqual(self.frame(), ["line 4", "new", "newer"])
+        self.assertTrue(self.log_view.follow)
+
+
+if __name__ == "__main__":
+    unittest.main()
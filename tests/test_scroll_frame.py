@@ -0,0 +1,90 @@
+import curses
+import unittest
+
+from tktui.tktui import TkTui
+from tktui.backends import MemoryBackend
+from tktui.events import Event
+from tktui.scroll_frame import ScrollFrame
+from tktui.widgets.label import Label
+
+BLANK = " " * 20
+
+
+class ScrollFrameTest(unittest.TestCase):
+    """The content of a scroll frame shows through its view only, at the scrolled position."""
+
+    def setUp(self) -> None:
+        self.backend = MemoryBackend(20, 40)
+        self.app = TkTui(backend=self.backend)
+        self.scroll_frame = ScrollFrame(self.app, height=10, width=20, border=True)
+        self.scroll_frame.pack()
+        self.labels = [Label(self.scroll_frame, 0, 0, text=f"row {row:03}") for row in range(50)]
+        for label in self.labels:
+            label.pack(anchor="w")
+        self.render()
+
+    def tearDown(self) -> None:
+        self.backend.close()
+
+    def render(self) -> None:
+        self.app.update_layout()
+        self.app.render()
+
+    def assertClipped(self) -> None:
+        screen = self.backend.text()
+        self.assertEqual(screen[0], "┌" + "─" * 18 + "┐" + BLANK)
+        for row in screen[1:9]:
+            self.assertEqual(row[19:], "│" + BLANK)
+        self.assertEqual(screen[9], "└" + "─" * 18 + "┘" + BLANK)
+        self.assertEqual(screen[10:], [BLANK * 2] * 10)
+
+    def test_clipped_to_view(self) -> None:
+        self.assertEqual(self.scroll_frame.content.height, 150)
+        self.assertClipped()
+        self.assertEqual(self.backend.text()[8][:10], "││row 002│")
+
+    def test_wider_content(self) -> None:
+        # children are made in the content, which has to be wide enough for them first
+        self.scroll_frame.resize_content(0, 40)
+        wide = Label(self.scroll_frame, 0, 0, text="w" * 30)
+        wide.pack(before=self.labels[0])
+        self.render()
+        self.assertEqual(self.scroll_frame.content.width, 40)
+        self.assertClipped()
+        self.assertEqual(self.backend.text()[2][:20], "││" + "w" * 17 + "│")
+
+    def test_scrolled(self) -> None:
+        self.scroll_frame.yview_scroll(4)
+        self.render()
+        self.assertClipped()
+        self.assertEqual(self.backend.text()[1][:10], "││row 001│")
+        self.assertEqual(self.backend.text()[7][:10], "││row 003│")
+
+        self.scroll_frame.yview_moveto(1.0)
+        self.render()
+        self.assertClipped()
+        self.assertEqual(self.backend.text()[7][:10], "││row 049│")
+
+    def test_clicks_in_view(self) -> None:
+        clicked: list[int] = []
+
+        def on_click(event: Event) -> None:
+            assert isinstance(event.target, Label)
+            clicked.append(self.labels.index(event.target))
+
+        for label in self.labels[:5]:
+            self.app.register_for_mouse_event(label, on_click)
+            # taking the focus would scroll the label clicked all into view
+            label.focusable = False
+        self.scroll_frame.yview_scroll(4)
+        self.render()
+
+        for y in range(10):
+            self.backend.push_mouse(3, y, curses.BUTTON1_CLICKED)
+            self.app.mouse_event()
+        # the border rows hide the labels scrolled under them
+        self.assertEqual(clicked, [1, 1, 2, 2, 2, 3, 3, 3])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,98 @@
+import unittest
+
+from tktui.tktui import TkTui
+from tktui.backends import MemoryBackend
+from tktui.backends.memory import WIDE_CONTINUATION
+from tktui.text import (
+    CHAR_CACHE_SIZE, LINE_CACHE_SIZE, TextMetrics, _measure, char_width, graphemes, text_size,
+    text_width, truncate,
+)
+from tktui.widgets.label import Label
+
+
+class TextWidthTest(unittest.TestCase):
+    """Text is measured in the terminal cells its grapheme clusters take."""
+
+    def test_widths(self) -> None:
+        self.assertEqual(text_width("abc"), 3)
+        self.assertEqual(text_width("日本"), 4)
+        # combining mark
+        self.assertEqual(text_width("été"), 3)
+        # skin tone modifier, flag, zero width joiner sequence and emoji presentation
+        self.assertEqual(text_width("👍🏽"), 2)
+        self.assertEqual(text_width("🇫🇷"), 2)
+        self.assertEqual(text_width("👨‍👩‍👧"), 2)
+        self.assertEqual(text_width("❤️"), 2)
+
+    def test_graphemes(self) -> None:
+        self.assertEqual(list(graphemes("aé🇫🇷👨‍👩")), ["a", "é", "🇫🇷", "👨‍👩"])
+
+    def test_truncate(self) -> None:
+        self.assertEqual(truncate("日本語", 5), "日本")
+        self.assertEqual(truncate("日本語", 6), "日本語")
+        self.assertEqual(truncate("éx", 1), "é")
+        self.assertEqual(truncate("abc", 2), "ab")
+
+    def test_size(self) -> None:
+        self.assertEqual(text_size("日本\nabc\n\n"), (2, 4))
+        self.assertEqual(text_size(""), (0, 0))
+
+    def test_metrics(self) -> None:
+        metrics = TextMetrics("a\n日本")
+        self.assertEqual(metrics.size, (2, 4))
+        self.assertEqual(metrics.update("a\n日本語"), (2, 6))
+        self.assertEqual(metrics.update("abcdefgh"), (1, 8))
+
+    def test_bounded_caches(self) -> None:
+        for code in range(0x4e00, 0x4e00 + 2 * CHAR_CACHE_SIZE):
+            char_width(chr(code))
+        self.assertLessEqual(char_width.cache_info().currsize, CHAR_CACHE_SIZE)
+
+        for value in range(2 * LINE_CACHE_SIZE):
+            text_width(f"{value} 件")
+        self.assertLessEqual(_measure.cache_info().currsize, LINE_CACHE_SIZE)
+
+
+class WideCellsTest(unittest.TestCase):
+    """A wide character takes its cell and the continuation cell after it."""
+
+    def setUp(self) -> None:
+        self.backend = MemoryBackend(6, 30)
+        self.app = TkTui(backend=self.backend)
+        self.label = Label(self.app, 0, 0, text="日本")
+        self.app.render()
+
+    def tearDown(self) -> None:
+        self.backend.close()
+
+    def test_label(self) -> None:
+        self.assertEqual(self.label.box.width, 6)
+        self.assertEqual(
+            self.backend.screen.chars[1][:6],
+            ["│", "日", WIDE_CONTINUATION, "本", WIDE_CONTINUATION, "│"],
+        )
+        self.assertEqual(self.backend.text()[1][:4], "│日本│")
+
+    def test_overwritten_halves(self) -> None:
+        # over the continuation of the first character, which is blanked
+        self.label.box.win.addstr(1, 2, "x")
+        self.app.mark_dirty(self.label)
+        self.app.render()
+        self.assertEqual(self.backend.text()[1][:5], "│ x本│")
+
+        # over the first half of the second one, whose continuation is blanked
+        self.label.box.win.addstr(1, 3, "y")
+        self.app.mark_dirty(self.label)
+        self.app.render()
+        self.assertEqual(self.backend.text()[1][:6], "│ xy │")
+
+    def test_updated_text(self) -> None:
+        self.label.update_text("é日")
+        self.app.render()
+        # three cells wide, the label shrinks and the cell its border left is blanked
+        self.assertEqual(self.label.box.width, 5)
+        self.assertEqual(self.backend.text()[1][:5], "│é日│ ")
+
+
+if __name__ == "__main__":
+    unittest.main()
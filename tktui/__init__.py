@@ -2,5 +2,6 @@ from __future__ import annotations
 
 
 from .tktui import TkTui, Frame
+from .scroll_frame import ScrollFrame
 
-__all__ = ["TkTui", "Frame"]
+__all__ = ["TkTui", "Frame", "ScrollFrame"]
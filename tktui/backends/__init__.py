@@ -0,0 +1,16 @@
+from __future__ import annotations
+
+from .base import Backend
+from .curses_backend import CursesBackend
+from .memory import MemoryBackend, MemoryWindow
+from .diff import CellDiffRenderer
+from .terminal import TerminalBackend
+
+__all__ = [
+    "Backend",
+    "CursesBackend",
+    "MemoryBackend",
+    "MemoryWindow",
+    "CellDiffRenderer",
+    "TerminalBackend",
+]
@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from typing import TYPE_CHECKING, Union
+
+if TYPE_CHECKING:
+    import curses
+    from tktui.backends.memory import MemoryWindow
+
+    Window = Union[curses.window, MemoryWindow]
+
+class Backend(ABC):
+    """The screen and input layer under TkTui and the Boxes.
+
+    Exposes the subset of the curses module functions used by tktui. The windows it creates must
+    support the curses.window methods used by the Boxes and widgets.
+    """
+    # whether the screen is a terminal, which signals SIGWINCH when it is resized
+    signals_resize = True
+
+    @abstractmethod
+    def initscr(self) -> Window:
+        ...
+
+    @abstractmethod
+    def newpad(self, height: int, width: int) -> Window:
+        ...
+
+    @abstractmethod
+    def endwin(self) -> None:
+        ...
+
+    @abstractmethod
+    def fileno(self) -> int:
+        """The file descriptor that becomes readable when there is input for getch."""
+        ...
+
+    @abstractmethod
+    def terminal_size(self) -> tuple[int, int]:
+        """The (height, width) of the terminal now, which the screen is resized to by resize_term."""
+        ...
+
+    @abstractmethod
+    def resize_term(self, height: int, width: int) -> None:
+        """Resize the screen and the top level window, like curses.resizeterm."""
+        ...
+
+    @abstractmethod
+    def start_color(self) -> None:
+        ...
+
+    @abstractmethod
+    def use_default_colors(self) -> None:
+        ...
+
+    @abstractmethod
+    def color_count(self) -> int:
+        """The number of colors of the terminal, like curses.COLORS."""
+        ...
+
+    @abstractmethod
+    def pair_count(self) -> int:
+        """The number of color pairs of the terminal including pair 0, like curses.COLOR_PAIRS."""
+        ...
+
+    @abstractmethod
+    def init_pair(self, pair_number: int, fg: int, bg: int) -> None:
+        ...
+
+    @abstractmethod
+    def color_pair(self, pair_number: int) -> int:
+        ...
+
+    @abstractmethod
+    def curs_set(self, visibility: int) -> None:
+        ...
+
+    @abstractmethod
+    def cbreak(self) -> None:
+        ...
+
+    @abstractmethod
+    def nocbreak(self) -> None:
+        ...
+
+    @abstractmethod
+    def echo(self) -> None:
+        ...
+
+    @abstractmethod
+    def noecho(self) -> None:
+        ...
+
+    @abstractmethod
+    def flushinp(self) -> None:
+        ...
+
+    @abstractmethod
+    def mousemask(self, mask: int) -> None:
+        ...
+
+    @abstractmethod
+    def getmouse(self) -> tuple[int, int, int, int, int]:
+        ...
+
+    @abstractmethod
+    def bracketed_paste(self, enabled: bool) -> None:
+        """Have the terminal wrap pasted text in ESC [ 200 ~ and ESC [ 201 ~, or stop it."""
+
+    @abstractmethod
+    def doupdate(self) -> None:
+        ...
@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import curses
+import os
+import sys
+
+from tktui.backends.base import Backend
+
+class CursesBackend(Backend):
+    """Backend drawing to the terminal with curses."""
+
+    def initscr(self) -> curses.window:
+        return curses.initscr()
+
+    def newpad(self, height: int, width: int) -> curses.window:
+        return curses.newpad(height, width)
+
+    def endwin(self) -> None:
+        curses.endwin()
+
+    def fileno(self) -> int:
+        # curses reads the input from stdin
+        return sys.stdin.fileno()
+
+    def terminal_size(self) -> tuple[int, int]:
+        try:
+            size = os.get_terminal_size(sys.stdout.fileno())
+        except OSError:
+            return (curses.LINES, curses.COLS)
+        return (size.lines, size.columns)
+
+    def resize_term(self, height: int, width: int) -> None:
+        curses.resizeterm(height, width)
+
+    def start_color(self) -> None:
+        curses.start_color()
+
+    def use_default_colors(self) -> None:
+        curses.use_default_colors()
+
+    def color_count(self) -> int:
+        # only set once start_color was called
+        return getattr(curses, "COLORS", 8)
+
+    def pair_count(self) -> int:
+        return getattr(curses, "COLOR_PAIRS", 64)
+
+    def init_pair(self, pair_number: int, fg: int, bg: int) -> None:
+        curses.init_pair(pair_number, fg, bg)
+
+    def color_pair(self, pair_number: int) -> int:
+        return curses.color_pair(pair_number)
+
+    def curs_set(self, visibility: int) -> None:
+        curses.curs_set(visibility)
+
+    def cbreak(self) -> None:
+        curses.cbreak()
+
+    def nocbreak(self) -> None:
+        curses.nocbreak()
+
+    def echo(self) -> None:
+        curses.echo()
+
+    def noecho(self) -> None:
+        curses.noecho()
+
+    def flushinp(self) -> None:
+        curses.flushinp()
+
+    def mousemask(self, mask: int) -> None:
+        curses.mousemask(mask)
+
+    def getmouse(self) -> tuple[int, int, int, int, int]:
+        return curses.getmouse()
+
+    def bracketed_paste(self, enabled: bool) -> None:
+        # curses has no call for it, the mode is set on the terminal directly
+        os.write(sys.stdout.fileno(), b"\x1b[?2004h" if enabled else b"\x1b[?2004l")
+
+    def doupdate(self) -> None:
+        curses.doupdate()
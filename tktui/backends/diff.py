@@ -0,0 +1,133 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING, Callable, Iterable
+import curses
+
+from tktui.backends.memory import WIDE_CONTINUATION, is_wide
+
+if TYPE_CHECKING:
+    from tktui.backends.memory import _Buffer
+
+# attribute bits and their SGR parameter
+_SGR_ATTRS = (
+    (curses.A_BOLD, "1"),
+    (curses.A_DIM, "2"),
+    (curses.A_ITALIC, "3"),
+    (curses.A_UNDERLINE, "4"),
+    (curses.A_BLINK, "5"),
+    (curses.A_REVERSE, "7"),
+)
+
+# unchanged cells shorter than a cursor move are rewritten instead of jumped over
+_MAX_GAP = 4
+
+def _color_sgr(color: int, base: int, bright_base: int) -> str:
+    if color < 0:
+        return str(base + 9)
+    if color < 8:
+        return str(base + color)
+    if color < 16:
+        return str(bright_base + color - 8)
+    return f"{base + 8};5;{color}"
+
+class CellDiffRenderer:
+    """Turns the difference between two cell buffers into terminal output.
+
+    The front buffer holds what the terminal shows and the back buffer what it should show. Only
+    the runs of cells that differ are written, with a cursor move to the start of each run and an
+    SGR sequence whenever the attribute changes. The front buffer is updated to match.
+
+    A wide character is written from its cell and the continuation cell on its right is skipped,
+    runs are widened to take both. What is left of a wide character partly drawn over is written
+    as a space.
+    """
+    def __init__(self, pair_content: Callable[[int], tuple[int, int]]) -> None:
+        self._pair_content = pair_content
+        self._sgr_cache: dict[int, str] = {}
+
+    def invalidate(self) -> None:
+        """Forget the cached SGR sequences, after a color pair changed."""
+        self._sgr_cache.clear()
+
+    def sgr(self, attr: int) -> str:
+        sgr = self._sgr_cache.get(attr)
+        if sgr is None:
+            params = ["0"]
+            params.extend(param for bit, param in _SGR_ATTRS if attr & bit)
+
+            pair = (attr & curses.A_COLOR) >> 8
+            if pair:
+                fg, bg = self._pair_content(pair)
+                params.append(_color_sgr(fg, 30, 90))
+                params.append(_color_sgr(bg, 40, 100))
+
+            sgr = self._sgr_cache[attr] = f"\x1b[{';'.join(params)}m"
+        return sgr
+
+    def render(self, front: _Buffer, back: _Buffer, rows: Iterable[int]) -> str:
+        """The output bringing the terminal from the front buffer to the back buffer."""
+        out: list[str] = []
+        cur_y = cur_x = -1
+        cur_attr: int | None = None
+        width = back.width
+
+        for y in sorted(rows):
+            front_chars, front_attrs = front.chars[y], front.attrs[y]
+            back_chars, back_attrs = back.chars[y], back.attrs[y]
+            if front_chars == back_chars and front_attrs == back_attrs:
+                continue
+
+            x = 0
+            while x < width:
+                if front_chars[x] == back_chars[x] and front_attrs[x] == back_attrs[x]:
+                    x += 1
+                    continue
+
+                # end of the run of changed cells, bridging over short unchanged gaps
+                end = x + 1
+                gap = 0
+                while end + gap < width and gap <= _MAX_GAP:
+                    i = end + gap
+                    if front_chars[i] == back_chars[i] and front_attrs[i] == back_attrs[i]:
+                        gap += 1
+                    else:
+                        end, gap = i + 1, 0
+
+                # the terminal writes wide characters whole, from their left cell
+                if x > 0 and back_chars[x] == WIDE_CONTINUATION:
+                    x -= 1
+                if end < width and back_chars[end] == WIDE_CONTINUATION:
+                    end += 1
+
+                if cur_y != y:
+                    out.append(f"\x1b[{y + 1};{x + 1}H")
+                elif cur_x != x:
+                    out.append(f"\x1b[{x - cur_x}C" if x > cur_x else f"\x1b[{x + 1}G")
+
+                for i in range(x, end):
+                    attr = back_attrs[i]
+                    if attr != cur_attr:
+                        out.append(self.sgr(attr))
+                        cur_attr = attr
+
+                    ch = back_chars[i]
+                    if ch == WIDE_CONTINUATION:
+                        # written with the wide character on its left, unless that one is gone
+                        if i == 0 or not is_wide(back_chars[i - 1]):
+                            out.append(" ")
+                    elif ch < " " or ch == "\x7f":
+                        # control characters would move the cursor of the terminal
+                        out.append(" ")
+                    elif is_wide(ch) and (i + 1 == width or back_chars[i + 1] != WIDE_CONTINUATION):
+                        # the right half was drawn over, the character would spill on the next cell
+                        out.append(" ")
+                    else:
+                        out.append(ch)
+
+                front_chars[x:end] = back_chars[x:end]
+                front_attrs[x:end] = back_attrs[x:end]
+
+                # the cursor position is unreliable after writing in the last column
+                cur_y, cur_x = (y, end) if end < width else (-1, -1)
+                x = end
+
+        return "".join(out)
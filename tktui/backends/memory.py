@@ -0,0 +1,695 @@
+from __future__ import annotations
+
+from collections import deque
+from typing import TypeVar
+import curses
+import os
+import select
+
+from tktui.backends.base import Backend
+from tktui.text import char_width
+
+# box drawing characters used for the curses default borders (ACS_* needs initscr)
+_DEFAULT_BORDER = ("│", "│", "─", "─", "┌", "┐", "└", "┘")
+
+# the cell on the right of a wide character, taken by it. Empty so rows still join into their text
+WIDE_CONTINUATION = ""
+
+T = TypeVar("T")
+
+def is_wide(ch: str) -> bool:
+    """Whether the content of a cell is a character taking two cells."""
+    # the characters before U+1100 all take one cell, without a lookup
+    return ch > "\u10ff" and char_width(ch[0]) == 2
+
+class _Buffer:
+    """Cell storage of a top level window or pad. Sub-windows view into their root's buffer."""
+    def __init__(self, height: int, width: int) -> None:
+        self.height = height
+        self.width = width
+        self.chars = [[" "] * width for _ in range(height)]
+        self.attrs = [[0] * width for _ in range(height)]
+
+    def resize(self, height: int, width: int) -> None:
+        _fit(self.chars, height, width, " ")
+        _fit(self.attrs, height, width, 0)
+        self.height = height
+        self.width = width
+
+
+def _fit(rows: list[list[T]], height: int, width: int, fill: T) -> None:
+    """Cut or extend the rows to height rows of width cells, new cells holding fill."""
+    del rows[height:]
+    for row in rows:
+        del row[width:]
+        row.extend([fill] * (width - len(row)))
+    rows.extend([fill] * width for _ in range(height - len(rows)))
+
+
+class MemoryWindow:
+    """In-memory stand in for curses.window.
+
+    Like curses, windows created with derwin share the cells of the window they were derived from,
+    noutrefresh copies the lines of the window changed since the last time to the virtual screen of
+    the backend and doupdate makes the virtual screen visible.
+    """
+    def __init__(
+        self,
+        backend: MemoryBackend,
+        buffer: _Buffer,
+        height: int,
+        width: int,
+        beg_y: int,
+        beg_x: int,
+        parent: MemoryWindow | None = None,
+        off_y: int = 0,
+        off_x: int = 0,
+        is_pad: bool = False,
+    ) -> None:
+        self._backend = backend
+        self._buf = buffer
+        self._parent = parent
+        self._height = height
+        self._width = width
+        # position on the screen
+        self._beg_y = beg_y
+        self._beg_x = beg_x
+        # position of the window in the buffer it shares with its root
+        self._off_y = off_y
+        self._off_x = off_x
+        self._is_pad = is_pad
+
+        self._cur_y = 0
+        self._cur_x = 0
+        self._bkgd_ch = " "
+        self._bkgd_attr = 0
+        self._keypad = False
+        self._nodelay = False
+        self._scrollok = False
+        # lines changed since the last noutrefresh, which only copies these
+        self._touched: set[int] = set(range(height))
+
+    def _check(self, y: int, x: int) -> None:
+        if not (0 <= y < self._height and 0 <= x < self._width):
+            raise curses.error(f"position ({y}, {x}) is outside of the window")
+
+    def _put(self, ch: str, attr: int) -> None:
+        """Write a character at the cursor and advance it like waddch."""
+        if ch == "\n":
+            self.clrtoeol()
+            self._newline()
+            return
+
+        if not attr & curses.A_COLOR:
+            attr |= self._bkgd_attr
+
+        width = 1 if ch < "\x80" else char_width(ch)
+        y, x = self._off_y + self._cur_y, self._off_x + self._cur_x
+        chars, attrs = self._buf.chars[y], self._buf.attrs[y]
+        if width == 0:
+            if self._cur_x > 0:
+                # a combining mark joins the character before the cursor
+                x -= 1
+                if chars[x] == WIDE_CONTINUATION and self._cur_x > 1:
+                    x -= 1
+                chars[x] += ch
+                self._touched.add(self._cur_y)
+                return
+            width = 1
+        elif width == 2 and self._cur_x == self._width - 1:
+            # no room left on the line, like curses the wide character goes on the next one
+            self._put(" ", attr)
+            self._put(ch, attr)
+            return
+
+        chars[x] = ch
+        attrs[x] = attr
+        if width == 2:
+            chars[x + 1] = WIDE_CONTINUATION
+            attrs[x + 1] = attr
+        self._mend(chars, x, x + width)
+        self._touched.add(self._cur_y)
+
+        self._cur_x += width
+        if self._cur_x == self._width:
+            self._newline()
+
+    @staticmethod
+    def _mend(chars: list[str], start: int, end: int) -> None:
+        """Blank what is left of the wide characters partly written over by the cells start to end."""
+        if start > 0 and is_wide(chars[start - 1]):
+            chars[start - 1] = " "
+        if end < len(chars) and chars[end] == WIDE_CONTINUATION:
+            chars[end] = " "
+
+    def _newline(self) -> None:
+        self._cur_x = 0
+        if self._cur_y + 1 < self._height:
+            self._cur_y += 1
+        elif self._scrollok:
+            self.scroll(1)
+        else:
+            # curses keeps the cursor in the last cell and reports an error
+            self._cur_x = self._width - 1
+            raise curses.error("addwstr() returned ERR")
+
+    # ---- curses.window interface ----
+
+    def derwin(self, *args: int) -> MemoryWindow:
+        if len(args) == 2:
+            height, width, (y, x) = 0, 0, args
+        else:
+            height, width, y, x = args
+
+        height = height or self._height - y
+        width = width or self._width - x
+        if y < 0 or x < 0 or height <= 0 or width <= 0 or y + height > self._height or x + width > self._width:
+            raise curses.error("curses function returned NULL")
+
+        return MemoryWindow(
+            self._backend,
+            self._buf,
+            height,
+            width,
+            self._beg_y + y,
+            self._beg_x + x,
+            parent=self,
+            off_y=self._off_y + y,
+            off_x=self._off_x + x,
+            is_pad=self._is_pad,
+        )
+
+    subpad = derwin
+
+    def getbegyx(self) -> tuple[int, int]:
+        return (self._beg_y, self._beg_x)
+
+    def getmaxyx(self) -> tuple[int, int]:
+        return (self._height, self._width)
+
+    def getparyx(self) -> tuple[int, int]:
+        if self._parent is None:
+            return (-1, -1)
+        return (self._off_y - self._parent._off_y, self._off_x - self._parent._off_x)
+
+    def getyx(self) -> tuple[int, int]:
+        return (self._cur_y, self._cur_x)
+
+    def move(self, y: int, x: int) -> None:
+        self._check(y, x)
+        self._cur_y, self._cur_x = y, x
+
+    def enclose(self, y: int, x: int) -> bool:
+        return (
+            self._beg_y <= y < self._beg_y + self._height
+            and self._beg_x <= x < self._beg_x + self._width
+        )
+
+    def keypad(self, flag: bool) -> None:
+        self._keypad = flag
+
+    def nodelay(self, flag: bool) -> None:
+        self._nodelay = flag
+
+    def scrollok(self, flag: bool) -> None:
+        self._scrollok = flag
+
+    def bkgd(self, ch: str | int, attr: int = 0) -> None:
+        if isinstance(ch, int):
+            # chtype with the attributes above the character
+            attr |= ch & ~curses.A_CHARTEXT
+            ch = chr(ch & curses.A_CHARTEXT)
+        old_ch, old_attr = self._bkgd_ch, self._bkgd_attr
+        for y in range(self._off_y, self._off_y + self._height):
+            chars, attrs = self._buf.chars[y], self._buf.attrs[y]
+            for x in range(self._off_x, self._off_x + self._width):
+                if chars[x] == old_ch:
+                    chars[x] = ch
+                attrs[x] = (attrs[x] & ~old_attr) | attr
+
+        self._bkgd_ch, self._bkgd_attr = ch, attr
+        self.touchwin()
+
+    def getbkgd(self) -> int:
+        return ord(self._bkgd_ch) | self._bkgd_attr
+
+    def addstr(self, *args: int | str) -> None:
+        if len(args) >= 3:
+            y, x, text, *rest = args
+            self.move(int(y), int(x))
+        elif args:
+            text, *rest = args
+        else:
+            raise TypeError("addstr requires 1 to 4 arguments")
+
+        attr = int(rest[0]) if rest else 0
+        text = str(text)
+        end = self._cur_x + len(text)
+        if end <= self._width and text.isascii() and "\n" not in text:
+            # the text stays on the line, written in one go instead of a character at a time
+            if not attr & curses.A_COLOR:
+                attr |= self._bkgd_attr
+            y, x = self._off_y + self._cur_y, self._off_x + self._cur_x
+            chars = self._buf.chars[y]
+            chars[x:x + len(text)] = text
+            self._mend(chars, x, x + len(text))
+            self._buf.attrs[y][x:x + len(text)] = [attr] * len(text)
+            self._touched.add(self._cur_y)
+            self._cur_x = end
+            if end == self._width:
+                self._newline()
+            return
+
+        for ch in text:
+            self._put(ch, attr)
+
+    def addnstr(self, *args: int | str) -> None:
+        if len(args) >= 4:
+            y, x, text, n, *rest = args
+            self.addstr(y, x, str(text)[:int(n)], *rest)
+        elif len(args) >= 2:
+            text, n, *rest = args
+            self.addstr(str(text)[:int(n)], *rest)
+        else:
+            raise TypeError("addnstr requires 2 to 5 arguments")
+
+    def addch(self, *args: int | str) -> None:
+        if len(args) >= 3:
+            y, x, ch, *rest = args
+            self.move(int(y), int(x))
+        elif args:
+            ch, *rest = args
+        else:
+            raise TypeError("addch requires 1 to 4 arguments")
+
+        attr = int(rest[0]) if rest else 0
+        if isinstance(ch, int):
+            # chtype with the attributes above the character
+            attr |= ch & ~curses.A_CHARTEXT
+            ch = chr(ch & curses.A_CHARTEXT)
+
+        # addch does not fail on the bottom right corner
+        y, x = self._cur_y, self._cur_x
+        if y == self._height - 1 and x == self._width - 1:
+            if not attr & curses.A_COLOR:
+                attr |= self._bkgd_attr
+            self._buf.chars[self._off_y + y][self._off_x + x] = ch
+            self._buf.attrs[self._off_y + y][self._off_x + x] = attr
+            self._touched.add(y)
+            return
+
+        self._put(ch, attr)
+
+    def inch(self, y: int, x: int) -> int:
+        self._check(y, x)
+        y, x = self._off_y + y, self._off_x + x
+        # the first character of a cell with combining marks, a space for the right of a wide one
+        return ord(self._buf.chars[y][x][:1] or " ") | self._buf.attrs[y][x]
+
+    def instr(self, y: int, x: int, n: int | None = None) -> bytes:
+        self._check(y, x)
+        end = self._width if n is None else min(self._width, x + n)
+        row = self._buf.chars[self._off_y + y]
+        return "".join(row[self._off_x + x:self._off_x + end]).encode()
+
+    def border(
+        self,
+        ls: int | str = 0,
+        rs: int | str = 0,
+        ts: int | str = 0,
+        bs: int | str = 0,
+        tl: int | str = 0,
+        tr: int | str = 0,
+        bl: int | str = 0,
+        br: int | str = 0,
+    ) -> None:
+        ls, rs, ts, bs, tl, tr, bl, br = (
+            default if ch == 0 else (ch if isinstance(ch, str) else chr(ch))
+            for ch, default in zip((ls, rs, ts, bs, tl, tr, bl, br), _DEFAULT_BORDER)
+        )
+        height, width = self._height, self._width
+        attr = self._bkgd_attr
+        chars, attrs = self._buf.chars, self._buf.attrs
+        top, bottom = self._off_y, self._off_y + height - 1
+        left, right = self._off_x, self._off_x + width - 1
+
+        for x in range(left + 1, right):
+            chars[top][x], attrs[top][x] = ts, attr
+            chars[bottom][x], attrs[bottom][x] = bs, attr
+        for y in range(top + 1, bottom):
+            chars[y][left], attrs[y][left] = ls, attr
+            chars[y][right], attrs[y][right] = rs, attr
+
+        chars[top][left], attrs[top][left] = tl, attr
+        chars[top][right], attrs[top][right] = tr, attr
+        chars[bottom][left], attrs[bottom][left] = bl, attr
+        chars[bottom][right], attrs[bottom][right] = br, attr
+        self.touchwin()
+
+    def box(self, vertch: int | str = 0, horch: int | str = 0) -> None:
+        self.border(vertch, vertch, horch, horch)
+
+    def erase(self) -> None:
+        for y in range(self._off_y, self._off_y + self._height):
+            self._buf.chars[y][self._off_x:self._off_x + self._width] = [self._bkgd_ch] * self._width
+            self._buf.attrs[y][self._off_x:self._off_x + self._width] = [self._bkgd_attr] * self._width
+
+        self._cur_y = self._cur_x = 0
+        self.touchwin()
+
+    clear = erase
+
+    def clrtoeol(self) -> None:
+        y = self._off_y + self._cur_y
+        start, end = self._off_x + self._cur_x, self._off_x + self._width
+        self._buf.chars[y][start:end] = [self._bkgd_ch] * (end - start)
+        self._buf.attrs[y][start:end] = [self._bkgd_attr] * (end - start)
+        self._touched.add(self._cur_y)
+
+    def scroll(self, lines: int = 1) -> None:
+        chars, attrs = self._buf.chars, self._buf.attrs
+        left, right = self._off_x, self._off_x + self._width
+        rows = range(self._off_y, self._off_y + self._height)
+        if lines < 0:
+            rows = rows[::-1]
+
+        for y in rows:
+            src = y + lines
+            if self._off_y <= src < self._off_y + self._height:
+                chars[y][left:right] = chars[src][left:right]
+                attrs[y][left:right] = attrs[src][left:right]
+            else:
+                chars[y][left:right] = [self._bkgd_ch] * self._width
+                attrs[y][left:right] = [self._bkgd_attr] * self._width
+
+        self.touchwin()
+
+    def resize(self, height: int, width: int) -> None:
+        if self._parent is None:
+            self._buf.resize(height, width)
+        elif self._off_y + height > self._buf.height or self._off_x + width > self._buf.width:
+            raise curses.error("wresize() returned ERR")
+
+        self._height, self._width = height, width
+        self._cur_y = min(self._cur_y, height - 1)
+        self._cur_x = min(self._cur_x, width - 1)
+        self._touched = set(range(height))
+
+    def mvderwin(self, y: int, x: int) -> None:
+        """Show another part of the parent. Like curses the screen position is left as is."""
+        parent = self._parent
+        if parent is None or y + self._height > parent._height or x + self._width > parent._width:
+            raise curses.error("mvderwin() returned ERR")
+
+        self._off_y, self._off_x = parent._off_y + y, parent._off_x + x
+        self.touchwin()
+
+    def mvwin(self, y: int, x: int) -> None:
+        if self._is_pad:
+            raise curses.error("mvwin() returned ERR")
+        self._beg_y, self._beg_x = y, x
+        self.touchwin()
+
+    def touchwin(self) -> None:
+        self._touched.update(range(self._height))
+
+    redrawwin = touchwin
+
+    def touchline(self, start: int, count: int, changed: bool = True) -> None:
+        lines = range(max(0, start), min(self._height, start + count))
+        if changed:
+            self._touched.update(lines)
+        else:
+            self._touched.difference_update(lines)
+
+    def syncup(self) -> None:
+        """Mark the lines changed in the window as changed in the ones it was derived from, like curses."""
+        window, lines = self, self._touched
+        while window._parent is not None:
+            parent = window._parent
+            shift = window._off_y - parent._off_y
+            lines = {line + shift for line in lines}
+            parent._touched.update(lines)
+            window = parent
+
+    def untouchwin(self) -> None:
+        self._touched.clear()
+
+    def is_wintouched(self) -> bool:
+        return bool(self._touched)
+
+    def is_linetouched(self, line: int) -> bool:
+        return line in self._touched
+
+    def noutrefresh(self, *args: int) -> None:
+        if self._is_pad:
+            pminrow, pmincol, sminrow, smincol, smaxrow, smaxcol = args
+            src_y, src_x = self._off_y + pminrow, self._off_x + pmincol
+            height = min(smaxrow - sminrow + 1, self._height - pminrow)
+            width = min(smaxcol - smincol + 1, self._width - pmincol)
+            self._backend._stage(self._buf, src_y, src_x, height, width, sminrow, smincol)
+        elif len(self._touched) == self._height:
+            self._backend._stage(
+                self._buf, self._off_y, self._off_x, self._height, self._width, self._beg_y, self._beg_x
+            )
+        elif self._touched:
+            # one copy per run of consecutive lines
+            lines = sorted(self._touched)
+            start = end = lines[0]
+            for line in lines[1:] + [-1]:
+                if line == end + 1:
+                    end = line
+                    continue
+                self._backend._stage(
+                    self._buf,
+                    self._off_y + start,
+                    self._off_x,
+                    end - start + 1,
+                    self._width,
+                    self._beg_y + start,
+                    self._beg_x,
+                )
+                start = end = line
+
+        self._touched.clear()
+
+    def refresh(self, *args: int) -> None:
+        self.noutrefresh(*args)
+        self._backend.doupdate()
+
+    def getch(self, *args: int) -> int:
+        if args:
+            self.move(*args)
+        return self._backend._getch(block=not self._nodelay)
+
+
+class MemoryBackend(Backend):
+    """Headless backend keeping the screen as a grid of cells in memory.
+
+    Input is injected with push_key and push_mouse and read back by getch and getmouse, and the
+    screen can be inspected with text for snapshots.
+    """
+    signals_resize = False
+
+    def __init__(self, height: int = 24, width: int = 80, colors: int = 256, color_pairs: int = 256) -> None:
+        self.height = height
+        self.width = width
+        self.colors = colors
+        self.color_pairs = color_pairs
+        # the size of the terminal, which the screen follows once the app handled the KEY_RESIZE
+        self._terminal_size = (height, width)
+
+        # virtual screen staged by noutrefresh and the screen made visible by doupdate
+        self._virtual = _Buffer(height, width)
+        self._changed_rows: set[int] = set()
+        self.screen = _Buffer(height, width)
+        self.updates = 0
+
+        self._pairs: dict[int, tuple[int, int]] = {0: (-1, -1)}
+        self._mousemask = 0
+        self.paste_enabled = False
+        self._input: deque[int] = deque()
+        self._mouse: deque[tuple[int, int, int, int, int]] = deque()
+
+        # the read end becomes readable when there is input so apps can wait on it with select
+        self._wake_r, self._wake_w = os.pipe()
+        os.set_blocking(self._wake_r, False)
+
+        self.stdscr: MemoryWindow | None = None
+
+    def close(self) -> None:
+        os.close(self._wake_r)
+        os.close(self._wake_w)
+
+    # ---- input ----
+
+    def push_key(self, *keys: int | str) -> None:
+        """Queue keys for getch. Strings are queued one character at a time."""
+        was_empty = not self._input
+        for key in keys:
+            if isinstance(key, str):
+                self._input.extend(map(ord, key))
+            else:
+                self._input.append(key)
+
+        if was_empty and self._input:
+            os.write(self._wake_w, b"\0")
+
+    def push_paste(self, text: str) -> None:
+        """Queue text for getch as a terminal in bracketed paste mode sends it."""
+        self.push_key(f"\x1b[200~{text}\x1b[201~")
+
+    def set_terminal_size(self, height: int, width: int) -> None:
+        """Resize the terminal. Like curses, getch returns a KEY_RESIZE for it."""
+        self._terminal_size = (height, width)
+        self.push_key(curses.KEY_RESIZE)
+
+    def push_mouse(self, x: int, y: int, bstate: int) -> None:
+        """Queue a mouse event for getmouse and the KEY_MOUSE for getch that announces it."""
+        self._mouse.append((0, x, y, 0, bstate))
+        self.push_key(curses.KEY_MOUSE)
+
+    def _getch(self, block: bool) -> int:
+        if not self._input:
+            if not block:
+                return -1
+            select.select([self._wake_r], [], [])
+
+        key = self._input.popleft()
+        if not self._input:
+            try:
+                os.read(self._wake_r, 1024)
+            except BlockingIOError:
+                pass
+        return key
+
+    # ---- output ----
+
+    def _stage(
+        self,
+        buffer: _Buffer,
+        src_y: int,
+        src_x: int,
+        height: int,
+        width: int,
+        dst_y: int,
+        dst_x: int,
+    ) -> None:
+        """Copy a region of a window buffer to the virtual screen, clipped to the screen."""
+        if dst_y < 0:
+            src_y, height, dst_y = src_y - dst_y, height + dst_y, 0
+        if dst_x < 0:
+            src_x, width, dst_x = src_x - dst_x, width + dst_x, 0
+        height = min(height, self.height - dst_y)
+        width = min(width, self.width - dst_x)
+        if height <= 0 or width <= 0:
+            return
+
+        virtual = self._virtual
+        for row in range(height):
+            y = dst_y + row
+            virtual.chars[y][dst_x:dst_x + width] = buffer.chars[src_y + row][src_x:src_x + width]
+            virtual.attrs[y][dst_x:dst_x + width] = buffer.attrs[src_y + row][src_x:src_x + width]
+            self._changed_rows.add(y)
+
+    def doupdate(self) -> None:
+        virtual, screen = self._virtual, self.screen
+        for y in self._changed_rows:
+            screen.chars[y][:] = virtual.chars[y]
+            screen.attrs[y][:] = virtual.attrs[y]
+
+        self._changed_rows.clear()
+        self.updates += 1
+
+    def text(self) -> list[str]:
+        """The visible screen as one string per row."""
+        return ["".join(row) for row in self.screen.chars]
+
+    def attr(self, y: int, x: int) -> int:
+        return self.screen.attrs[y][x]
+
+    # ---- curses module interface ----
+
+    def initscr(self) -> MemoryWindow:
+        if self.stdscr is None:
+            self.stdscr = MemoryWindow(self, _Buffer(self.height, self.width), self.height, self.width, 0, 0)
+        return self.stdscr
+
+    def newwin(self, height: int, width: int, beg_y: int = 0, beg_x: int = 0) -> MemoryWindow:
+        return MemoryWindow(self, _Buffer(height, width), height, width, beg_y, beg_x)
+
+    def newpad(self, height: int, width: int) -> MemoryWindow:
+        return MemoryWindow(self, _Buffer(height, width), height, width, 0, 0, is_pad=True)
+
+    def endwin(self) -> None:
+        pass
+
+    def fileno(self) -> int:
+        return self._wake_r
+
+    def terminal_size(self) -> tuple[int, int]:
+        return self._terminal_size
+
+    def resize_term(self, height: int, width: int) -> None:
+        self.height, self.width = height, width
+        self._virtual.resize(height, width)
+        self.screen.resize(height, width)
+        self._changed_rows = {y for y in self._changed_rows if y < height}
+        if self.stdscr is not None:
+            self.stdscr.resize(height, width)
+
+    def start_color(self) -> None:
+        pass
+
+    def use_default_colors(self) -> None:
+        pass
+
+    def color_count(self) -> int:
+        return self.colors
+
+    def pair_count(self) -> int:
+        return self.color_pairs
+
+    def init_pair(self, pair_number: int, fg: int, bg: int) -> None:
+        self._pairs[pair_number] = (fg, bg)
+
+    def pair_content(self, pair_number: int) -> tuple[int, int]:
+        return self._pairs[pair_number]
+
+    def color_pair(self, pair_number: int) -> int:
+        # same encoding as the curses COLOR_PAIR macro
+        return (pair_number << 8) & curses.A_COLOR
+
+    def curs_set(self, visibility: int) -> None:
+        pass
+
+    def cbreak(self) -> None:
+        pass
+
+    def nocbreak(self) -> None:
+        pass
+
+    def echo(self) -> None:
+        pass
+
+    def noecho(self) -> None:
+        pass
+
+    def flushinp(self) -> None:
+        self._input.clear()
+        self._mouse.clear()
+        try:
+            os.read(self._wake_r, 1024)
+        except BlockingIOError:
+            pass
+
+    def mousemask(self, mask: int) -> None:
+        self._mousemask = mask
+
+    def getmouse(self) -> tuple[int, int, int, int, int]:
+        if not self._mouse:
+            raise curses.error("getmouse() returned ERR")
+        return self._mouse.popleft()
+
+    def bracketed_paste(self, enabled: bool) -> None:
+        self.paste_enabled = enabled
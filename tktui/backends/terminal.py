@@ -0,0 +1,310 @@
+from __future__ import annotations
+
+import curses
+import os
+import select
+import sys
+import termios
+import tty
+
+from tktui.backends.diff import CellDiffRenderer
+from tktui.backends.memory import MemoryBackend, MemoryWindow, _Buffer
+
+# final byte of CSI sequences and the curses key they stand for
+_CSI_KEYS = {
+    "A": curses.KEY_UP,
+    "B": curses.KEY_DOWN,
+    "C": curses.KEY_RIGHT,
+    "D": curses.KEY_LEFT,
+    "H": curses.KEY_HOME,
+    "F": curses.KEY_END,
+    "Z": curses.KEY_BTAB,
+    "P": curses.KEY_F1,
+    "Q": curses.KEY_F2,
+    "R": curses.KEY_F3,
+    "S": curses.KEY_F4,
+}
+
+# parameter of the CSI ... ~ sequences
+_TILDE_KEYS = {
+    1: curses.KEY_HOME,
+    2: curses.KEY_IC,
+    3: curses.KEY_DC,
+    4: curses.KEY_END,
+    5: curses.KEY_PPAGE,
+    6: curses.KEY_NPAGE,
+    15: curses.KEY_F5,
+    17: curses.KEY_F6,
+    18: curses.KEY_F7,
+    19: curses.KEY_F8,
+    20: curses.KEY_F9,
+    21: curses.KEY_F10,
+    23: curses.KEY_F11,
+    24: curses.KEY_F12,
+}
+
+# seconds to wait for the rest of an escape sequence
+_ESC_DELAY = 0.025
+
+_BUTTON_STATES = (
+    (curses.BUTTON1_PRESSED, curses.BUTTON1_RELEASED, curses.BUTTON1_CLICKED),
+    (curses.BUTTON2_PRESSED, curses.BUTTON2_RELEASED, curses.BUTTON2_CLICKED),
+    (curses.BUTTON3_PRESSED, curses.BUTTON3_RELEASED, curses.BUTTON3_CLICKED),
+)
+
+class TerminalBackend(MemoryBackend):
+    """Backend composing the screen in memory and writing only the changed cells to the terminal.
+
+    Windows are the MemoryWindows of the MemoryBackend. doupdate diffs the virtual screen against
+    what the terminal shows with a CellDiffRenderer, and input is parsed from the raw terminal
+    including SGR mouse reports.
+    """
+    signals_resize = True
+
+    def __init__(self, input_fd: int | None = None, output_fd: int | None = None) -> None:
+        self._in_fd = sys.stdin.fileno() if input_fd is None else input_fd
+        self._out_fd = sys.stdout.fileno() if output_fd is None else output_fd
+        try:
+            width, height = os.get_terminal_size(self._out_fd)
+        except OSError:
+            width = height = 0
+        # like curses, fall back to the conventional size when the terminal does not report one
+        super().__init__(height or 24, width or 80)
+
+        self.renderer = CellDiffRenderer(self.pair_content)
+        # pairs given other colors since the last doupdate
+        self._redefined: set[int] = set()
+        self.bytes_written = 0
+
+        self._saved_tty: list | None = None
+        self._pending = b""
+        # buttons pressed without motion since, released into a click
+        self._pressed: set[int] = set()
+
+    def _write(self, data: str) -> None:
+        raw = data.encode()
+        self.bytes_written += len(raw)
+        while raw:
+            raw = raw[os.write(self._out_fd, raw):]
+
+    # ---- output ----
+
+    def doupdate(self) -> None:
+        if self._redefined:
+            self._forget_redefined()
+        out = self.renderer.render(self.screen, self._virtual, self._changed_rows)
+        self._changed_rows.clear()
+        self.updates += 1
+        if out:
+            self._write(out)
+
+    def init_pair(self, pair_number: int, fg: int, bg: int) -> None:
+        if self._pairs.get(pair_number, (fg, bg)) != (fg, bg):
+            self._redefined.add(pair_number)
+        super().init_pair(pair_number, fg, bg)
+        self.renderer.invalidate()
+
+    def _forget_redefined(self) -> None:
+        """Make the cells the terminal shows with a pair that changed since differ from any cell.
+
+        Unlike curses the terminal does not know the pairs, the cells keep the colors they were
+        written with and are written again by the next diff.
+        """
+        redefined = self._redefined
+        for y, attrs in enumerate(self.screen.attrs):
+            for x, attr in enumerate(attrs):
+                if (attr & curses.A_COLOR) >> 8 in redefined:
+                    attrs[x] = -1
+                    self._changed_rows.add(y)
+        redefined.clear()
+
+    # ---- terminal modes ----
+
+    def initscr(self) -> MemoryWindow:
+        self._saved_tty = termios.tcgetattr(self._in_fd)
+        # alternate screen, cleared, with the attributes reset
+        self._write("\x1b[?1049h\x1b[0m\x1b[2J")
+        return super().initscr()
+
+    def endwin(self) -> None:
+        self._write("\x1b[?2004l\x1b[?1000l\x1b[?1003l\x1b[?1006l\x1b[0m\x1b[?25h\x1b[?1049l")
+        if self._saved_tty is not None:
+            termios.tcsetattr(self._in_fd, termios.TCSADRAIN, self._saved_tty)
+            self._saved_tty = None
+
+    def fileno(self) -> int:
+        return self._in_fd
+
+    def terminal_size(self) -> tuple[int, int]:
+        try:
+            width, height = os.get_terminal_size(self._out_fd)
+        except OSError:
+            return (self.height, self.width)
+        return (height, width)
+
+    def resize_term(self, height: int, width: int) -> None:
+        super().resize_term(height, width)
+        # terminals reflow what they show when resized, it is cleared and written again as a whole
+        self._write("\x1b[0m\x1b[2J")
+        self.screen = _Buffer(height, width)
+        self._changed_rows.update(range(height))
+
+    def curs_set(self, visibility: int) -> None:
+        self._write("\x1b[?25h" if visibility else "\x1b[?25l")
+
+    def cbreak(self) -> None:
+        tty.setcbreak(self._in_fd)
+
+    def nocbreak(self) -> None:
+        if self._saved_tty is not None:
+            termios.tcsetattr(self._in_fd, termios.TCSADRAIN, self._saved_tty)
+
+    def noecho(self) -> None:
+        attrs = termios.tcgetattr(self._in_fd)
+        attrs[3] &= ~termios.ECHO
+        termios.tcsetattr(self._in_fd, termios.TCSADRAIN, attrs)
+
+    def echo(self) -> None:
+        attrs = termios.tcgetattr(self._in_fd)
+        attrs[3] |= termios.ECHO
+        termios.tcsetattr(self._in_fd, termios.TCSADRAIN, attrs)
+
+    def flushinp(self) -> None:
+        super().flushinp()
+        termios.tcflush(self._in_fd, termios.TCIFLUSH)
+
+    def mousemask(self, mask: int) -> None:
+        super().mousemask(mask)
+        if not mask:
+            self._write("\x1b[?1000l\x1b[?1003l\x1b[?1006l")
+            return
+
+        motion = "\x1b[?1003h" if mask & curses.REPORT_MOUSE_POSITION else "\x1b[?1003l"
+        self._write(f"\x1b[?1000h{motion}\x1b[?1006h")
+
+    def bracketed_paste(self, enabled: bool) -> None:
+        super().bracketed_paste(enabled)
+        self._write("\x1b[?2004h" if enabled else "\x1b[?2004l")
+
+    # ---- input ----
+
+    def _getch(self, block: bool) -> int:
+        if not self._input:
+            self._read_input(block)
+        return super()._getch(block=False)
+
+    def _read_input(self, block: bool) -> None:
+        """Read what the terminal has available and queue the keys and mouse events in it."""
+        if not select.select([self._in_fd], [], [], None if block else 0)[0]:
+            return
+
+        data = os.read(self._in_fd, 4096)
+        while data:
+            self._parse(self._pending + data)
+
+            # give the rest of a split escape sequence a moment to arrive, like ESCDELAY in curses
+            if not self._pending or not select.select([self._in_fd], [], [], _ESC_DELAY)[0]:
+                break
+            data = os.read(self._in_fd, 4096)
+
+        # what never completed is taken as it is, e.g. a lone escape key
+        for byte in self._pending:
+            self.push_key(byte)
+        self._pending = b""
+
+    def _parse(self, data: bytes) -> None:
+        i = 0
+        end = len(data)
+        while i < end:
+            byte = data[i]
+
+            if byte == 0x1b and i + 1 == end:
+                self._pending = data[i:]
+                return
+            elif byte == 0x1b and data[i + 1] in b"[O":
+                consumed = self._parse_escape(data, i)
+                if consumed == 0:
+                    # incomplete sequence, wait for the rest of it
+                    self._pending = data[i:]
+                    return
+                i += consumed
+            elif byte >= 0x80:
+                # utf-8 sequence read as a single code point
+                length = 2 if byte < 0xe0 else 3 if byte < 0xf0 else 4
+                if i + length > end:
+                    self._pending = data[i:]
+                    return
+                self.push_key(ord(data[i:i + length].decode(errors="replace")[0]))
+                i += length
+            else:
+                self.push_key(curses.KEY_BACKSPACE if byte == 0x7f else byte)
+                i += 1
+
+        self._pending = b""
+
+    def _parse_escape(self, data: bytes, start: int) -> int:
+        """Queue the key or mouse event of the escape sequence at start.
+
+        Returns:
+            The number of bytes of the sequence, 0 when it is incomplete.
+        """
+        # the parameters run until the final byte in the range @ to ~
+        i = start + 2
+        while i < len(data) and not 0x40 <= data[i] <= 0x7e:
+            i += 1
+        if i >= len(data):
+            return 0
+
+        params = data[start + 2:i].decode(errors="replace")
+        final = chr(data[i])
+        length = i + 1 - start
+
+        if params.startswith("<") and final in "Mm":
+            self._mouse_report(params[1:], final == "M")
+        elif final == "~" and params in ("200", "201"):
+            # the paste brackets are passed on as curses reads them, an escape and the characters
+            self.push_key(data[start:start + length].decode())
+        elif final == "~":
+            key = _TILDE_KEYS.get(int(params.split(";")[0] or 0))
+            if key is not None:
+                self.push_key(key)
+        elif final in _CSI_KEYS:
+            self.push_key(_CSI_KEYS[final])
+        return length
+
+    def _mouse_report(self, params: str, pressed: bool) -> None:
+        """Translate an SGR mouse report to the curses mouse event of getmouse."""
+        try:
+            code, x, y = (int(param) for param in params.split(";"))
+        except ValueError:
+            return
+
+        bstate = 0
+        if code & 4:
+            bstate |= curses.BUTTON_SHIFT
+        if code & 8:
+            bstate |= curses.BUTTON_ALT
+        if code & 16:
+            bstate |= curses.BUTTON_CTRL
+
+        button = code & 0b11000011
+        if code & 32:
+            # motion invalidates the pending clicks
+            self._pressed.clear()
+            bstate |= curses.REPORT_MOUSE_POSITION
+        elif button == 64:
+            bstate |= curses.BUTTON4_PRESSED
+        elif button == 65:
+            bstate |= curses.BUTTON5_PRESSED
+        elif button < 3:
+            pressed_state, released_state, clicked_state = _BUTTON_STATES[button]
+            if pressed:
+                self._pressed.add(button)
+                bstate |= pressed_state
+            elif button in self._pressed:
+                self._pressed.discard(button)
+                bstate |= clicked_state
+            else:
+                bstate |= released_state
+
+        self.push_mouse(x - 1, y - 1, bstate)
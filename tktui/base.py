@@ -108,7 +108,9 @@ class FrameBase(ABC):
     def columnconfigure(
         self,
         index: int,
-        weight: int,
+        weight: int | None = None,
+        minsize: int | None = None,
+        pad: int | None = None,
     ) -> None:
         ...
 
@@ -116,7 +118,9 @@ class FrameBase(ABC):
     def rowconfigure(
         self,
         index: int,
-        weight: int,
+        weight: int | None = None,
+        minsize: int | None = None,
+        pad: int | None = None,
     ) -> None:
         ...
 
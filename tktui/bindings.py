@@ -0,0 +1,247 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING, Callable
+import curses
+import re
+
+if TYPE_CHECKING:
+    from tktui.events import KeyEvent, EventHandlerType
+    from tktui.widget import Widget
+
+# Tk keysyms and the curses key codes they are read as
+_KEYSYMS = {
+    "Return": 10,
+    "Tab": 9,
+    "BackSpace": curses.KEY_BACKSPACE,
+    "Escape": 27,
+    "space": 32,
+    "less": ord("<"),
+    "greater": ord(">"),
+    "minus": ord("-"),
+    "Up": curses.KEY_UP,
+    "Down": curses.KEY_DOWN,
+    "Left": curses.KEY_LEFT,
+    "Right": curses.KEY_RIGHT,
+    "Home": curses.KEY_HOME,
+    "End": curses.KEY_END,
+    "Prior": curses.KEY_PPAGE,
+    "Next": curses.KEY_NPAGE,
+    "Insert": curses.KEY_IC,
+    "Delete": curses.KEY_DC,
+    **{f"F{n}": curses.KEY_F0 + n for n in range(1, 13)},
+}
+
+_MODIFIERS = ("Control", "Alt", "Meta", "Shift")
+
+# a <...> pattern or a single character
+_TOKEN = re.compile(r"<([^<>]+)>|([^<>])")
+
+class BindException(Exception):
+    pass
+
+def parse_sequence(sequence: str) -> tuple[int, ...]:
+    """The key codes of a Tk style key sequence, e.g. "<Control-x><Control-s>" or "gg".
+
+    Patterns are made of modifiers and a keysym, Control for control characters, Alt or Meta for
+    the escape prefix the terminal sends them with and Shift. Characters outside of <> are keys
+    of their own.
+    """
+    keys: list[int] = []
+    end = 0
+    for match in _TOKEN.finditer(sequence):
+        if match.start() != end:
+            break
+        end = match.end()
+
+        if match.group(2) is not None:
+            keys.append(ord(match.group(2)))
+            continue
+
+        *modifiers, keysym = match.group(1).split("-") if match.group(1) != "-" else ["-"]
+        if modifiers and modifiers[-1] == "Key":
+            modifiers.pop()
+        if not keysym or any(modifier not in _MODIFIERS for modifier in modifiers):
+            raise BindException(f"Bad key pattern <{match.group(1)}> in {sequence!r}.")
+
+        if keysym in _KEYSYMS:
+            key = _KEYSYMS[keysym]
+        elif len(keysym) == 1:
+            key = ord(keysym)
+        else:
+            raise BindException(f"Unknown keysym {keysym!r} in {sequence!r}.")
+
+        if "Shift" in modifiers:
+            key = curses.KEY_BTAB if key == 9 else ord(chr(key).upper()) if key < 128 else key
+        if "Control" in modifiers:
+            if key >= 128:
+                raise BindException(f"Can not bind Control with {keysym!r} in {sequence!r}.")
+            key = ord(chr(key).lower()) & 0x1f
+        if "Alt" in modifiers or "Meta" in modifiers:
+            keys.append(27)
+        keys.append(key)
+
+    if end != len(sequence) or not keys:
+        raise BindException(f"Bad key sequence {sequence!r}.")
+    return tuple(keys)
+
+
+class _Node:
+    __slots__ = ("children", "handler")
+
+    def __init__(self) -> None:
+        self.children: dict[int, _Node] = {}
+        self.handler: EventHandlerType[KeyEvent] | None = None
+
+class BindingTrie:
+    """Key sequences bound to handlers, stored as a trie on their key codes."""
+    def __init__(self) -> None:
+        self.root = _Node()
+
+    def add(self, keys: tuple[int, ...], handler: EventHandlerType[KeyEvent]) -> None:
+        node = self.root
+        for key in keys:
+            node = node.children.setdefault(key, _Node())
+        node.handler = handler
+
+    def remove(self, keys: tuple[int, ...]) -> None:
+        path = [self.root]
+        for key in keys:
+            node = path[-1].children.get(key)
+            if node is None:
+                return
+            path.append(node)
+
+        path[-1].handler = None
+        # drop the nodes left without a binding under them
+        for key, node, parent in zip(reversed(keys), reversed(path), reversed(path[:-1])):
+            if node.children or node.handler is not None:
+                break
+            del parent.children[key]
+
+    def __bool__(self) -> bool:
+        return bool(self.root.children)
+
+
+class KeyBindings:
+    """Dispatch of the keys to the sequences bound on the focused widget and on the whole app.
+
+    Every key advances the position in the tries of the focused widget and the global one with a
+    dict lookup, whatever the number of bindings. A sequence that is also the prefix of a longer
+    one waits for the next key until the chord timeout, when it is run on its own. The keys typed
+    of a sequence that is broken off or times out without a binding are handed to replay, in
+    order, so binding "gg" still lets a single g through.
+    """
+    def __init__(
+        self,
+        after: Callable[..., str],
+        after_cancel: Callable[[str], None],
+        replay: Callable[[int], None],
+        chord_timeout: int = 1000,
+    ) -> None:
+        self._after = after
+        self._after_cancel = after_cancel
+        self._replay = replay
+        # milliseconds the next key of a sequence is waited for
+        self.chord_timeout = chord_timeout
+
+        self.global_bindings = BindingTrie()
+        self.widget_bindings: dict[Widget, BindingTrie] = {}
+
+        # positions in the tries of a sequence in progress, and the key events typed of it
+        self._pending: list[_Node] = []
+        self._pending_events: list[KeyEvent] = []
+        self._pending_widget: Widget | None = None
+        self._timeout_id: str | None = None
+
+    def bind(self, widget: Widget | None, sequence: str, handler: EventHandlerType[KeyEvent]) -> None:
+        keys = parse_sequence(sequence)
+        if widget is None:
+            trie = self.global_bindings
+        else:
+            trie = self.widget_bindings.setdefault(widget, BindingTrie())
+        trie.add(keys, handler)
+        self._reset()
+
+    def unbind(self, widget: Widget | None, sequence: str) -> None:
+        keys = parse_sequence(sequence)
+        trie = self.global_bindings if widget is None else self.widget_bindings.get(widget)
+        if trie is None:
+            return
+
+        trie.remove(keys)
+        if widget is not None and not trie:
+            del self.widget_bindings[widget]
+        self._reset()
+
+    def feed(self, event: KeyEvent, widget: Widget | None) -> bool:
+        """Advance the sequences in progress with the key of the event.
+
+        Returns:
+            Whether the key was taken by a binding, run now or waiting for the rest of its sequence.
+        """
+        key = event.key
+        pending = self._pending
+        if pending:
+            nodes = [child for node in pending if (child := node.children.get(key)) is not None]
+            events, pending_widget = self._pending_events, self._pending_widget
+            self._reset()
+            if not nodes:
+                # the sequence was broken off, what was typed of it runs as if it timed out and the
+                # key may start another one
+                self._run_or_replay(pending, events, pending_widget)
+                return self.feed(event, widget)
+            events.append(event)
+        else:
+            roots = [self.global_bindings.root]
+            widget_trie = self.widget_bindings.get(widget) if widget is not None else None
+            if widget_trie is not None:
+                roots.insert(0, widget_trie.root)
+            nodes = [child for root in roots if (child := root.children.get(key)) is not None]
+            if not nodes:
+                return False
+            events = [event]
+
+        if any(node.children for node in nodes):
+            self._pending = nodes
+            self._pending_events = events
+            self._pending_widget = widget
+            self._timeout_id = self._after(self.chord_timeout, self._timeout)
+            return True
+
+        self._run(nodes, event, widget)
+        return True
+
+    def _timeout(self) -> None:
+        """The rest of the sequence did not come, run the bindings of the keys typed so far."""
+        self._timeout_id = None
+        nodes, events, widget = self._pending, self._pending_events, self._pending_widget
+        self._reset()
+        self._run_or_replay(nodes, events, widget)
+
+    def _run_or_replay(self, nodes: list[_Node], events: list[KeyEvent], widget: Widget | None) -> None:
+        """Run the bindings of the sequence typed so far, or replay its keys when it has none."""
+        if not events:
+            return
+        if any(node.handler is not None for node in nodes):
+            self._run(nodes, events[-1], widget)
+            return
+        for event in events:
+            self._replay(event.key)
+
+    def _run(self, nodes: list[_Node], event: KeyEvent, widget: Widget | None) -> None:
+        # the binding of the widget runs before the global one, which it can stop
+        if widget is not None:
+            event.widget = widget
+        for node in nodes:
+            if node.handler is None:
+                continue
+            node.handler(event)
+            if event.stop_propagation:
+                break
+
+    def _reset(self) -> None:
+        if self._timeout_id is not None:
+            self._after_cancel(self._timeout_id)
+            self._timeout_id = None
+        self._pending = []
+        self._pending_events = []
+        self._pending_widget = None
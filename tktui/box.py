@@ -1,11 +1,32 @@
-import curses
+from __future__ import annotations
+from typing import TYPE_CHECKING
+
 from tktui.base import BorderPos
 from tktui.ctx import get_app
+from tktui.geometry import Rect
+from tktui.text import text_width, truncate
+
+if TYPE_CHECKING:
+    from tktui.backends.base import Window
+    from tktui.tktui import TkTui
+
+def getbkgd(win: Window) -> int:
+    """The background of the window, the chtype of the character and attributes it is filled with."""
+    bkgd = win.getbkgd()
+    # curses gives an int, the (char, attr) pair its stubs also allow is never returned
+    assert isinstance(bkgd, int)
+    return bkgd
 
 class Box:
+    # every widget and frame has one, the app and the default colors are looked up unless set
+    __slots__ = (
+        "parent_win", "parent_box", "in_pad", "height", "width", "x", "y", "win", "background",
+        "_border", "border_title", "border_pos", "_app", "_focus_bkgd", "_default_bkgd",
+    )
+
     def __init__(
         self,
-        parent_window: curses.window,
+        parent_window: Window,
         x: int = 0,
         y: int = 0,
         width: int | None = None,
@@ -13,22 +34,29 @@ class Box:
         border: bool = False,
         border_title: str = "",
         border_pos: BorderPos = BorderPos.TOP_LEFT,
+        parent_box: Box | None = None,
         # padding: tuple[int, int] = (0, 0),
     ):
         self.parent_win = parent_window
+        # the box of the parent window, whose position the position of boxes in pads is kept from
+        self.parent_box = parent_box
+        # whether the box is drawn in a pad instead of on the screen
+        self.in_pad = parent_box is not None and parent_box.in_pad
         self.height = height or self.parent_win.getmaxyx()[0]
         self.width = width or self.parent_win.getmaxyx()[1]
 
         self.x = x
         self.y = y
 
-        self.app = get_app()
         self.win = self.parent_win.derwin(self.height, self.width, y, x)
 
-        self.focus_bkgd = self.app.colors["WHITE_BLUE"]
-        self.default_bkgd = self.app.colors["WHITE_GREEN"]
+        self._app: TkTui | None = None
+        self._focus_bkgd: int | None = None
+        self._default_bkgd: int | None = None
 
-        self.win.bkgd(" ", self.default_bkgd)
+        # attribute of the background the box is currently drawn with
+        self.background = self.default_bkgd
+        self.win.bkgd(" ", self.background)
 
         # for mouse presses
         self.win.keypad(True)
@@ -38,6 +66,121 @@ class Box:
         self.border = border
         self.update_border_title(border_title, border_pos=border_pos)
 
+    @property
+    def app(self) -> TkTui:
+        return get_app() if self._app is None else self._app
+
+    @app.setter
+    def app(self, app: TkTui) -> None:
+        self._app = app
+
+    @property
+    def focus_bkgd(self) -> int:
+        """The background drawn while in focus, the shared WHITE_BLUE unless set."""
+        if self._focus_bkgd is None:
+            return self.app.colors["WHITE_BLUE"]
+        return self._focus_bkgd
+
+    @focus_bkgd.setter
+    def focus_bkgd(self, attr: int) -> None:
+        self._focus_bkgd = attr
+
+    @property
+    def default_bkgd(self) -> int:
+        """The background drawn out of focus, the shared WHITE_GREEN unless set."""
+        if self._default_bkgd is None:
+            return self.app.colors["WHITE_GREEN"]
+        return self._default_bkgd
+
+    @default_bkgd.setter
+    def default_bkgd(self, attr: int) -> None:
+        self._default_bkgd = attr
+
+    @property
+    def rect(self) -> Rect:
+        """The absolute rectangle occupied by the box on the screen, or in the pad it is drawn in."""
+        if self.in_pad and self.parent_box is not None:
+            # curses can not move the sub windows of pads, getbegyx keeps the position they were
+            # created at
+            parent = self.parent_box.rect
+            return Rect(parent.y + self.y, parent.x + self.x, self.height, self.width)
+
+        y, x = self.win.getbegyx()
+        return Rect(y, x, self.height, self.width)
+
+    def move(self, x: int, y: int) -> None:
+        """Move the box to (x, y) relative to the parent window."""
+        # mvderwin only remaps the memory shared with the parent, mvwin updates the screen origin
+        self.win.mvderwin(y, x)
+        if not self.in_pad:
+            par_y, par_x = self.parent_win.getbegyx()
+            self.win.mvwin(par_y + y, par_x + x)
+        self.x, self.y = x, y
+
+    def resize(self, height: int, width: int) -> None:
+        """Resize the box in place and redraw its decorations."""
+        self.win.resize(height, width)
+        self.height, self.width = height, width
+        self.decorate()
+
+    def place(self, x: int, y: int, height: int, width: int) -> None:
+        """Move and resize the box relative to the parent window without redrawing it."""
+        # curses requires the window to fit in the parent at every step, so shrink before the move
+        # and grow after it
+        if (height, width) != (self.height, self.width):
+            self.win.resize(min(height, self.height), min(width, self.width))
+
+        if (x, y) != (self.x, self.y):
+            self.move(x, y)
+
+        self.win.resize(height, width)
+        self.height, self.width = height, width
+
+    def set_background(self, attr: int) -> None:
+        self.background = attr
+        self.win.bkgd(" ", attr)
+
+    def clear(self) -> None:
+        """Fill the box with the background of the parent window, e.g. before it moves away.
+
+        Sub windows share their cells with the parent so the content of the box would otherwise
+        stay behind on the parent.
+        """
+        self.win.bkgd(getbkgd(self.parent_win))
+        self.win.erase()
+
+    def clear_outside(self, height: int, width: int, bkgd: int | None = None) -> None:
+        """Fill the cells of the box past height and width with the background of the parent window.
+
+        What shrinking the box to that size uncovers, the cells it keeps are left as they are. With
+        bkgd, what growing the box from that size exposed is filled with it instead.
+        """
+        if bkgd is None:
+            bkgd = getbkgd(self.parent_win)
+        strips = (
+            # on the right of the cells kept, then below them
+            (0, width, min(height, self.height), self.width - width),
+            (height, 0, self.height - height, self.width),
+        )
+        for y, x, strip_height, strip_width in strips:
+            if strip_height > 0 and strip_width > 0:
+                strip = self.win.derwin(strip_height, strip_width, y, x)
+                strip.bkgd(bkgd)
+                strip.erase()
+
+    def repaint(self) -> None:
+        """Clear the box and draw its background, border and title again."""
+        self.win.bkgd(" ", self.background)
+        self.win.erase()
+        self.decorate()
+
+    def decorate(self) -> None:
+        """Draw the border and the title again."""
+        # without a border the edge cells belong to whatever children sit on them
+        if self.border:
+            self.add_border()
+        self.update_border_title(self.border_title)
+
     def remove_border(self) -> None:
         """Remove the border around the box"""
         self.win.border(1,1,1,1,1,1,1,1)
@@ -74,6 +217,9 @@ class Box:
         if not title:
             return
 
+        # in terminal cells, wide characters take two
+        title_width = text_width(title)
+
         if self.border_pos.value % 2 == 0:
             y = 0
         else:
@@ -83,10 +229,14 @@ class Box:
             case BorderPos.TOP_LEFT | BorderPos.BOTTOM_LEFT:
                 x = X_OFFSET
             case BorderPos.TOP_RIGHT | BorderPos.BOTTOM_RIGHT:
-                x = max(0, self.width - X_OFFSET - len(title))
+                x = max(0, self.width - X_OFFSET - title_width)
             case BorderPos.TOP_CENTER | BorderPos.BOTTOM_CENTER:
-                x = max(0, (self.width // 2)  - (len(title) // 2))
+                x = max(0, (self.width // 2)  - (title_width // 2))
+
+        if title_width >= self.width - x:
+            title = truncate(title, self.width - x)
 
-        if len(title) >= self.width - x:
-            title = title[:self.width - x]
+        # no room left for the title in a narrow box
+        if not title:
+            return
         self.win.addstr(y, x, title)
@@ -1,19 +1,203 @@
+from __future__ import annotations
+from collections import OrderedDict
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, Union
 import curses
+import weakref
+
+if TYPE_CHECKING:
+    from tktui.backends import Backend
+
+# an index in the colors of the terminal, -1 for its default color, or an RGB color as "#rrggbb"
+# or (r, g, b) shown with the closest color of the terminal
+Color = Union[int, str, tuple[int, int, int]]
+
+# attributes keep the pair number in 8 bits, like the curses COLOR_PAIR macro
+_MAX_PAIRS = 256
+# RGB colors are mapped to the colors of the terminal through a bounded cache, a gradient can ask
+# for any number of them
+RGB_CACHE_SIZE = 4096
+
+# the 16 ANSI colors of xterm, then its 6x6x6 color cube and its grays
+_ANSI = (
+    (0, 0, 0), (205, 0, 0), (0, 205, 0), (205, 205, 0),
+    (0, 0, 238), (205, 0, 205), (0, 205, 205), (229, 229, 229),
+    (127, 127, 127), (255, 0, 0), (0, 255, 0), (255, 255, 0),
+    (92, 92, 255), (255, 0, 255), (0, 255, 255), (255, 255, 255),
+)
+_CUBE = (0, 95, 135, 175, 215, 255)
+_PALETTE = (
+    _ANSI
+    + tuple((_CUBE[i // 36], _CUBE[i // 6 % 6], _CUBE[i % 6]) for i in range(216))
+    + tuple((8 + 10 * i,) * 3 for i in range(24))
+)
+
+def _rgb(color: str | tuple[int, int, int]) -> tuple[int, int, int]:
+    if isinstance(color, str):
+        if len(color) != 7 or color[0] != "#":
+            raise ValueError(f"Expected a color as '#rrggbb', got '{color}'")
+        return (int(color[1:3], 16), int(color[3:5], 16), int(color[5:7], 16))
+    return color
+
+@lru_cache(maxsize=RGB_CACHE_SIZE)
+def nearest_color(color: str | tuple[int, int, int], count: int) -> int:
+    """The index of the color closest to an RGB color in a palette of count colors like xterm's."""
+    r, g, b = _rgb(color)
+    palette = _PALETTE[:max(8, min(count, len(_PALETTE)))]
+    return min(
+        range(len(palette)),
+        key=lambda index: (palette[index][0] - r) ** 2 + (palette[index][1] - g) ** 2 + (palette[index][2] - b) ** 2,
+    )
 
 class Colors:
-    def __init__(self) -> None:
+    """The color pairs of the terminal, allocated for the (fg, bg) combinations as they are used.
+
+    Terminals only have so many color pairs. Named colors keep a pair for good, the other
+    combinations share the rest: a pair is allocated the first time a combination is asked for and
+    the least recently used one is taken back when none is left. Asking again for a combination is
+    a dict lookup of its cached attribute, under the colors as they were asked for, RGB or not.
+
+    The cells drawn with a pair taken back would show the colors it is given next, so the widgets
+    that asked for it are drawn again on the next render, asking for their colors again. A frame
+    can not show more combinations than there are pairs.
+    """
+    def __init__(self, backend: Backend) -> None:
+        self._backend = backend
         self._colors: dict[str, int] = {}
 
+        # pair 0 is the default colors of the terminal and can not be changed
+        self.pair_count = max(0, min(backend.pair_count(), _MAX_PAIRS) - 1)
+        self._color_count = backend.color_count()
+        self._free = list(range(self.pair_count, 0, -1))
+        # attribute of each (fg, bg) with a pair, the least recently used first
+        self._attrs: OrderedDict[tuple[int, int], int] = OrderedDict()
+        self._numbers: dict[tuple[int, int], int] = {}
+        # the combinations of the named colors, never taken back while a name has them
+        self._pinned: set[tuple[int, int]] = set()
+        self._names: dict[str, tuple[int, int]] = {}
+        # the terminal colors of the combinations asked for with RGB colors
+        self._resolve = lru_cache(maxsize=RGB_CACHE_SIZE)(self._key)
+
+        # attribute, pair key and users of the combinations as they were asked for, and the ones
+        # asked for of each pair key, dropped when its pair is taken back
+        self._lookup: dict[tuple[Color, Color], tuple[int, tuple[int, int], dict[int, weakref.ref[Any]]]] = {}
+        self._asked: dict[tuple[int, int], list[tuple[Color, Color]]] = {}
+        # the combinations asked for with RGB colors in the lookup, a gradient can ask for any number
+        # of them for the same pairs
+        self._rgb_asked = 0
+        # the widgets that drew with each pair, by id so that a widget asking again is a dict lookup
+        self._users: dict[tuple[int, int], dict[int, weakref.ref[Any]]] = {}
+        # the widgets that drew with a pair taken back since the last render, dict as an ordered set
+        self._stale: dict[Any, None] = {}
+
     def __getitem__(self, color: str) -> int:
-        if color in self._colors:
+        try:
             return self._colors[color]
+        except KeyError:
+            raise AttributeError(f"Color '{color}' not found.") from None
 
-        raise AttributeError(f"Color '{color}' not found.")
+    def define(self, name: str, fg: Color, bg: Color) -> int:
+        """Name the combination of fg on bg, which keeps its pair. Returns its attribute."""
+        key = self._key(fg, bg)
+        old = self._names.get(name)
+        self._names[name] = key
+        self._pinned.add(key)
+        if old is not None and old not in self._names.values():
+            # redefined, no name keeps the combination it had and its pair can be taken back
+            self._pinned.discard(old)
+        attr = self._colors[name] = self.pair(*key)
+        return attr
 
-    def _generate_defaults(self) -> None:
-        curses.init_pair(1, curses.COLOR_WHITE, curses.COLOR_BLUE)
-        self._colors["WHITE_BLUE"] = curses.color_pair(1)
+    def pair(self, fg: Color, bg: Color, user: Any = None) -> int:
+        """The attribute to draw fg on bg with, allocating a pair for them if they have none.
+
+        Args:
+            user: The widget drawing with it, drawn again if the pair is taken back for other
+                colors. It has to ask for its colors again when drawn.
+        """
+        try:
+            attr, key, users = self._lookup[(fg, bg)]
+        except KeyError:
+            attr, key, users = self._entry(fg, bg)
+        self._attrs.move_to_end(key)
 
-        curses.init_pair(2, curses.COLOR_WHITE, curses.COLOR_GREEN)
-        self._colors["WHITE_GREEN"] = curses.color_pair(2)
+        if user is not None and id(user) not in users:
+            self._track(users, user)
+        return attr
 
+    def take_stale(self) -> list[Any]:
+        """The widgets that drew with a pair taken back since the last time, to draw again."""
+        stale = list(self._stale)
+        self._stale.clear()
+        return stale
+
+    def _entry(self, fg: Color, bg: Color) -> tuple[int, tuple[int, int], dict[int, weakref.ref[Any]]]:
+        """Look the combination up the slow way, allocating its pair, and cache it as asked for."""
+        if type(fg) is int and type(bg) is int:
+            key = (fg, bg)
+        else:
+            key = self._resolve(fg, bg)
+        attr = self._attrs.get(key)
+        if attr is None:
+            attr = self._allocate(key)
+
+        entry = (attr, key, self._users[key])
+        if key != (fg, bg):
+            if self._rgb_asked >= RGB_CACHE_SIZE:
+                return entry
+            self._rgb_asked += 1
+        self._lookup[(fg, bg)] = entry
+        self._asked[key].append((fg, bg))
+        return entry
+
+    @staticmethod
+    def _track(users: dict[int, weakref.ref[Any]], user: Any) -> None:
+        user_id = id(user)
+
+        def forget(ref: weakref.ref[Any]) -> None:
+            if users.get(user_id) is ref:
+                del users[user_id]
+
+        users[user_id] = weakref.ref(user, forget)
+
+    def _key(self, fg: Color, bg: Color) -> tuple[int, int]:
+        return (self._index(fg), self._index(bg))
+
+    def _index(self, color: Color) -> int:
+        if type(color) is int:
+            return color
+        return nearest_color(color, self._color_count)
+
+    def _allocate(self, key: tuple[int, int]) -> int:
+        if self._free:
+            number = self._free.pop()
+        else:
+            for old in self._attrs:
+                if old not in self._pinned:
+                    break
+            else:
+                raise curses.error(f"All the {self.pair_count} color pairs are taken by named colors")
+            number = self._evict(old)
+
+        self._backend.init_pair(number, *key)
+        self._numbers[key] = number
+        self._users[key] = {}
+        self._asked[key] = []
+        attr = self._attrs[key] = self._backend.color_pair(number)
+        return attr
+
+    def _evict(self, key: tuple[int, int]) -> int:
+        """Take the pair of the combination back, its users are drawn again."""
+        del self._attrs[key]
+        for asked in self._asked.pop(key):
+            del self._lookup[asked]
+            self._rgb_asked -= asked != key
+        for ref in self._users.pop(key).values():
+            user = ref()
+            if user is not None:
+                self._stale[user] = None
+        return self._numbers.pop(key)
+
+    def _generate_defaults(self) -> None:
+        self.define("WHITE_BLUE", curses.COLOR_WHITE, curses.COLOR_BLUE)
+        self.define("WHITE_GREEN", curses.COLOR_WHITE, curses.COLOR_GREEN)
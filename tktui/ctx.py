@@ -5,7 +5,7 @@ if TYPE_CHECKING:
     from .tktui import TkTui
 
 # Global context for the running app
-app: "TkTui | None" = None
+_app: "TkTui | None" = None
 
 def get_app() -> "TkTui":
     if _app is None:
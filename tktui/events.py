@@ -1,36 +1,65 @@
 from __future__ import annotations
 from typing import Protocol, Any, TypeVar, TYPE_CHECKING
+from enum import Enum
 
 if TYPE_CHECKING:
+    from tktui.frame import Frame
     from tktui.widget import Widget
 
+class Phase(str, Enum):
+    """Enum for the phase of the propagation an event is in."""
+    # from the root down to the parent of the target
+    CAPTURE = "capture"
+    TARGET = "target"
+    # from the parent of the target up to the root
+    BUBBLE = "bubble"
+
 class Event:
+    # events are made for every key and mouse report, the handlers do not add attributes to them
+    __slots__ = ("x", "y", "stop_propagation", "phase", "target", "_widget")
+
     def __init__(self, x: int, y: int) -> None:
         self.x = x
         self.y = y
         self.stop_propagation = False
+        self.phase = Phase.TARGET
+        # the widget or frame the event happened on, widget is the one handling it
+        self.target: Widget | Frame | None = None
 
     @property
-    def widget(self) -> Widget:
+    def widget(self) -> Widget | Frame:
+        """The widget or frame whose handler is called with the event."""
         return self._widget
 
     @widget.setter
-    def widget(self, widget: Widget) -> None:
+    def widget(self, widget: Widget | Frame) -> None:
         self._widget = widget
 
     def stop(self):
         self.stop_propagation = True
 
 class MouseEvent(Event):
+    __slots__ = ("bstate",)
+
     def __init__(self, x: int, y: int, bstate: int) -> None:
         super().__init__(x, y)
         self.bstate = bstate
 
 class KeyEvent(Event):
+    __slots__ = ("key",)
+
     def __init__(self, x: int, y: int, key: int) -> None:
         super().__init__(x, y)
         self.key = key
 
+class PasteEvent(Event):
+    """Text pasted in the terminal, delivered at once instead of a key at a time."""
+    __slots__ = ("text",)
+
+    def __init__(self, x: int, y: int, text: str) -> None:
+        super().__init__(x, y)
+        self.text = text
+
 E = TypeVar("E", bound=Event, contravariant=True)
 class EventHandlerType(Protocol[E]):
     def __call__(self, event: E, *args: Any, **kwargs: Any) -> None: ...
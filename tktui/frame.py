@@ -1,18 +1,37 @@
 from __future__ import annotations
 from typing import TYPE_CHECKING
 
-import curses
 from tktui.ctx import get_app
 from tktui.base import BorderPos
 from tktui.box import Box
-from tktui.geometry import pack_manager, GeometryManager, Side, Fill, Anchor, PackException, GridException, PackInfo
+import curses
+
+from tktui.geometry import (
+    GeometryManager, Side, Fill, Anchor, Sticky, PackException, GridException, PackInfo, GridInfo, GridAxis, Rect
+)
 
 if TYPE_CHECKING:
+    from tktui.scroll_frame import ScrollFrame
     from tktui.tktui import TkTui
     from tktui.widget import Widget
 
+def _fit_span(start: int, size: int, space: int) -> tuple[int, int]:
+    """The start and size of a span cut to fit in space, pulled in when it starts past it."""
+    if start >= space:
+        start = max(0, space - size)
+    return start, max(1, min(size, space - start))
+
 class Frame:
     """Defines what it is to occupy space on a screen."""
+    __slots__ = (
+        "children", "_stack_pos", "_stack_cache", "parent", "parent_win", "z_index", "app",
+        "propagates_mouse_event", "propagates_key_event", "_scroll_frame", "box", "content",
+        "_hit_index", "req_height", "req_width", "geometry_manager", "_pack_info",
+        "_pack_master", "_pack_slaves", "_pack_rects", "_grid_info", "_grid_master",
+        "_grid_slaves", "_grid_rows", "_grid_columns", "_grid_rects", "_grid_stale",
+        "_grid_unplaced", "_grid_placed", "_layout_req", "__weakref__",
+    )
+
     def __init__(
         self,
         parent: Frame | TkTui,
@@ -23,40 +42,251 @@ class Frame:
         **kwargs
     ) -> None:
 
+        # all the frames and widgets created in the frame, from the bottom of the stacking order
+        # to the top
         self.children: list[Widget | Frame] = []
+        # position in the stacking order of the children of the parent
+        self._stack_pos = 0
+        self._stack_cache: tuple[int, tuple[int, ...]] | None = None
 
         if isinstance(parent, Frame):
             self.parent = parent
-            self.parent_win = parent.box.win
-            self.z_index = parent.z_index + 1
+            self.parent_win = parent.content.win
+        elif "tktui_stdscr" in kwargs:
+            # the _root frame for the app. Checked first as a re-initialized app still has
+            # the _root of its previous screen
+            self.parent_win = kwargs["tktui_stdscr"]
+            self.parent = None
         else:
+            self.parent = parent._root
+            self.parent_win = parent._root.content.win
+
+        if self.parent is None:
             self.z_index = 1
-            if hasattr(parent, "_root"):
-                # the _root frame for the app has been created yet
-                self.parent = parent._root
-                self.parent_win = parent._root.box.win
-            else:
-                assert "tktui_stdscr" in kwargs
-                win = kwargs["tktui_stdscr"]
-                assert isinstance(win, curses.window)
-                self.parent_win = win
-                self.parent = None
+        else:
+            self.z_index = self.parent.z_index + 1
+            self.parent._add_child(self)
 
-        assert isinstance(self.parent_win, curses.window)
         self.app = get_app()
+        # events propagate from the widget they happened on up through the frames it is in
+        self.propagates_mouse_event = True
+        self.propagates_key_event = True
+
+        # the scroll frame whose pad the frame is drawn in, None when it is drawn on the screen
+        self._scroll_frame = None if self.parent is None else self.parent._child_scroll_frame()
+
         self.box = Box(
             self.parent_win,
             border=border,
             border_title=border_title,
-            border_pos=border_pos
+            border_pos=border_pos,
+            parent_box=None if self.parent is None else self.parent.content,
+        )
+        # the box the children are drawn in, the frame itself but for scroll frames
+        self.content = self.box
+
+        # frames are hit testable so that events on them reach the innermost one
+        self._hit_index = (
+            self.app._hit_index if self._scroll_frame is None else self._scroll_frame._content_index
         )
+        self._hit_index.insert(self, self.box.rect)
+
+        # size asked for when the frame is placed by the geometry manager of its parent
+        self.req_height = self.box.height
+        self.req_width = self.box.width
 
         self.geometry_manager: GeometryManager | None = None
-        self.__pack_info: PackInfo | None = None
+        self._pack_info: PackInfo | None = None
+        self._pack_master: Frame | None = None
+
+        # children packed in the frame in packing order and their last computed rectangles
+        self._pack_slaves: list[Widget | Frame] = []
+        self._pack_rects: dict[Widget | Frame, Rect] = {}
+
+        self._grid_info: GridInfo | None = None
+        self._grid_master: Frame | None = None
+
+        # children gridded in the frame, the rows and columns they are in and their last rectangles
+        self._grid_slaves: dict[Widget | Frame, None] = {}
+        self._grid_rows = GridAxis()
+        self._grid_columns = GridAxis()
+        self._grid_rects: dict[Widget | Frame, Rect] = {}
+        # gridded children whose options or requested size changed since the last layout, and the
+        # ones measured again since that still need to be placed
+        self._grid_stale: dict[Widget | Frame, None] = {}
+        self._grid_unplaced: dict[Widget | Frame, None] = {}
+        # frame size and row and column layouts the children were last placed with
+        self._grid_placed: tuple | None = None
+
+        # size needed by the packed or gridded children, maintained by TkTui.update_layout
+        self._layout_req: tuple[int, int] | None = None
 
+    @property
+    def req_size(self) -> tuple[int, int]:
+        """The (height, width) asked for, the size of the laid out children if there are any."""
+        if (self._pack_slaves or self._grid_slaves) and self._layout_req is not None:
+            return self._layout_req
+        return (self.req_height, self.req_width)
+
+    def pack_slaves(self) -> list[Widget | Frame]:
+        return list(self._pack_slaves)
+
+    def grid_slaves(self) -> list[Widget | Frame]:
+        return list(self._grid_slaves)
+
+    def _child_scroll_frame(self) -> ScrollFrame | None:
+        """The scroll frame whose pad the children of the frame are drawn in."""
+        return self._scroll_frame
+
+    def _fit_content(self) -> None:
+        """Size the content box before the children are arranged in it, the frame box itself."""
 
     def draw(self) -> None:
-        self.box.win.refresh()
+        """Mark the frame to be redrawn on the next render."""
+        self.app.mark_dirty(self)
+
+    def redraw(self) -> None:
+        """Repaint the frame and everything in it, the children share the cells of the frame."""
+        self.box.repaint()
+        for child in self.children:
+            child.redraw()
+        self.draw()
+
+    def _sync_children(self) -> None:
+        """Move the windows of the descendants along after the frame moved on the screen."""
+        for child in self.children:
+            try:
+                child.box.move(child.box.x, child.box.y)
+            except curses.error:
+                # does not fit anymore, the geometry manager of the frame places it again
+                continue
+
+            child._hit_index.update(child, child.box.rect)
+            if isinstance(child, Frame):
+                child._sync_children()
+
+    def _place(self, rect: Rect) -> None:
+        """Move and resize the frame relative to its parent. Used by the geometry managers."""
+        moved = (rect.x, rect.y) != (self.box.x, self.box.y)
+        self.box.place(rect.x, rect.y, rect.height, rect.width)
+        self._hit_index.update(self, self.box.rect)
+        if moved:
+            self._sync_children()
+        self.redraw()
+
+    def _fit(self, rect: Rect) -> None:
+        """Move and resize the frame relative to its parent and fit its children, without redrawing.
+
+        The children are fitted before a shrink and after a growth, curses windows have to fit in
+        their parent at every step.
+        """
+        old_height, old_width = self.box.height, self.box.width
+        kept_height, kept_width = min(rect.height, old_height), min(rect.width, old_width)
+        self._fit_children(old_height, old_width, kept_height, kept_width)
+
+        moved = (rect.x, rect.y) != (self.box.x, self.box.y)
+        self.box.place(rect.x, rect.y, rect.height, rect.width)
+        self._hit_index.update(self, self.box.rect)
+        if moved:
+            self._sync_children()
+
+        self._fit_children(kept_height, kept_width, rect.height, rect.width)
+        if self._pack_slaves or self._grid_slaves:
+            self.app._schedule_layout(self)
+
+    def _fit_children(
+        self, old_height: int, old_width: int, height: int, width: int
+    ) -> dict[Widget | Frame, Rect]:
+        """Fit the children in the content resized from old_height and old_width, without redrawing.
+
+        Like curses does with the windows when the terminal is resized, the frames placed at
+        positions that reach the far edges of the content follow them, and the children past the
+        edges are cut or pulled in to fit. Widgets grow back to the size they asked for once there
+        is room again. The children arranged by a geometry manager are only cut to fit, the
+        manager places them again.
+
+        Returns:
+            The children moved or resized, with the place they were cleared from.
+        """
+        if (old_height, old_width) == (height, width):
+            return {}
+
+        inset = 1 if self.content.border else 0
+        fitted: dict[Widget | Frame, Rect] = {}
+        for child in self.children:
+            box = child.box
+            if child._pack_master is not None or child._grid_master is not None:
+                want_height, want_width = box.height, box.width
+            elif isinstance(child, Frame):
+                # reaching the edge or the border, it keeps its distance to the edge
+                if box.y + box.height >= old_height - inset:
+                    child.req_height = max(1, box.height + height - old_height)
+                if box.x + box.width >= old_width - inset:
+                    child.req_width = max(1, box.width + width - old_width)
+                want_height, want_width = child.req_height, child.req_width
+            else:
+                want_height, want_width = child.req_height, child.req_width
+
+            y, fit_height = _fit_span(box.y, want_height, height)
+            x, fit_width = _fit_span(box.x, want_width, width)
+            if (y, x, fit_height, fit_width) == (box.y, box.x, box.height, box.width):
+                # curses also resizes the windows at the edges of the screen itself
+                if box.win.getmaxyx() != (box.height, box.width):
+                    box.win.resize(box.height, box.width)
+                continue
+
+            fitted[child] = Rect(box.y, box.x, box.height, box.width)
+            box.clear()
+            child._fit(Rect(y, x, fit_height, fit_width))
+        return fitted
+
+    def _add_child(self, child: Widget | Frame) -> None:
+        """Add a new child on top of the stacking order."""
+        child._stack_pos = len(self.children)
+        self.children.append(child)
+
+    def _restack(self, child: Widget | Frame, sibling: Widget | Frame | None, above: bool) -> None:
+        """Move the child right above or below the sibling in the stacking order.
+
+        Without a sibling the child goes to the top or the bottom. Only the positions of the
+        children between the old and new place of the child change.
+        """
+        children = self.children
+        if sibling is not None and (sibling.parent is not self or sibling is child):
+            raise ValueError(f"Can not restack {child} relative to {sibling}, they are not siblings.")
+
+        old = child._stack_pos
+        children.pop(old)
+        if sibling is None:
+            new = len(children) if above else 0
+        else:
+            new = children.index(sibling) + (1 if above else 0)
+        children.insert(new, child)
+
+        for pos in range(min(old, new), max(old, new) + 1):
+            children[pos]._stack_pos = pos
+        self.app._stack_version += 1
+
+        # children share the cells of the frame, what is on top is whatever was drawn last
+        child.redraw()
+        rect = child.box.rect
+        for other in children[new + 1:]:
+            if other.box.rect.overlaps(rect):
+                other.redraw()
+
+    def lift(self, above: Widget | Frame | None = None) -> None:
+        """Raise the frame above a sibling in the stacking order, to the top without one."""
+        if self.parent is None:
+            return
+        self.parent._restack(self, above, above=True)
+
+    tkraise = lift
+
+    def lower(self, below: Widget | Frame | None = None) -> None:
+        """Lower the frame below a sibling in the stacking order, to the bottom without one."""
+        if self.parent is None:
+            return
+        self.parent._restack(self, below, above=False)
 
     def pack(
         self,
@@ -81,7 +311,7 @@ class Frame:
         else:
             parent = self.parent
 
-        self.__pack_info = PackInfo(
+        self._pack_info = PackInfo(
             side=side,
             expand=expand,
             fill=fill,
@@ -104,47 +334,169 @@ class Frame:
         after: Widget | Frame | None = None,
         before: Widget | Frame | None = None,
     ) -> None:
-        assert isinstance(target, Widget)
+        """Add the target to the packing order of the frame.
+
+        The layout is not computed here but by the next TkTui.update_layout, so packing many
+        children in a row costs a single layout.
+        """
         if self.geometry_manager == GeometryManager.GRID:
             raise PackException("Already using grid geometry manager")
 
         if not self.geometry_manager:
             self.geometry_manager = GeometryManager.PACK
 
+        if target._grid_master is not None:
+            target._grid_master._grid_forget(target)
+
+        master = target._pack_master
+        if master is not None and (master is not self or after or before):
+            master._pack_forget(target)
+        elif master is self:
+            # packed again with new options, it keeps its place in the packing order
+            self.app._schedule_layout(self)
+            return
+
+        slaves = self._pack_slaves
         if after or before:
-            if len(self.children) == 0:
+            if len(slaves) == 0:
                 raise PackException()
 
-            l = 0
-            if after:
-                for idx, frame_or_widget in enumerate(self.children):
-                    l+=1
-                    if frame_or_widget == after:
-                        self.children.insert(l, target)
-                        l+=1
-                        break
+            try:
+                if after:
+                    idx = slaves.index(after) + 1
                 else:
-                    raise PackException(f"Could not pack after {after}. {after} was not a found in {self}.")
-
+                    assert before is not None
+                    idx = slaves.index(before)
+            except ValueError:
+                raise PackException(
+                    f"Could not pack {"after " + str(after) + " " if after else ""}"
+                    f"{"before " + str(before) + " " if before else ""}in {self}. "
+                    "They are not packed in it."
+                )
 
-            if before:
-                if l >= len(self.children):
+            if after and before:
+                if before not in slaves or slaves.index(before) < idx:
                     raise PackException(
                         f"Could not pack after {after} and before {before}. Ordering is impossible."
                     )
 
-                for idx, frame_or_widget in enumerate(self.children[l:]):
-                    if frame_or_widget == before:
-                        self.children.insert(idx + l, target)
-                        break
-                else:
-                    raise PackException(
-                        f"Could not pack {"after" + str(after) + " " if after else ""}"
-                        "and before {before}. Either ordering is impossible or {after} and/or {before} "
-                        "are not found in {self}."
-                    )
+            slaves.insert(idx, target)
+        else:
+            slaves.append(target)
+
+        target._pack_master = self
+        self.app._schedule_layout(self)
+
+    def _pack_forget(self, target: Widget | Frame) -> None:
+        self._pack_slaves.remove(target)
+        self._pack_rects.pop(target, None)
+        target._pack_master = None
+        self.app._schedule_layout(self)
 
-        pack_manager(self)
+    def grid(
+        self,
+        column: int = 0,
+        row: int = 0,
+        rowspan: int = 1,
+        columnspan: int = 1,
+        sticky: Sticky | str = "",
+        ipadx: int = 0,
+        ipady: int = 0,
+        padx: int = 0,
+        pady: int = 0,
+        in_: Frame | None = None,
+    ) -> None:
 
+        if self.parent is None:
+            raise GridException("Can not grid the root frame")
 
+        if in_:
+            parent = in_
+        else:
+            parent = self.parent
+
+        self._grid_info = GridInfo(
+            row=row,
+            column=column,
+            rowspan=rowspan,
+            columnspan=columnspan,
+            sticky=sticky,
+            ipadx=ipadx,
+            ipady=ipady,
+            padx=padx,
+            pady=pady,
+        )
+
+        parent.grid_child(self)
+
+    def grid_child(self, target: Widget | Frame) -> None:
+        """Add the target to the grid of the frame in the cells of its grid info.
+
+        Like packing, the layout is computed by the next TkTui.update_layout.
+        """
+        if self.geometry_manager == GeometryManager.PACK:
+            raise GridException("Already using pack geometry manager")
+
+        info = target._grid_info
+        # set by grid before the target is handed to its master
+        assert info is not None
+        if info.row < 0 or info.column < 0 or info.rowspan < 1 or info.columnspan < 1:
+            raise GridException(
+                f"Could not grid {target} at row {info.row} and column {info.column} spanning "
+                f"{info.rowspan} rows and {info.columnspan} columns."
+            )
+
+        if set(info.sticky) - set("nsew"):
+            raise GridException(f"Bad sticky {info.sticky!r}, it must be made of n, s, e and w.")
+
+        if not self.geometry_manager:
+            self.geometry_manager = GeometryManager.GRID
+
+        if target._pack_master is not None:
+            target._pack_master._pack_forget(target)
+
+        master = target._grid_master
+        if master is not None and master is not self:
+            master._grid_forget(target)
+
+        self._grid_slaves[target] = None
+        target._grid_master = self
+        self._slave_changed(target)
+
+    def _grid_forget(self, target: Widget | Frame) -> None:
+        del self._grid_slaves[target]
+        self._grid_stale.pop(target, None)
+        self._grid_unplaced.pop(target, None)
+        self._grid_rows.remove(target)
+        self._grid_columns.remove(target)
+        self._grid_rects.pop(target, None)
+        target._grid_master = None
+        self.app._schedule_layout(self)
+
+    def columnconfigure(
+        self,
+        index: int,
+        weight: int | None = None,
+        minsize: int | None = None,
+        pad: int | None = None,
+    ) -> None:
+        """Set how the column at index is sized. Extra space is shared by the columns by weight."""
+        self._grid_columns.configure(index, weight, minsize, pad)
+        self.app._schedule_layout(self)
+
+    def rowconfigure(
+        self,
+        index: int,
+        weight: int | None = None,
+        minsize: int | None = None,
+        pad: int | None = None,
+    ) -> None:
+        """Set how the row at index is sized. Extra space is shared by the rows by weight."""
+        self._grid_rows.configure(index, weight, minsize, pad)
+        self.app._schedule_layout(self)
 
+    def _slave_changed(self, slave: Widget | Frame) -> None:
+        """Lay the frame out again after the options or the requested size of a slave changed."""
+        if slave in self._grid_slaves:
+            self._grid_stale[slave] = None
+        self.app._schedule_layout(self)
@@ -1,4 +1,5 @@
-from typing import TYPE_CHECKING
+from __future__ import annotations
+from typing import TYPE_CHECKING, Iterable, NamedTuple
 from enum import Enum
 from dataclasses import dataclass
 
@@ -6,13 +7,13 @@ if TYPE_CHECKING:
     from tktui.frame import Frame
     from tktui.widget import Widget
 
-class GeometryManager(Enum, str):
+class GeometryManager(str, Enum):
     """Enum for the geometry manager being used by a Frame."""
     PACK = "pack"
     GRID = "grid"
     POSITION = "position"
 
-class Anchor(Enum, str):
+class Anchor(str, Enum):
     """Enum for the Anchor attribute."""
     N = "n"
     S = "s"
@@ -24,24 +25,40 @@ class Anchor(Enum, str):
     SE = "se"
     CENTER = "center"
 
-class Fill(Enum, str):
+class Fill(str, Enum):
     """Enum for the Fill attribute."""
     X = "x"
     Y = "y"
     BOTH = "both"
     NONE = "none"
 
-class Side(Enum, str):
+class Side(str, Enum):
     """Enum for the Side attribute."""
     LEFT = "left"
     RIGHT = "right"
     TOP = "top"
     BOTTOM = "bottom"
 
+class Rect(NamedTuple):
+    """Absolute rectangle occupied on the screen in (y, x, height, width) order like curses."""
+    y: int
+    x: int
+    height: int
+    width: int
+
+    def contains(self, y: int, x: int) -> bool:
+        return self.y <= y < self.y + self.height and self.x <= x < self.x + self.width
+
+    def overlaps(self, other: Rect) -> bool:
+        return (
+            self.y < other.y + other.height and other.y < self.y + self.height
+            and self.x < other.x + other.width and other.x < self.x + self.width
+        )
+
 class PackException(Exception):
     pass
 
-@dataclass
+@dataclass(slots=True)
 class PackInfo:
     side: Side | str = Side.TOP
     expand: bool = False
@@ -53,13 +70,206 @@ class PackInfo:
     anchor: Anchor | str = Anchor.NW
 
 
-def pack_manager(parent: Frame) -> None:
-    """Packs frames and widgets in a parent frame."""
-    ...
+def _pack_parcels(parent: Frame) -> list[tuple[Widget | Frame, PackInfo, Side, int, int]]:
+    """The packed children with their info, side and the (height, width) of the parcel they ask for."""
+    parcels = []
+    for child in parent._pack_slaves:
+        info = child._pack_info
+        # the slaves of a frame are the children packed in it, which have their pack info
+        assert info is not None
+        req_height, req_width = child.req_size
+        parcels.append((
+            child,
+            info,
+            Side(info.side),
+            req_height + 2 * (info.ipady + info.pady),
+            req_width + 2 * (info.ipadx + info.padx),
+        ))
+    return parcels
+
+def pack_request(parent: Frame) -> tuple[int, int]:
+    """The (height, width) the parent needs to fit its packed children, like Tk's propagation."""
+    width = max_width = height = max_height = 0
+    for _, _, side, parcel_height, parcel_width in _pack_parcels(parent):
+        if side in (Side.TOP, Side.BOTTOM):
+            max_width = max(max_width, parcel_width + width)
+            height += parcel_height
+        else:
+            max_height = max(max_height, parcel_height + height)
+            width += parcel_width
+
+    inset = 2 if parent.content.border else 0
+    return (max(height, max_height) + inset, max(width, max_width) + inset)
+
+def _expansion(
+    parcels: list[tuple[Widget | Frame, PackInfo, Side, int, int]],
+    start: int,
+    cavity: int,
+    vertical: bool,
+) -> int:
+    """Extra space the expanding child at start gets along its side, like Tk's X/YExpansion.
+
+    The space left in the cavity is shared by the expanding children packed along the same axis,
+    but no more than what keeps the children packed across the axis at their requested size.
+    """
+    min_expand = cavity
+    num_expand = 0
+    for _, info, side, parcel_height, parcel_width in parcels[start:]:
+        size = parcel_height if vertical else parcel_width
+        if (side in (Side.TOP, Side.BOTTOM)) != vertical:
+            if num_expand:
+                min_expand = min(min_expand, (cavity - size) // num_expand)
+        else:
+            cavity -= size
+            if info.expand:
+                num_expand += 1
+
+    if num_expand:
+        min_expand = min(min_expand, cavity // num_expand)
+    return max(0, min_expand)
+
+def _anchor_offset(anchor: Anchor, free_y: int, free_x: int) -> tuple[int, int]:
+    """The (y, x) offset of a child anchored in a parcel with free cells left around it."""
+    if anchor == Anchor.CENTER:
+        return (free_y // 2, free_x // 2)
+
+    value = anchor.value
+    y = 0 if "n" in value else free_y if "s" in value else free_y // 2
+    x = 0 if "w" in value else free_x if "e" in value else free_x // 2
+    return (y, x)
+
+def pack_arrange(parent: Frame) -> dict[Widget | Frame, Rect]:
+    """The rectangles of the packed children relative to the parent, like Tk's ArrangePacking.
+
+    Each child in packing order takes a parcel along its side of the cavity left by the children
+    before it, and is sized and anchored in the parcel according to its fill and anchor.
+    """
+    inset = 1 if parent.content.border else 0
+    cavity_y = cavity_x = inset
+    cavity_height = parent.content.height - 2 * inset
+    cavity_width = parent.content.width - 2 * inset
+
+    parcels = _pack_parcels(parent)
+    rects: dict[Widget | Frame, Rect] = {}
+    for index, (child, info, side, parcel_height, parcel_width) in enumerate(parcels):
+        if side in (Side.TOP, Side.BOTTOM):
+            frame_width = cavity_width
+            frame_height = parcel_height
+            if info.expand:
+                frame_height += _expansion(parcels, index, cavity_height, vertical=True)
+
+            cavity_height -= frame_height
+            if cavity_height < 0:
+                frame_height += cavity_height
+                cavity_height = 0
+
+            frame_x = cavity_x
+            if side == Side.TOP:
+                frame_y = cavity_y
+                cavity_y += frame_height
+            else:
+                frame_y = cavity_y + cavity_height
+        else:
+            frame_height = cavity_height
+            frame_width = parcel_width
+            if info.expand:
+                frame_width += _expansion(parcels, index, cavity_width, vertical=False)
+
+            cavity_width -= frame_width
+            if cavity_width < 0:
+                frame_width += cavity_width
+                cavity_width = 0
+
+            frame_y = cavity_y
+            if side == Side.LEFT:
+                frame_x = cavity_x
+                cavity_x += frame_width
+            else:
+                frame_x = cavity_x + cavity_width
+
+        # the child in its parcel, without the external padding
+        space_height = frame_height - 2 * info.pady
+        space_width = frame_width - 2 * info.padx
+        req_height, req_width = child.req_size
+        fill = Fill(info.fill)
+
+        height = req_height + 2 * info.ipady
+        if fill in (Fill.Y, Fill.BOTH) or height > space_height:
+            height = space_height
+
+        width = req_width + 2 * info.ipadx
+        if fill in (Fill.X, Fill.BOTH) or width > space_width:
+            width = space_width
+
+        # there is no unmapping of windows, children squeezed out of the cavity keep one cell
+        height, width = max(1, height), max(1, width)
+        off_y, off_x = _anchor_offset(Anchor(info.anchor), space_height - height, space_width - width)
+        y = min(frame_y + info.pady + off_y, parent.content.height - height)
+        x = min(frame_x + info.padx + off_x, parent.content.width - width)
+        rects[child] = Rect(max(0, y), max(0, x), height, width)
 
+    return rects
 
+def _place_slaves(parent: Frame, rects: dict[Widget | Frame, Rect], cache: dict[Widget | Frame, Rect]) -> list[Frame]:
+    """Move the slaves whose rectangle is not the one cached for them by the last layout.
 
-class Sticky(Enum, str):
+    Returns:
+        The slave frames whose size changed, their own slaves need to be laid out again.
+    """
+    from tktui.frame import Frame
+
+    changed = [(child, rect) for child, rect in rects.items() if cache.get(child) != rect]
+    if not changed:
+        return []
+
+    # clear all the old places first so a child moving into the old place of another is not wiped
+    old_places = []
+    for child, _ in changed:
+        child.box.clear()
+        old_places.append(Rect(child.box.y, child.box.x, child.box.height, child.box.width))
+
+    resized: list[Frame] = []
+    for child, rect in changed:
+        size = (child.box.height, child.box.width)
+        child._place(rect)
+        cache[child] = rect
+
+        if isinstance(child, Frame) and size != (rect.height, rect.width):
+            resized.append(child)
+
+    # only the lines of the parent under the cleared places are copied to the screen again, the
+    # children draw their new places themselves
+    content = parent.content
+    for place in old_places:
+        content.win.touchline(place.y, place.height)
+    # the cleared places can cover the border and title of the parent
+    if any(
+        place.y == 0 or place.x == 0
+        or place.y + place.height >= content.height or place.x + place.width >= content.width
+        for place in old_places
+    ):
+        content.decorate()
+    parent.draw()
+    return resized
+
+def pack_manager(parent: Frame) -> list[Frame]:
+    """Packs frames and widgets in a parent frame.
+
+    The rectangles are cached per child so only the children whose rectangle changed since the
+    last time are moved and redrawn.
+
+    Returns:
+        The packed child frames whose size changed, their own children need to be packed again.
+    """
+    rects = pack_arrange(parent)
+    cache = parent._pack_rects
+    for child in [child for child in cache if child not in rects]:
+        del cache[child]
+
+    return _place_slaves(parent, rects, cache)
+
+
+class Sticky(str, Enum):
     """Enum for the Sticky attribute."""
     N = "n"
     S = "s"
@@ -71,20 +281,297 @@ class Sticky(Enum, str):
     SE = "se"
     NS = "ns"
     EW = "ew"
+    NSEW = "nsew"
 
 class GridException(Exception):
     pass
 
-def grid_manager(
-        parent: Frame,
-        column: int,
-        row: int,
-        rowspan: int,
-        columnspan: int,
-        sticky: str,
-        ipadx: int = 0,
-        ipady: int = 0,
-        padx: int = 0,
-        pady: int = 0,
-    ) -> None:
-        ...
+@dataclass(slots=True)
+class GridInfo:
+    row: int = 0
+    column: int = 0
+    rowspan: int = 1
+    columnspan: int = 1
+    sticky: Sticky | str = ""
+    ipadx: int = 0
+    ipady: int = 0
+    padx: int = 0
+    pady: int = 0
+
+@dataclass
+class TrackConfig:
+    """Options of a row or column set by rowconfigure and columnconfigure."""
+    weight: int = 0
+    minsize: int = 0
+    pad: int = 0
+
+def _distribute(sizes: list[int], weights: list[int], extra: int) -> list[int]:
+    """Share extra space, or take it away when negative, between the tracks by their weight."""
+    total = sum(weights)
+    if not total or not extra:
+        return sizes
+
+    sizes = list(sizes)
+    given = cumulative = 0
+    for index, weight in enumerate(weights):
+        if not weight:
+            continue
+        # shares from the running total so the rounding never loses a cell
+        cumulative += weight
+        share = extra * cumulative // total - given
+        given += share
+        sizes[index] = max(0, sizes[index] + share)
+    return sizes
+
+class GridAxis:
+    """The rows or the columns of a grid with the minimum size of each track cached.
+
+    The sizes the slaves ask for are kept per track, so a changed slave only updates the tracks it
+    is in and the minimum of a track is only computed again when its largest slave shrank or left.
+    Slaves spanning several tracks are kept apart and spread over their tracks after that.
+    """
+    def __init__(self) -> None:
+        self.configs: dict[int, TrackConfig] = {}
+
+        # track -> slave -> size asked for, of the slaves in a single track
+        self._sizes: dict[int, dict[Widget | Frame, int]] = {}
+        self._track_of: dict[Widget | Frame, int] = {}
+        self._largest: dict[int, int] = {}
+        self._stale: set[int] = set()
+        # slave -> (start, span, size) of the slaves spanning several tracks
+        self._spanning: dict[Widget | Frame, tuple[int, int, int]] = {}
+
+        self._minimums: list[int] | None = None
+        self._layout: tuple[int, list[int], list[int]] | None = None
+
+    def configure(self, index: int, weight: int | None, minsize: int | None, pad: int | None) -> None:
+        config = self.configs.setdefault(index, TrackConfig())
+        if weight is not None:
+            config.weight = weight
+        if minsize is not None:
+            config.minsize = minsize
+        if pad is not None:
+            config.pad = pad
+        self._minimums = self._layout = None
+
+    def set(self, slave: Widget | Frame, start: int, span: int, size: int) -> None:
+        """Set the tracks a slave is in and the size it asks for across them."""
+        self.remove(slave)
+
+        if span > 1:
+            self._spanning[slave] = (start, span, size)
+        else:
+            self._sizes.setdefault(start, {})[slave] = size
+            self._track_of[slave] = start
+            if start not in self._stale:
+                self._largest[start] = max(self._largest.get(start, 0), size)
+        self._minimums = self._layout = None
+
+    def remove(self, slave: Widget | Frame) -> None:
+        if self._spanning.pop(slave, None) is not None:
+            self._minimums = self._layout = None
+            return
+
+        track = self._track_of.pop(slave, None)
+        if track is None:
+            return
+
+        size = self._sizes[track].pop(slave)
+        if size >= self._largest.get(track, 0):
+            self._stale.add(track)
+        self._minimums = self._layout = None
+
+    def slaves_in(self, tracks: set[int]) -> list[Widget | Frame]:
+        """The slaves in any of the tracks."""
+        slaves = [slave for track in tracks for slave in self._sizes.get(track, ())]
+        for slave, (start, span, _) in self._spanning.items():
+            if any(track in tracks for track in range(start, start + span)):
+                slaves.append(slave)
+        return slaves
+
+    def __len__(self) -> int:
+        """The number of tracks, up to the last one with a slave or options in it."""
+        count = max((track + 1 for track, sizes in self._sizes.items() if sizes), default=0)
+        count = max(count, max((start + span for start, span, _ in self._spanning.values()), default=0))
+        return max(count, max((index + 1 for index in self.configs), default=0))
+
+    def minimums(self) -> list[int]:
+        """The minimum size of every track, fitting the slaves in it and its configured options."""
+        if self._minimums is not None:
+            return self._minimums
+
+        for track in self._stale:
+            self._largest[track] = max(self._sizes.get(track, {}).values(), default=0)
+        self._stale.clear()
+
+        default = TrackConfig()
+        configs = [self.configs.get(index, default) for index in range(len(self))]
+        minimums = [
+            max(self._largest.get(index, 0), config.minsize) + config.pad
+            for index, config in enumerate(configs)
+        ]
+
+        # spanning slaves get the space they miss from the weighted tracks they span, or all of them
+        for start, span, size in sorted(self._spanning.values(), key=lambda spanning: spanning[1]):
+            tracks = range(start, start + span)
+            missing = size - sum(minimums[track] for track in tracks)
+            if missing <= 0:
+                continue
+
+            weights = [configs[track].weight for track in tracks]
+            if not any(weights):
+                weights = [1] * span
+            minimums[start:start + span] = _distribute(minimums[start:start + span], weights, missing)
+
+        self._minimums = minimums
+        return minimums
+
+    def layout(self, available: int) -> tuple[list[int], list[int]]:
+        """The (offsets, sizes) of the tracks in the available space, shared out by weight."""
+        if self._layout is not None and self._layout[0] == available:
+            return self._layout[1], self._layout[2]
+
+        minimums = self.minimums()
+        default = TrackConfig()
+        weights = [self.configs.get(index, default).weight for index in range(len(minimums))]
+        sizes = _distribute(minimums, weights, available - sum(minimums))
+
+        offsets = []
+        offset = 0
+        for size in sizes:
+            offsets.append(offset)
+            offset += size
+
+        self._layout = (available, offsets, sizes)
+        return offsets, sizes
+
+def _grid_refresh(parent: Frame) -> None:
+    """Update the tracks with the slaves of the parent that changed since the last layout."""
+    stale = parent._grid_stale
+    if not stale:
+        return
+
+    for child in stale:
+        if child not in parent._grid_slaves:
+            continue
+
+        parent._grid_unplaced[child] = None
+        info = child._grid_info
+        # the slaves of a frame are the children gridded in it, which have their grid info
+        assert info is not None
+        req_height, req_width = child.req_size
+        parent._grid_rows.set(child, info.row, info.rowspan, req_height + 2 * (info.ipady + info.pady))
+        parent._grid_columns.set(
+            child, info.column, info.columnspan, req_width + 2 * (info.ipadx + info.padx)
+        )
+    stale.clear()
+
+def grid_request(parent: Frame) -> tuple[int, int]:
+    """The (height, width) the parent needs to fit its gridded children."""
+    _grid_refresh(parent)
+    inset = 2 if parent.content.border else 0
+    return (
+        sum(parent._grid_rows.minimums()) + inset,
+        sum(parent._grid_columns.minimums()) + inset,
+    )
+
+def _sticky_span(sticky: str, start: str, end: str, space: int, size: int) -> tuple[int, int]:
+    """The (offset, size) of a slave in the space of its cell along one axis."""
+    if start in sticky and end in sticky:
+        return (0, space)
+    size = min(size, space)
+    if start in sticky:
+        return (0, size)
+    if end in sticky:
+        return (space - size, size)
+    return ((space - size) // 2, size)
+
+def _changed_tracks(old: tuple[list[int], list[int]], new: tuple[list[int], list[int]]) -> set[int]:
+    """The tracks whose offset or size differ between two layouts of an axis."""
+    if old is new:
+        return set()
+
+    (old_offsets, old_sizes), (offsets, sizes) = old, new
+    changed = {
+        index for index in range(min(len(old_sizes), len(sizes)))
+        if old_offsets[index] != offsets[index] or old_sizes[index] != sizes[index]
+    }
+    changed.update(range(min(len(old_sizes), len(sizes)), len(sizes)))
+    return changed
+
+def _grid_cells(
+    parent: Frame,
+    slaves: Iterable[Widget | Frame],
+    rows: tuple[list[int], list[int]],
+    columns: tuple[list[int], list[int]],
+) -> dict[Widget | Frame, Rect]:
+    """The rectangles of the slaves in the cells of the row and column layouts."""
+    inset = 1 if parent.content.border else 0
+    row_offsets, row_sizes = rows
+    column_offsets, column_sizes = columns
+
+    rects: dict[Widget | Frame, Rect] = {}
+    for child in slaves:
+        info = child._grid_info
+        assert info is not None
+        req_height, req_width = child.req_size
+        sticky = info.sticky
+
+        row_end = info.row + info.rowspan
+        cell_height = sum(row_sizes[info.row:row_end]) - 2 * info.pady
+        off_y, height = _sticky_span(sticky, "n", "s", cell_height, req_height + 2 * info.ipady)
+
+        column_end = info.column + info.columnspan
+        cell_width = sum(column_sizes[info.column:column_end]) - 2 * info.padx
+        off_x, width = _sticky_span(sticky, "w", "e", cell_width, req_width + 2 * info.ipadx)
+
+        # like packing, children squeezed out of the grid keep one cell
+        height, width = max(1, height), max(1, width)
+        y = min(inset + row_offsets[info.row] + info.pady + off_y, parent.content.height - height)
+        x = min(inset + column_offsets[info.column] + info.padx + off_x, parent.content.width - width)
+        rects[child] = Rect(max(0, y), max(0, x), height, width)
+
+    return rects
+
+def _grid_layouts(parent: Frame) -> tuple[tuple[list[int], list[int]], tuple[list[int], list[int]]]:
+    """The (offsets, sizes) of the rows and of the columns in the parent."""
+    _grid_refresh(parent)
+    inset = 2 if parent.content.border else 0
+    rows = parent._grid_rows.layout(parent.content.height - inset)
+    columns = parent._grid_columns.layout(parent.content.width - inset)
+    return rows, columns
+
+def grid_arrange(parent: Frame) -> dict[Widget | Frame, Rect]:
+    """The rectangles of the gridded children relative to the parent.
+
+    The tracks get their minimum size and the space left over, or missing, is shared by the
+    weighted tracks. Each child is then placed in the cell of the tracks it spans by its sticky.
+    """
+    rows, columns = _grid_layouts(parent)
+    return _grid_cells(parent, parent._grid_slaves, rows, columns)
+
+def grid_manager(parent: Frame) -> list[Frame]:
+    """Grids frames and widgets in a parent frame.
+
+    Only the children that changed or are in a row or column that moved or changed size since
+    the last layout are placed again, and like packing only the ones whose rectangle changed are
+    moved and redrawn.
+
+    Returns:
+        The gridded child frames whose size changed, their own children need to be laid out again.
+    """
+    rows, columns = _grid_layouts(parent)
+    size = (parent.content.height, parent.content.width, parent.content.border)
+
+    placed = parent._grid_placed
+    if placed is None or placed[0] != size:
+        slaves: Iterable[Widget | Frame] = parent._grid_slaves
+    else:
+        slaves = dict(parent._grid_unplaced)
+        slaves.update(dict.fromkeys(parent._grid_rows.slaves_in(_changed_tracks(placed[1], rows))))
+        slaves.update(dict.fromkeys(parent._grid_columns.slaves_in(_changed_tracks(placed[2], columns))))
+
+    rects = _grid_cells(parent, slaves, rows, columns)
+    parent._grid_placed = (size, rows, columns)
+    parent._grid_unplaced.clear()
+    return _place_slaves(parent, rects, parent._grid_rects)
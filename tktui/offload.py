@@ -0,0 +1,95 @@
+from __future__ import annotations
+from concurrent.futures import Executor, Future
+from typing import TYPE_CHECKING, Any, Callable
+import copy
+
+if TYPE_CHECKING:
+    from tktui.events import Event
+    from tktui.frame import Frame
+    from tktui.widget import Widget
+
+def _detached(event: Event) -> Event:
+    """A copy of the event without the widgets, which are not to be touched off the loop thread
+    and can not be pickled for a process pool."""
+    detached = copy.copy(event)
+    detached.target = None
+    try:
+        del detached._widget
+    except AttributeError:
+        pass
+    return detached
+
+class OffloadedHandler:
+    """Event handler running a function on an executor instead of on the loop.
+
+    The handler returns right away, so a slow function does not hold up the input and the
+    rendering. The function is called in the executor with a copy of the event without its widgets
+    and the args the handler was registered with. Its result is handed to done, or the exception it
+    raised to error, back on the thread running the loop where the widgets can be changed. Without
+    error the exception is raised on the loop.
+
+    With cancel_stale, the function still pending or running for a widget the last time it fired
+    is stale once it fires again: it is cancelled if it did not start and its result is dropped.
+    """
+    def __init__(
+        self,
+        function: Callable[..., Any],
+        executor: Callable[[], Executor],
+        post: Callable[..., None],
+        done: Callable[[Event, Any], None] | None = None,
+        error: Callable[[Event, BaseException], None] | None = None,
+        cancel_stale: bool = True,
+    ) -> None:
+        self.function = function
+        self.done = done
+        self.error = error
+        self.cancel_stale = cancel_stale
+
+        self._executor = executor
+        # call_soon_threadsafe of the app, the futures complete on the threads of the executor
+        self._post = post
+        # the calls whose result is still to be delivered, with the widget they were fired on
+        self._pending: dict[Future[Any], Widget | Frame | None] = {}
+        # the last call for each widget
+        self._latest: dict[Widget | Frame | None, Future[Any]] = {}
+
+    def __call__(self, event: Event, *args: Any, **kwargs: Any) -> None:
+        widget = getattr(event, "_widget", None)
+        stale = self._latest.get(widget)
+        if stale is not None and self.cancel_stale:
+            stale.cancel()
+            self._pending.pop(stale, None)
+
+        # the event goes on to the other handlers, done gets it as it was for this one
+        fired = copy.copy(event)
+        future = self._executor().submit(self.function, _detached(event), *args, **kwargs)
+        self._pending[future] = widget
+        self._latest[widget] = future
+        future.add_done_callback(lambda future: self._post(self._deliver, fired, future))
+
+    def cancel(self) -> None:
+        """Cancel the calls that did not start yet and drop the results of all the pending ones."""
+        for future in self._pending:
+            future.cancel()
+        self._pending.clear()
+        self._latest.clear()
+
+    def _deliver(self, event: Event, future: Future[Any]) -> None:
+        if future not in self._pending:
+            # stale or cancelled
+            return
+
+        widget = self._pending.pop(future)
+        if self._latest.get(widget) is future:
+            del self._latest[widget]
+        if future.cancelled():
+            return
+
+        exception = future.exception()
+        if exception is None:
+            if self.done is not None:
+                self.done(event, future.result())
+        elif self.error is not None:
+            self.error(event, exception)
+        else:
+            raise exception
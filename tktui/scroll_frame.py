@@ -0,0 +1,257 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING
+import curses
+
+from tktui.base import BorderPos
+from tktui.box import Box
+from tktui.frame import Frame
+from tktui.geometry import Rect
+from tktui.spatial import SpatialIndex
+
+if TYPE_CHECKING:
+    from tktui.events import KeyEvent, MouseEvent
+    from tktui.tktui import TkTui
+    from tktui.widget import Widget
+
+# lines scrolled by a turn of the mouse wheel
+WHEEL_LINES = 3
+
+class ScrollFrame(Frame):
+    """Frame showing a part of content larger than itself, scrolled by the mouse wheel and keys.
+
+    The children are drawn in a curses pad sized to the content instead of in the window of the
+    frame. Rendering the frame copies the visible part of the pad to the screen with the pad form
+    of noutrefresh, so scrolling costs the size of the frame whatever the size of the content and
+    nothing in the pad is drawn again.
+
+    Children are placed in the content with pack, grid or positions in content coordinates. The
+    content is the size asked for by its packed or gridded children, or by resize_content, and at
+    least the size of the frame. Scroll frames can not be nested.
+    """
+    __slots__ = ("_content_index", "content_height", "content_width", "scroll_y", "scroll_x", "pad")
+
+    def __init__(
+        self,
+        parent: Frame | TkTui,
+        height: int | None = None,
+        width: int | None = None,
+        content_height: int = 0,
+        content_width: int = 0,
+        border: bool = False,
+        border_title: str = "",
+        border_pos: BorderPos = BorderPos.TOP_LEFT,
+        **kwargs
+    ) -> None:
+        parent_frame = parent if isinstance(parent, Frame) else parent._root
+        if parent_frame._child_scroll_frame() is not None:
+            raise ValueError("Scroll frames can not be nested.")
+
+        super().__init__(parent, border=border, border_title=border_title, border_pos=border_pos, **kwargs)
+
+        # the frame itself asks for the size it is given, not for the size of its content
+        if height is not None:
+            self.req_height = height
+        if width is not None:
+            self.req_width = width
+
+        # the children are hit tested in content coordinates
+        self._content_index: SpatialIndex[Widget | Frame] = SpatialIndex()
+        # smallest size of the content, laid out children can make it larger
+        self.content_height = content_height
+        self.content_width = content_width
+        # position of the top left corner of the frame in the content
+        self.scroll_y = 0
+        self.scroll_x = 0
+
+        height, width = self._content_size()
+        self.pad = self.app.backend.newpad(height, width)
+        self.content = Box(self.pad)
+        self.content.in_pad = True
+        self.content.set_background(self.box.background)
+        self.content.repaint()
+
+        self.app._scroll_frames[self] = None
+
+    @property
+    def req_size(self) -> tuple[int, int]:
+        return (self.req_height, self.req_width)
+
+    @property
+    def view_height(self) -> int:
+        """The number of content rows visible in the frame."""
+        return max(0, self.box.height - (2 if self.box.border else 0))
+
+    @property
+    def view_width(self) -> int:
+        """The number of content columns visible in the frame."""
+        return max(0, self.box.width - (2 if self.box.border else 0))
+
+    def _child_scroll_frame(self) -> ScrollFrame | None:
+        return self
+
+    def _content_size(self) -> tuple[int, int]:
+        height = max(self.content_height, self.view_height, 1)
+        width = max(self.content_width, self.view_width, 1)
+        if (self._pack_slaves or self._grid_slaves) and self._layout_req is not None:
+            height = max(height, self._layout_req[0])
+            width = max(width, self._layout_req[1])
+        return (height, width)
+
+    def _fit_content(self) -> None:
+        """Resize the pad to the size of the content."""
+        height, width = self._content_size()
+        content = self.content
+        if (height, width) == (content.height, content.width):
+            return
+
+        # the content box must fit in the pad at every step
+        if height > content.height or width > content.width:
+            self.pad.resize(max(height, content.height), max(width, content.width))
+        content.resize(height, width)
+        self.pad.resize(height, width)
+
+        self._scroll_to(self.scroll_y, self.scroll_x)
+        self.redraw()
+
+    def resize_content(self, height: int, width: int) -> None:
+        """Set the smallest size of the content, e.g. for children placed at positions."""
+        self.content_height, self.content_width = height, width
+        self._fit_content()
+
+    def redraw(self) -> None:
+        self.box.repaint()
+        self.content.repaint()
+        for child in self.children:
+            child.redraw()
+        self.draw()
+
+    def _sync_children(self) -> None:
+        # the children are placed in the pad, which does not move with the frame
+        pass
+
+    def _place(self, rect: Rect) -> None:
+        super()._place(rect)
+        self._fit_content()
+        self._scroll_to(self.scroll_y, self.scroll_x)
+
+    def _fit(self, rect: Rect) -> None:
+        # the children are in the pad, only the view changes
+        self.box.place(rect.x, rect.y, rect.height, rect.width)
+        self._hit_index.update(self, self.box.rect)
+        self._fit_content()
+        self._scroll_to(self.scroll_y, self.scroll_x)
+
+    # ---- scrolling ----
+
+    def _scroll_to(self, y: int, x: int) -> None:
+        y = max(0, min(y, self.content.height - self.view_height))
+        x = max(0, min(x, self.content.width - self.view_width))
+        if (y, x) == (self.scroll_y, self.scroll_x):
+            return
+
+        self.scroll_y, self.scroll_x = y, x
+        # only the part of the pad in view is copied again
+        self.draw()
+
+    def yview(self) -> tuple[float, float]:
+        """The (first, last) fractions of the content height in view, like Tk."""
+        height = self.content.height
+        return (self.scroll_y / height, min(1.0, (self.scroll_y + self.view_height) / height))
+
+    def xview(self) -> tuple[float, float]:
+        """The (first, last) fractions of the content width in view, like Tk."""
+        width = self.content.width
+        return (self.scroll_x / width, min(1.0, (self.scroll_x + self.view_width) / width))
+
+    def yview_moveto(self, fraction: float) -> None:
+        """Scroll so that the fraction of the content height is at the top of the frame."""
+        self._scroll_to(round(fraction * self.content.height), self.scroll_x)
+
+    def xview_moveto(self, fraction: float) -> None:
+        """Scroll so that the fraction of the content width is at the left of the frame."""
+        self._scroll_to(self.scroll_y, round(fraction * self.content.width))
+
+    def yview_scroll(self, number: int, what: str = "units") -> None:
+        """Scroll down by number lines, or pages with what set to "pages". Up when negative."""
+        step = max(1, self.view_height - 1) if what == "pages" else 1
+        self._scroll_to(self.scroll_y + number * step, self.scroll_x)
+
+    def xview_scroll(self, number: int, what: str = "units") -> None:
+        """Scroll right by number columns, or pages with what set to "pages". Left when negative."""
+        step = max(1, self.view_width - 1) if what == "pages" else 1
+        self._scroll_to(self.scroll_y, self.scroll_x + number * step)
+
+    def see(self, target: Widget | Frame) -> None:
+        """Scroll as little as needed to bring the target in the content into view."""
+        rect = target.box.rect
+        y, x = self.scroll_y, self.scroll_x
+        if rect.y + rect.height > y + self.view_height:
+            y = rect.y + rect.height - self.view_height
+        if rect.x + rect.width > x + self.view_width:
+            x = rect.x + rect.width - self.view_width
+        self._scroll_to(min(y, rect.y), min(x, rect.x))
+
+    # ---- rendering and input ----
+
+    def _content_point(self, y: int, x: int) -> tuple[int, int] | None:
+        """The content coordinates of the screen point (y, x), None outside of the view."""
+        inset = 1 if self.box.border else 0
+        rect = self.box.rect
+        view_y, view_x = y - rect.y - inset, x - rect.x - inset
+        if not (0 <= view_y < self.view_height and 0 <= view_x < self.view_width):
+            return None
+        return (view_y + self.scroll_y, view_x + self.scroll_x)
+
+    def blit(self) -> None:
+        """Copy the part of the pad in view to the virtual screen, after the frame itself."""
+        if not self.view_height or not self.view_width:
+            return
+
+        inset = 1 if self.box.border else 0
+        rect = self.box.rect
+        top, left = rect.y + inset, rect.x + inset
+        self.pad.noutrefresh(
+            self.scroll_y,
+            self.scroll_x,
+            top,
+            left,
+            top + self.view_height - 1,
+            left + self.view_width - 1,
+        )
+
+    def _on_mouse_event(self, event: MouseEvent) -> None:
+        if event.bstate & curses.BUTTON4_PRESSED:
+            lines = -WHEEL_LINES
+        elif event.bstate & curses.BUTTON5_PRESSED:
+            lines = WHEEL_LINES
+        else:
+            return
+
+        # the wheel with shift scrolls sideways
+        if event.bstate & curses.BUTTON_SHIFT:
+            self.xview_scroll(lines)
+        else:
+            self.yview_scroll(lines)
+        event.stop()
+
+    def _on_key_event(self, event: KeyEvent) -> None:
+        match event.key:
+            case curses.KEY_UP:
+                self.yview_scroll(-1)
+            case curses.KEY_DOWN:
+                self.yview_scroll(1)
+            case curses.KEY_LEFT:
+                self.xview_scroll(-1)
+            case curses.KEY_RIGHT:
+                self.xview_scroll(1)
+            case curses.KEY_PPAGE:
+                self.yview_scroll(-1, "pages")
+            case curses.KEY_NPAGE:
+                self.yview_scroll(1, "pages")
+            case curses.KEY_HOME:
+                self._scroll_to(0, 0)
+            case curses.KEY_END:
+                self._scroll_to(self.content.height, self.scroll_x)
+            case _:
+                return
+        event.stop()
@@ -0,0 +1,78 @@
+from __future__ import annotations
+from typing import Generic, Hashable, Iterator, TypeVar
+
+from tktui.geometry import Rect
+
+T = TypeVar("T", bound=Hashable)
+
+class SpatialIndex(Generic[T]):
+    """Uniform grid of cell buckets mapping screen rectangles to the items covering them.
+
+    Every item is stored in each bucket its rectangle overlaps so a point query only has to look
+    at the items registered in a single bucket instead of every item on the screen.
+    """
+    def __init__(self, cell_height: int = 4, cell_width: int = 8) -> None:
+        self.cell_height = cell_height
+        self.cell_width = cell_width
+
+        # dicts are used as ordered sets so that queries are deterministic
+        self._buckets: dict[tuple[int, int], dict[T, None]] = {}
+        self._rects: dict[T, Rect] = {}
+
+    def __len__(self) -> int:
+        return len(self._rects)
+
+    def __contains__(self, item: T) -> bool:
+        return item in self._rects
+
+    def _cells(self, rect: Rect) -> Iterator[tuple[int, int]]:
+        if rect.height <= 0 or rect.width <= 0:
+            return
+
+        first_row = rect.y // self.cell_height
+        last_row = (rect.y + rect.height - 1) // self.cell_height
+        first_col = rect.x // self.cell_width
+        last_col = (rect.x + rect.width - 1) // self.cell_width
+
+        for row in range(first_row, last_row + 1):
+            for col in range(first_col, last_col + 1):
+                yield (row, col)
+
+    def insert(self, item: T, rect: Rect) -> None:
+        """Add the item to the index or update its rectangle if it is already indexed."""
+        old_rect = self._rects.get(item)
+        if old_rect == rect:
+            return
+
+        if old_rect is not None:
+            self.remove(item)
+
+        self._rects[item] = rect
+        for cell in self._cells(rect):
+            self._buckets.setdefault(cell, {})[item] = None
+
+    update = insert
+
+    def remove(self, item: T) -> None:
+        """Remove the item from the index. Unknown items are ignored."""
+        rect = self._rects.pop(item, None)
+        if rect is None:
+            return
+
+        for cell in self._cells(rect):
+            bucket = self._buckets[cell]
+            del bucket[item]
+            if not bucket:
+                del self._buckets[cell]
+
+    def rect(self, item: T) -> Rect | None:
+        return self._rects.get(item)
+
+    def query(self, y: int, x: int) -> list[T]:
+        """Find all the items whose rectangle contains the point (y, x)."""
+        bucket = self._buckets.get((y // self.cell_height, x // self.cell_width))
+        if not bucket:
+            return []
+
+        rects = self._rects
+        return [item for item in bucket if rects[item].contains(y, x)]
@@ -0,0 +1,171 @@
+from __future__ import annotations
+from functools import lru_cache
+from typing import Iterator
+import unicodedata
+
+# measured widths of the lines that are not plain ASCII, ASCII lines are measured by their length
+LINE_CACHE_SIZE = 1024
+# widths of single characters, the ones an app shows are few but text from outside can hold any
+CHAR_CACHE_SIZE = 4096
+
+_ZWJ = "\u200d"
+_VS16 = "\ufe0f"
+
+@lru_cache(maxsize=CHAR_CACHE_SIZE)
+def _is_extend(char: str) -> bool:
+    """Whether the character attaches to the grapheme cluster before it instead of starting one."""
+    code = ord(char)
+    return (
+        unicodedata.category(char) in ("Mn", "Me", "Mc")
+        or char == _ZWJ
+        # variation selectors, emoji skin tones and tags
+        or 0xfe00 <= code <= 0xfe0f
+        or 0xe0100 <= code <= 0xe01ef
+        or 0x1f3fb <= code <= 0x1f3ff
+        or 0xe0020 <= code <= 0xe007f
+        # hangul vowel and final jamo of a syllable spelled out
+        or 0x1160 <= code <= 0x11ff
+        or 0xd7b0 <= code <= 0xd7fb
+    )
+
+def _is_regional_indicator(char: str) -> bool:
+    return 0x1f1e6 <= ord(char) <= 0x1f1ff
+
+def graphemes(text: str) -> Iterator[str]:
+    """The grapheme clusters of the text, what is seen as a single character.
+
+    A simplification of the Unicode segmentation rules covering combining marks, emoji sequences
+    joined with zero width joiners or modifiers, flags made of regional indicator pairs and
+    hangul jamo, without a dependency on a Unicode database of the clusters.
+    """
+    start = 0
+    end = len(text)
+    i = 0
+    while i < end:
+        char = text[i]
+        i += 1
+        if char == "\r" and i < end and text[i] == "\n":
+            i += 1
+        elif _is_regional_indicator(char) and i < end and _is_regional_indicator(text[i]):
+            i += 1
+
+        while i < end:
+            if _is_extend(text[i]):
+                i += 1
+            elif text[i - 1] == _ZWJ:
+                # the character after a joiner is part of the same emoji
+                i += 1
+            else:
+                break
+
+        yield text[start:i]
+        start = i
+
+@lru_cache(maxsize=CHAR_CACHE_SIZE)
+def char_width(char: str) -> int:
+    """The number of terminal cells a character takes on its own, 0 for the ones combining."""
+    if _is_extend(char):
+        return 0
+    if unicodedata.east_asian_width(char) in ("W", "F"):
+        return 2
+    return 1
+
+def cluster_width(cluster: str) -> int:
+    """The number of terminal cells a grapheme cluster takes."""
+    base = cluster[0]
+    if _is_regional_indicator(base) or (_VS16 in cluster and ord(base) >= 0x2000):
+        # flags and text symbols with the emoji presentation are drawn as emoji
+        return 2
+    return char_width(base)
+
+@lru_cache(maxsize=LINE_CACHE_SIZE)
+def _measure(line: str) -> int:
+    if _ZWJ not in line and _VS16 not in line:
+        # the marks extending the clusters take no cells, the characters add up. Flags too, as
+        # each regional indicator of the pair takes a cell
+        return sum(map(char_width, line))
+    return sum(map(cluster_width, graphemes(line)))
+
+def text_width(line: str) -> int:
+    """The number of terminal cells a line of text takes.
+
+    The widths of the lines that are not ASCII are kept in a bounded LRU cache, so the values a
+    live label goes through do not pile up.
+    """
+    if line.isascii():
+        return len(line)
+    return _measure(line)
+
+def truncate(line: str, width: int) -> str:
+    """The longest start of the line fitting in width cells, without splitting a cluster."""
+    if line.isascii():
+        return line[:max(0, width)]
+
+    used = 0
+    end = 0
+    for cluster in graphemes(line):
+        used += cluster_width(cluster)
+        if used > width:
+            break
+        end += len(cluster)
+    return line[:end]
+
+def shared_prefix(a: str, b: str) -> int:
+    """The number of characters the two lines start with in common, cut back to a cluster boundary.
+
+    The prefix never ends inside a cluster of either line, so its width is the column where the
+    lines start to differ on the screen.
+    """
+    end = min(len(a), len(b))
+    i = 0
+    while i < end and a[i] == b[i]:
+        i += 1
+    if a.isascii() and b.isascii():
+        return i
+
+    while i > 0 and (
+        (i < len(a) and _is_extend(a[i]))
+        or (i < len(b) and _is_extend(b[i]))
+        or a[i - 1] == _ZWJ
+        # a flag is a pair of regional indicators, which one of the pair is not known from here
+        or _is_regional_indicator(a[i - 1])
+    ):
+        i -= 1
+    return i
+
+def text_size(text: str) -> tuple[int, int]:
+    """The number of rows and columns the text takes. Trailing newlines do not add rows."""
+    text = text.rstrip("\n")
+    if not text:
+        return (0, 0)
+
+    lines = text.split("\n")
+    return (len(lines), max(map(text_width, lines)))
+
+
+class TextMetrics:
+    """The size of a text that changes over time, measuring only the lines that changed.
+
+    A label updated with a new value keeps the widths of the lines that are the same as before, so
+    a multi line text with a single changing line is measured a line at a time.
+    """
+    def __init__(self, text: str = "") -> None:
+        self.lines: list[str] = []
+        self.widths: list[int] = []
+        self.size = (0, 0)
+        self.update(text)
+
+    def update(self, text: str) -> tuple[int, int]:
+        """Measure the new text and return its (rows, columns)."""
+        text = text.rstrip("\n")
+        lines = text.split("\n") if text else []
+        old_lines, old_widths = self.lines, self.widths
+        old_count = len(old_lines)
+
+        self.widths = [
+            old_widths[row] if row < old_count and old_lines[row] == line else text_width(line)
+            for row, line in enumerate(lines)
+        ]
+        self.lines = lines
+        self.size = (len(lines), max(self.widths)) if lines else (0, 0)
+        return self.size
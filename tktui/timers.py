@@ -0,0 +1,99 @@
+from __future__ import annotations
+from typing import Any, Callable
+import heapq
+import itertools
+import time
+
+# cancelled timers are left in the heap until there are more of them than live ones
+_COMPACT_MIN = 64
+
+class TimerQueue:
+    """Callbacks scheduled after a delay or when idle, like after and after_idle in Tk.
+
+    Timers are kept in a heap on their deadline so the next one is known without looking at the
+    others. Cancelling only forgets the timer, it is dropped from the heap when it comes up.
+    """
+    def __init__(self, clock: Callable[[], float] = time.monotonic) -> None:
+        self.clock = clock
+
+        self._ids = itertools.count()
+        # (deadline, sequence, id) in deadline order, the sequence keeps equal deadlines in order
+        self._heap: list[tuple[float, int, str]] = []
+        self._timers: dict[str, tuple[Callable[..., Any], tuple[Any, ...]]] = {}
+        self._idle: dict[str, tuple[Callable[..., Any], tuple[Any, ...]]] = {}
+
+    def __len__(self) -> int:
+        return len(self._timers) + len(self._idle)
+
+    def after(self, ms: int, callback: Callable[..., Any], *args: Any) -> str:
+        """Call callback with args once, ms milliseconds from now.
+
+        Returns:
+            The id of the timer for cancel.
+        """
+        sequence = next(self._ids)
+        timer_id = f"after#{sequence}"
+        heapq.heappush(self._heap, (self.clock() + max(0, ms) / 1000, sequence, timer_id))
+        self._timers[timer_id] = (callback, args)
+        return timer_id
+
+    def after_idle(self, callback: Callable[..., Any], *args: Any) -> str:
+        """Call callback with args once, the next time there is no input left to handle."""
+        timer_id = f"after#{next(self._ids)}"
+        self._idle[timer_id] = (callback, args)
+        return timer_id
+
+    def cancel(self, timer_id: str) -> None:
+        """Forget the timer, nothing happens when it already ran or was cancelled."""
+        if self._idle.pop(timer_id, None) is not None:
+            return
+
+        cancelled = self._timers.pop(timer_id, None) is not None
+        if cancelled and len(self._heap) > max(_COMPACT_MIN, 2 * len(self._timers)):
+            self._heap = [entry for entry in self._heap if entry[2] in self._timers]
+            heapq.heapify(self._heap)
+
+    def next_deadline(self) -> float | None:
+        """The clock time the earliest timer is due at, None without timers."""
+        heap = self._heap
+        while heap and heap[0][2] not in self._timers:
+            heapq.heappop(heap)
+        return heap[0][0] if heap else None
+
+    def timeout(self) -> float | None:
+        """Seconds until a callback is due, 0 when idle callbacks are waiting and None without any."""
+        if self._idle:
+            return 0
+
+        deadline = self.next_deadline()
+        if deadline is None:
+            return None
+        return max(0.0, deadline - self.clock())
+
+    def run_due(self) -> int:
+        """Call the timers that are due and then the idle callbacks.
+
+        Callbacks scheduled by the ones being called wait for the next run, so a callback
+        scheduling itself again can not starve the loop.
+
+        Returns:
+            The number of callbacks called.
+        """
+        now = self.clock()
+        due = []
+        heap = self._heap
+        while heap and heap[0][0] <= now:
+            due.append(heapq.heappop(heap)[2])
+        due.extend(self._idle)
+
+        called = 0
+        for timer_id in due:
+            # looked up when called, an earlier callback may have cancelled it
+            timer = self._timers.pop(timer_id, None) or self._idle.pop(timer_id, None)
+            if timer is None:
+                continue
+
+            callback, args = timer
+            callback(*args)
+            called += 1
+        return called
@@ -1,26 +1,75 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Any
+from typing import TYPE_CHECKING, Any, Callable, Iterator
+from collections import deque
+from concurrent.futures import Executor, ThreadPoolExecutor
+import asyncio
+import heapq
 import curses
+import os
+import select
+import signal
 
 from tktui.widget import Widget
+from tktui.box import getbkgd
 from tktui.ctx import _set_app
 from tktui.colors import Colors
-from tktui.events import MouseEvent, KeyEvent
+from tktui.events import Event, MouseEvent, KeyEvent, PasteEvent, Phase
 from tktui.frame import Frame
+from tktui.scroll_frame import ScrollFrame
+from tktui.geometry import GeometryManager, pack_manager, pack_request, grid_manager, grid_request
+from tktui.spatial import SpatialIndex
+from tktui.timers import TimerQueue
+from tktui.bindings import KeyBindings
+from tktui.offload import OffloadedHandler
+from tktui.backends import Backend, CursesBackend, TerminalBackend
 
 if TYPE_CHECKING:
     from .events import EventHandlerType
     EventCallBackAndArgs = tuple[EventHandlerType | None, tuple[Any, ...], dict[str, Any]]
 
+# (id, x, y, z, bstate) as returned by getmouse
+MouseReport = tuple[int, int, int, int, int]
+
+# the bits of bstate for button presses, releases and clicks
+_BUTTON_EVENTS = curses.ALL_MOUSE_EVENTS & ~(
+    curses.REPORT_MOUSE_POSITION | curses.BUTTON_SHIFT | curses.BUTTON_CTRL | curses.BUTTON_ALT
+)
+
+def _is_motion(bstate: int) -> bool:
+    return bool(bstate & curses.REPORT_MOUSE_POSITION) and not bstate & _BUTTON_EVENTS
+
+# the keys the terminal wraps pasted text in
+_PASTE_START = tuple(map(ord, "\x1b[200~"))
+_PASTE_END = tuple(map(ord, "\x1b[201~"))
+# milliseconds to wait for the rest of a paste the terminal sends in several writes
+_PASTE_WAIT_MS = 100
+
+# a resize is applied once the terminal did not change size for _RESIZE_DELAY_MS, and at least
+# every _RESIZE_MAX_WAIT seconds while it keeps changing, e.g. while a window is dragged
+_RESIZE_DELAY_MS = 50
+_RESIZE_MAX_WAIT = 0.25
+
+def _paste_text(chars: list[int]) -> str:
+    try:
+        # curses reads the bytes of the utf-8 encoding one at a time
+        return bytes(chars).decode()
+    except (ValueError, UnicodeDecodeError):
+        return "".join(map(chr, chars))
+
 
 class TkTui:
-    __subs_for_mouse_event: dict[Widget, EventCallBackAndArgs] = {}
-    __subs_for_key_event: dict[Widget, EventCallBackAndArgs] = {}
+    __subs_for_mouse_event: dict[Widget | Frame, EventCallBackAndArgs]
+    __subs_for_key_event: dict[Widget | Frame, EventCallBackAndArgs]
+    # callbacks called on the way down to the target of the event
+    __capture_subs_for_mouse_event: dict[Widget | Frame, EventCallBackAndArgs]
+    __capture_subs_for_key_event: dict[Widget | Frame, EventCallBackAndArgs]
+    __subs_for_paste_event: dict[Widget | Frame, EventCallBackAndArgs]
+    __capture_subs_for_paste_event: dict[Widget | Frame, EventCallBackAndArgs]
 
     __inst: TkTui | None = None
 
-    def __new__(cls) -> TkTui:
+    def __new__(cls, *args: Any, **kwargs: Any) -> TkTui:
         if cls.__inst is None:
             app = super().__new__(cls)
             cls.__inst = app
@@ -32,32 +81,131 @@ class TkTui:
 
         return app
 
-    def __init__(self) -> None:
-        self.stdscr = curses.initscr()
-        curses.start_color()
-        curses.use_default_colors()
-        self.colors = Colors()
+    def __init__(
+        self,
+        event_wait: bool = True,
+        backend: Backend | None = None,
+        renderer: str = "curses",
+    ) -> None:
+        """
+        Args:
+            event_wait: Sleep on the terminal until there is something to do instead of polling
+                the windows for input.
+            backend: Screen and input layer to run on. Defaults to the one of the renderer, a
+                MemoryBackend runs the app headless.
+            renderer: How the terminal is drawn when no backend is given. "curses" refreshes the
+                curses windows, "diff" composes the screen in memory and only writes the cells that
+                changed since the last frame.
+        """
+        if renderer not in ("curses", "diff"):
+            raise ValueError(f"Unknown renderer '{renderer}'. Expected 'curses' or 'diff'.")
+
+        if backend is None:
+            backend = TerminalBackend() if renderer == "diff" else CursesBackend()
+
+        self.event_wait = event_wait
+        self.backend = backend
+        self._input_fd = self.backend.fileno()
+
+        self.__subs_for_mouse_event = {}
+        self.__subs_for_key_event = {}
+        self.__capture_subs_for_mouse_event = {}
+        self.__capture_subs_for_key_event = {}
+        self.__subs_for_paste_event = {}
+        self.__capture_subs_for_paste_event = {}
+
+        self.stdscr = self.backend.initscr()
+        self.backend.start_color()
+        self.backend.use_default_colors()
+        self.colors = Colors(self.backend)
         self.colors._generate_defaults()
 
+        # bumped whenever widgets are raised or lowered, which invalidates their cached stack keys
+        self._stack_version = 0
+        # widgets and frames keyed on their absolute rectangles for mouse hit testing
+        self._hit_index: SpatialIndex[Widget | Frame] = SpatialIndex()
+        # widgets and frames whose windows changed since the last render. dict as an ordered set
+        self._dirty: dict[Widget | Frame, None] = {}
+        # the scroll frames, their pads are copied to the screen again over the frames they are in
+        self._scroll_frames: dict[ScrollFrame, None] = {}
+
+        # frames whose packing changed since the last layout. dict as an ordered set
+        self._layout_pending: dict[Frame, None] = {}
+
+        # callbacks scheduled with after and after_idle
+        self._timers = TimerQueue()
+        # key sequences bound with bind
+        self._bindings = KeyBindings(self.after, self.after_cancel, self._handle_key)
+
+        # callbacks posted from other threads with their args, called on the thread of the loop.
+        # Appending to a deque is atomic so producers take no lock
+        self._posted: deque[tuple[Callable[..., Any], tuple[Any, ...]]] = deque()
+        # set by the producer writing to the wake up pipe, until the loop takes the batch
+        self._wake_pending = False
+        # the read end becomes readable when callbacks are posted, waking the loop up. The app is
+        # a singleton initialized again by every TkTui(), the pipe is made once
+        if getattr(self, "_wake_r", None) is None:
+            self._wake_r, self._wake_w = os.pipe()
+            os.set_blocking(self._wake_r, False)
+            os.set_blocking(self._wake_w, False)
+        self._drain_wakeups()
+        # runs the offloaded handlers not given an executor of their own, made when first needed
+        self._executor: ThreadPoolExecutor | None = None
+
+        # the timer applying the resize of the terminal, and since when resizes are pending
+        self._resize_id: str | None = None
+        self._resize_since = 0.0
+        # the keys of a paste whose end was not read yet, and the timer handing them in as they are
+        # when the rest does not come
+        self._paste: list[int] | None = None
+        self._paste_id: str | None = None
+        # the SIGWINCH handler replaced, put back with the shell. Curses only reports a resize on
+        # the next getch, the handler wakes the loop up instead. Kept when the app is initialized
+        # again
+        self._saved_sigwinch: Any = getattr(self, "_saved_sigwinch", None)
+        if self.backend.signals_resize:
+            try:
+                saved = signal.signal(signal.SIGWINCH, self._on_sigwinch)
+            except ValueError:
+                # only the main thread can handle signals, a KEY_RESIZE still resizes the app
+                pass
+            else:
+                if saved != self._on_sigwinch:
+                    self._saved_sigwinch = saved
+
+        # set while the app is driven by an asyncio event loop through run_async
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._exited: asyncio.Future[None] | None = None
+        self._render_scheduled = False
+        self._timer_handle: asyncio.TimerHandle | None = None
+        self._timer_deadline = 0.0
+
         self._root= Frame(self, tktui_stdscr = self.stdscr)
         self._root.draw()
 
         # don't show cursor
-        curses.curs_set(0)
+        self.backend.curs_set(0)
 
         # self.stdscr.nodelay(True)
         # self.stdscr.keypad(True)
         # defaults
-        curses.cbreak()
-        curses.noecho()
-        curses.flushinp()
+        self.backend.cbreak()
+        self.backend.noecho()
+        self.backend.flushinp()
+
+        # pasted text comes in as a single event instead of a key at a time
+        self.backend.bracketed_paste(True)
 
-        # enable mouse
-        curses.mousemask(curses.ALL_MOUSE_EVENTS | curses.REPORT_MOUSE_POSITION)
+        # enable mouse, the motion is only reported once a widget asks for it. Keyed on the widget
+        # and whether it asked in the capture phase, each phase registers its own callback
+        self._motion_targets: dict[tuple[Widget | Frame, bool], None] = {}
+        self.backend.mousemask(curses.ALL_MOUSE_EVENTS)
 
         self.cur_window = self._root
         # self.register_for_mouse_event(self._root)
         self._in_focus = None
+        # the widget in focus and its ancestors, computed when the focus changes
+        self._focus_chain: list[Widget | Frame] = [self._root]
 
     @property
     def in_focus(self) -> Widget | None:
@@ -65,150 +213,845 @@ class TkTui:
 
     @in_focus.setter
     def in_focus(self, widget: Widget | None) -> None:
-        if not widget:
-            if self._in_focus:
-                self._in_focus.defocus()
-
-            self._in_focus = None
-
+        if widget and not widget.focusable:
             return
-
-        if not widget.focusable:
+        if widget is not None and widget is self._in_focus and not widget.toggles_focus:
             return
 
         if self._in_focus:
             self._in_focus.defocus()
 
-        # if it is the same widget, just defocus
-        if self._in_focus == widget:
+        # focusing the widget in focus again, or nothing, just defocuses
+        if not widget or self._in_focus == widget:
             self._in_focus = None
         else:
             self._in_focus = widget
             widget.focus()
+            if widget._scroll_frame is not None:
+                widget._scroll_frame.see(widget)
+
+        self._focus_chain = self._ancestors(self._in_focus)
+
+    def _ancestors(self, widget: Widget | Frame | None) -> list[Widget | Frame]:
+        """The widget or frame and the frames it is in up to the root, the path events propagate along."""
+        chain: list[Widget | Frame] = []
+        target: Widget | Frame | None = widget if widget is not None else self._root
+        while target is not None:
+            chain.append(target)
+            target = target.parent
+        return chain
 
     def register_for_mouse_event(
         self,
-        widget: Widget,
+        widget: Widget | Frame,
         callback: EventHandlerType | None = None,
         args: tuple[Any, ...] = tuple(),
         kwargs: dict[str, Any] = {},
+        capture: bool = False,
+        motion: bool = False,
     ) -> None:
+        """Call callback with the mouse events on the widget and on what is in it.
 
-        self.__subs_for_mouse_event[widget] = (callback, args, kwargs)
+        Args:
+            capture: Call it on the way down to the widget the event happened on, before the
+                widgets under it, instead of on the way back up.
+            motion: Also call it when the mouse moves over the widget. The terminal only reports
+                the motion while a widget asks for it, and the motion read in one go is collapsed
+                into its last position. The widget has a single callback per phase for the clicks
+                and the motion, registering again in the same phase replaces both and whether it
+                gets the motion. The other phase keeps its own.
+        """
+        subs = self.__capture_subs_for_mouse_event if capture else self.__subs_for_mouse_event
+        subs[widget] = (callback, args, kwargs)
+
+        tracking = bool(self._motion_targets)
+        if motion:
+            self._motion_targets[(widget, capture)] = None
+        else:
+            self._motion_targets.pop((widget, capture), None)
+
+        if tracking != bool(self._motion_targets):
+            mask = curses.ALL_MOUSE_EVENTS
+            if self._motion_targets:
+                mask |= curses.REPORT_MOUSE_POSITION
+            self.backend.mousemask(mask)
 
     def register_for_key_event(
         self,
-        widget: Widget,
+        widget: Widget | Frame,
         callback: EventHandlerType | None = None,
         args: tuple[Any, ...] = tuple(),
         kwargs: dict[str, Any] = {},
+        capture: bool = False,
+    ) -> None:
+        """Call callback with the key events while the widget or something in it is in focus.
+
+        Args:
+            capture: Call it on the way down to the widget in focus instead of on the way back up.
+        """
+        subs = self.__capture_subs_for_key_event if capture else self.__subs_for_key_event
+        subs[widget] = (callback, args, kwargs)
+
+    def register_for_paste_event(
+        self,
+        widget: Widget | Frame,
+        callback: EventHandlerType | None = None,
+        args: tuple[Any, ...] = tuple(),
+        kwargs: dict[str, Any] = {},
+        capture: bool = False,
+    ) -> None:
+        """Call callback with the text pasted while the widget or something in it is in focus.
+
+        Without a widget registered for it on the focus chain, pasted text is handled as keys.
+
+        Args:
+            capture: Call it on the way down to the widget in focus instead of on the way back up.
+        """
+        subs = self.__capture_subs_for_paste_event if capture else self.__subs_for_paste_event
+        subs[widget] = (callback, args, kwargs)
+
+    def bind(
+        self,
+        widget: Widget | None,
+        sequence: str,
+        handler: EventHandlerType[KeyEvent],
+    ) -> None:
+        """Call handler when the key sequence is typed while the widget is in focus.
+
+        Args:
+            widget: The widget the binding belongs to, None to bind it for the whole app.
+            sequence: Keys in Tk syntax, e.g. "<Control-x><Control-s>", "<Escape>" or "gg".
+            handler: Called with the KeyEvent of the last key of the sequence.
+        """
+        self._bindings.bind(widget, sequence, handler)
+
+    def unbind(self, widget: Widget | None, sequence: str) -> None:
+        self._bindings.unbind(widget, sequence)
+
+    def _stack_key(self, target: Widget | Frame) -> tuple[int, ...]:
+        """Key ordering widgets and frames from the bottom of the screen to the top.
+
+        The positions in the stacking order of the children of each ancestor from the root down,
+        so a child is above its parent and above everything in the siblings below its own. Keys
+        are cached until the stacking order changes.
+        """
+        cached = target._stack_cache
+        if cached is not None and cached[0] == self._stack_version:
+            return cached[1]
+
+        if target.parent is None:
+            key: tuple[int, ...] = ()
+        else:
+            key = self._stack_key(target.parent) + (target._stack_pos,)
+        target._stack_cache = (self._stack_version, key)
+        return key
+
+    def _target_at(self, y: int, x: int) -> Widget | Frame:
+        """The topmost widget or frame at (y, x)."""
+        # only what is indexed under the location can enclose it
+        candidates = self._hit_index.query(y, x)
+        if not candidates:
+            return self._root
+        target = candidates[0] if len(candidates) == 1 else max(candidates, key=self._stack_key)
+
+        # what is in a scroll frame is indexed by the frame in content coordinates
+        if isinstance(target, ScrollFrame):
+            point = target._content_point(y, x)
+            candidates = target._content_index.query(*point) if point is not None else []
+            if candidates:
+                target = max(candidates, key=self._stack_key)
+        return target
+
+    def _propagate(
+        self,
+        event: Event,
+        path: list[Widget | Frame],
+        capture_subs: dict[Widget | Frame, EventCallBackAndArgs],
+        subs: dict[Widget | Frame, EventCallBackAndArgs],
+        propagates: str,
+        default: str | None = None,
     ) -> None:
-        self.__subs_for_key_event[widget] = (callback, args, kwargs)
+        """Pass the event down the path from the root to its target and back up, until stopped.
+
+        Args:
+            path: The target of the event, as set on it, and its ancestors up to the root.
+            propagates: Attribute of the widgets telling whether the event continues up past them.
+            default: Method of the widgets handling the event on the way up after the callback
+                registered for them, unless it stopped the event. Like the class bindings of Tk,
+                e.g. the scrolling of scroll frames, which leaves the callback to the user.
+        """
+        # capture from the root down to the target
+        for target in reversed(path):
+            event.phase = Phase.TARGET if target is event.target else Phase.CAPTURE
+            if self._call_handler(event, target, capture_subs, None):
+                return
+
+        # then bubble from the target back up to the root
+        for target in path:
+            event.phase = Phase.TARGET if target is event.target else Phase.BUBBLE
+            if self._call_handler(event, target, subs, propagates, default):
+                return
+
+    def _call_handler(
+        self,
+        event: Event,
+        target: Widget | Frame,
+        subs: dict[Widget | Frame, EventCallBackAndArgs],
+        propagates: str | None,
+        default: str | None = None,
+    ) -> bool:
+        """Call the callback the target registered in subs, then its default handler.
 
-    def mouse_event(self):
-        """Handle the mouse event by findings all the widgets that enclose the event that have
-        registered for the event and calling their callback function.
+        Returns:
+            Whether the propagation of the event was stopped.
         """
-        (_, x, y, _, bstate) = curses.getmouse()
+        callback, args, kwargs = subs.get(target) or (None, (), {})
+        handler = getattr(target, default, None) if default is not None else None
+        if callback is None and handler is None:
+            return False
+
+        event.widget = target
+        if callback is not None:
+            callback(event, *args, **kwargs)
+        if handler is not None and not event.stop_propagation:
+            handler(event)
+
+        if propagates is not None and not getattr(target, propagates):
+            event.stop()
+        return event.stop_propagation
+
+    def mouse_event(self, report: MouseReport | None = None):
+        """Handle the mouse event by passing it to the topmost widget under it and the frames that
+        widget is in, down from the root and back up.
+
+        Args:
+            report: The mouse event as returned by getmouse, read from curses when not given.
+        """
+        (_, x, y, _, bstate) = self.backend.getmouse() if report is None else report
         self.cur_window.box.win.move(y, x)
         event = MouseEvent(x, y, bstate)
+        capture_subs = self.__capture_subs_for_mouse_event
+        subs = self.__subs_for_mouse_event
 
-        widgets_containing_mouse: list[tuple[Widget, EventCallBackAndArgs]] = []
         if bstate & curses.BUTTON1_CLICKED:
-            for widget, callback_and_args in self.__subs_for_mouse_event.items():
-                # find all the widgets that enclose the location of the mouse event
-                if widget.box.win.enclose(y, x):
-                    widgets_containing_mouse.append((widget, callback_and_args))
+            path = self._ancestors(self._target_at(y, x))
+            event.target = path[0]
 
+            # the innermost widget registered for mouse events, or handling them itself, that can take
+            # the focus takes it
+            for target in path:
+                if (
+                    isinstance(target, Widget)
+                    and target.focusable
+                    and (target in subs or hasattr(target, "_on_mouse_event"))
+                ):
+                    self.in_focus = target
+                    break
+        elif bstate & (curses.BUTTON4_PRESSED | curses.BUTTON5_PRESSED):
+            # the wheel, scroll frames on the path scroll with it
+            path = self._ancestors(self._target_at(y, x))
+            event.target = path[0]
+        elif _is_motion(bstate) and self._motion_targets:
+            # only the widgets and frames that asked for the motion get it, in the phases they
+            # asked for it in
+            path = self._ancestors(self._target_at(y, x))
+            event.target = path[0]
+            motion = self._motion_targets
+            capture_subs = {
+                target: capture_subs[target] for target in path if (target, True) in motion
+            }
+            subs = {target: subs[target] for target in path if (target, False) in motion}
+            path = [target for target in path if target in capture_subs or target in subs]
+        else:
+            return
+
+        self._propagate(
+            event,
+            path,
+            capture_subs,
+            subs,
+            "propagates_mouse_event",
+            "_on_mouse_event",
+        )
+
+    def key_event(self, char: int):
+        """Handle the key input by passing it to the widget in focus and the frames it is in, down
+        from the root and back up.
+        """
+        y, x = self._root.box.win.getyx()
+        event = KeyEvent(x, y, char)
+        event.target = self._focus_chain[0]
+        self._propagate(
+            event,
+            self._focus_chain,
+            self.__capture_subs_for_key_event,
+            self.__subs_for_key_event,
+            "propagates_key_event",
+            "_on_key_event",
+        )
 
-        if not widgets_containing_mouse:
+    def paste_event(self, text: str):
+        """Handle pasted text by passing it to the widget in focus and the frames it is in, down
+        from the root and back up.
+
+        When none of them registered for it, the text is typed into them a key event per character.
+        The characters are text and not key presses, they go past the bindings and the keys of the
+        app, e.g. a pasted q does not quit.
+        """
+        capture_subs, subs = self.__capture_subs_for_paste_event, self.__subs_for_paste_event
+        if not any(target in subs or target in capture_subs for target in self._focus_chain):
+            for char in text:
+                self.key_event(ord(char))
             return
 
-        # sort the widgets by their depth in reverse order
-        # TODO: handle overlapping widgets
-        widgets_containing_mouse.sort(key=lambda tup: tup[0].parent.z_index, reverse=True)
+        y, x = self._root.box.win.getyx()
+        event = PasteEvent(x, y, text)
+        event.target = self._focus_chain[0]
+        self._propagate(event, self._focus_chain, capture_subs, subs, "propagates_key_event")
 
-        focused = False
-        for widget, callback_and_args in widgets_containing_mouse:
-            if not focused and widget.focusable:
-                self.in_focus = widget
-                focused = True
+    def mark_dirty(self, target: Widget | Frame) -> None:
+        """Schedule the window of the target to be copied to the screen on the next render.
 
-            if not event.stop_propagation:
-                event.widget = widget
-                callback, args, kwargs = callback_and_args
+        What is drawn in the pad of a scroll frame is copied to the screen by the scroll frame.
+        """
+        self._dirty[target._scroll_frame or target] = None
 
-                if callback is None:
-                    continue
+        # nothing else wakes the asyncio loop up to render changes made by coroutines
+        if self._loop is not None and not self._render_scheduled:
+            self._render_scheduled = True
+            self._loop.call_soon(self.render)
 
-                callback(event, *args, **kwargs)
-                if not widget.propagates_mouse_event:
-                    event.stop()
+    def _schedule_layout(self, frame: Frame) -> None:
+        """Lay the children of the frame out again before the next render."""
+        self._layout_pending[frame] = None
+        self.mark_dirty(frame)
 
+    def update_layout(self) -> None:
+        """Run the geometry managers of the frames whose slaves changed since the last layout.
 
-    def key_event(self, char: int):
-        """Handle the key inputs by findings all the widgets that enclose the cursor that have
-        registered for the event and calling their callback function.
+        The sizes the frames ask for are first propagated from the children up to their masters,
+        then the frames are arranged from the top down. A frame is only arranged again when a
+        master changed its size.
         """
-        y, x = self._root.box.win.getyx()
-        event = KeyEvent(x, y, char)
+        if not self._layout_pending:
+            return
+
+        pending = self._layout_pending
+        self._layout_pending = {}
 
-        widgets_containing_cursor: list[tuple[Widget, EventCallBackAndArgs]] = []
+        queued = set(pending)
+        heap = [(-frame.z_index, id(frame), frame) for frame in pending]
+        heapq.heapify(heap)
+        while heap:
+            _, _, frame = heapq.heappop(heap)
+            if frame.geometry_manager == GeometryManager.GRID:
+                req = grid_request(frame)
+            elif frame._pack_slaves:
+                req = pack_request(frame)
+            else:
+                continue
 
-        for widget, callback_and_args in self.__subs_for_key_event.items():
-            if widget.box.win.enclose(y, x):
-                widgets_containing_cursor.append((widget, callback_and_args))
+            if req == frame._layout_req:
+                continue
 
-        if not widgets_containing_cursor:
+            frame._layout_req = req
+            master = frame._pack_master or frame._grid_master
+            if master is None:
+                continue
+
+            if frame._grid_master is not None:
+                master._grid_stale[frame] = None
+            if master not in queued:
+                queued.add(master)
+                heapq.heappush(heap, (-master.z_index, id(master), master))
+
+        heap = [(frame.z_index, id(frame), frame) for frame in queued]
+        heapq.heapify(heap)
+        while heap:
+            _, _, frame = heapq.heappop(heap)
+            frame._fit_content()
+            if frame.geometry_manager == GeometryManager.GRID:
+                resized_frames = grid_manager(frame)
+            else:
+                resized_frames = pack_manager(frame)
+
+            for resized in resized_frames:
+                # children are popped after their master so queued frames are still in the heap
+                if resized not in queued:
+                    queued.add(resized)
+                    heapq.heappush(heap, (resized.z_index, id(resized), resized))
+
+    def render(self) -> None:
+        """Copy the windows that changed since the last render to the screen in one update.
+
+        Windows are staged with noutrefresh from the back to the front so the children end up on
+        top of their parents and the terminal is only written once by doupdate. The pads of scroll
+        frames are staged after their frame, and again after any frame they are in.
+        """
+        self._render_scheduled = False
+        self.update_layout()
+        if self.colors._stale:
+            self._redraw_stale_colors()
+        if not self._dirty:
             return
 
-        widgets_containing_cursor.sort(key=lambda tup: tup[0].z_index, reverse=True)
-        for widget, callback_and_args in widgets_containing_cursor:
-            if not event.stop_propagation:
-                event.widget = widget
-                callback, args, kwargs = callback_and_args
-                if callback is None:
-                    continue
-                callback(event, *args, **kwargs)
-                if not widget.propagates_key_event:
-                    event.stop()
+        dirty = self._dirty
+        for scroll_frame in self._scroll_frames:
+            if scroll_frame not in dirty and any(
+                frame in dirty for frame in self._ancestors(scroll_frame.parent)
+            ):
+                dirty[scroll_frame] = None
 
+        for target in sorted(dirty, key=lambda target: target.z_index):
+            target.box.win.noutrefresh()
+            if isinstance(target, ScrollFrame):
+                target.blit()
+
+        self._dirty.clear()
+        self.backend.doupdate()
+
+    def _redraw_stale_colors(self) -> None:
+        """Redraw the widgets whose color pairs were given other colors, each once per render.
+
+        A widget redrawn can take back the pairs of others, which are redrawn in turn. A widget
+        losing its pairs again in the same render is left as it is, the frame needs more color
+        combinations than the terminal has pairs.
+        """
+        redrawn: set[Widget | Frame] = set()
+        while stale := [widget for widget in self.colors.take_stale() if widget not in redrawn]:
+            redrawn.update(stale)
+            for widget in stale:
+                widget.redraw()
 
     def restore_shell(self) -> None:
+        if self._saved_sigwinch is not None:
+            signal.signal(signal.SIGWINCH, self._saved_sigwinch)
+            self._saved_sigwinch = None
+        self.backend.bracketed_paste(False)
         self._root.box.win.keypad(False)
-        curses.nocbreak()
-        curses.echo()
-        curses.endwin()
-        curses.flushinp()
+        self.backend.nocbreak()
+        self.backend.echo()
+        self.backend.endwin()
+        self.backend.flushinp()
 
     def exit(self):
         self._running= False
 
+        if self._exited is not None and not self._exited.done():
+            self._exited.set_result(None)
 
-    def mainloop(self) -> None:
-        self._running = True
-        self.stdscr.refresh()
 
+    def after(self, ms: int, callback: Callable[..., Any], *args: Any) -> str:
+        """Call callback with args once, ms milliseconds from now.
+
+        A callback calling after again runs periodically. The loop sleeps until the earliest
+        timer is due, so any number of timers costs no thread and no polling.
+
+        Returns:
+            The id of the timer for after_cancel.
+        """
+        timer_id = self._timers.after(ms, callback, *args)
+        self._arm_timers()
+        return timer_id
+
+    def after_idle(self, callback: Callable[..., Any], *args: Any) -> str:
+        """Call callback with args once, after the input waiting to be handled.
+
+        Returns:
+            The id of the callback for after_cancel.
+        """
+        timer_id = self._timers.after_idle(callback, *args)
+        self._arm_timers()
+        return timer_id
+
+    def after_cancel(self, timer_id: str) -> None:
+        """Cancel a callback scheduled with after or after_idle."""
+        self._timers.cancel(timer_id)
+
+    def _run_timers(self) -> None:
+        self._timer_handle = None
+        self._timers.run_due()
+        self._arm_timers()
+
+    def _arm_timers(self) -> None:
+        """Wake the asyncio event loop up when the next timer is due."""
+        if self._loop is None:
+            return
+
+        timeout = self._timers.timeout()
+        if timeout is None:
+            return
+
+        deadline = self._timers.clock() + timeout
+        if self._timer_handle is not None:
+            if self._timer_deadline <= deadline:
+                return
+            self._timer_handle.cancel()
+
+        self._timer_deadline = deadline
+        self._timer_handle = self._loop.call_later(timeout, self._run_timers)
+
+    def call_soon_threadsafe(self, callback: Callable[..., Any], *args: Any) -> None:
+        """Call callback with args on the thread running the app, from any thread.
+
+        Curses is not thread safe, threads change the widgets through this. The callbacks posted
+        are called in order by the loop, all the ones posted since the last time as one batch
+        rendered once.
+        """
+        self._posted.append((callback, args))
+        if not self._wake_pending:
+            self._wake_pending = True
+            try:
+                os.write(self._wake_w, b"\0")
+            except BlockingIOError:
+                # the pipe is full of wake ups the loop has not read yet, it is readable anyway
+                pass
+
+    def post_event(self, event: MouseEvent | KeyEvent | PasteEvent) -> None:
+        """Handle the event on the thread running the app as if it came from the terminal.
+
+        Can be called from any thread, like call_soon_threadsafe.
+        """
+        if isinstance(event, MouseEvent):
+            self.call_soon_threadsafe(self.mouse_event, (0, event.x, event.y, 0, event.bstate))
+        elif isinstance(event, KeyEvent):
+            self.call_soon_threadsafe(self._handle_char, event.key)
+        elif isinstance(event, PasteEvent):
+            self.call_soon_threadsafe(self.paste_event, event.text)
+        else:
+            raise TypeError(f"Can not post a {type(event).__name__}")
+
+    def offload(
+        self,
+        function: Callable[..., Any],
+        done: Callable[[Event, Any], None] | None = None,
+        error: Callable[[Event, BaseException], None] | None = None,
+        executor: Executor | None = None,
+        cancel_stale: bool = True,
+    ) -> OffloadedHandler:
+        """An event handler calling function on an executor, for handlers too slow for the loop.
+
+        Register it like any other handler, e.g.
+        `app.register_for_mouse_event(button, app.offload(query, done=show_rows))`. function gets a
+        copy of the event without its widgets and must not touch the widgets. done is called with
+        the event and the result back on the loop, error with the event and the exception raised.
+
+        Args:
+            executor: A thread or process pool to run function in. Defaults to a thread pool of
+                the app. With a process pool function, its args and result must be picklable.
+            cancel_stale: Cancel the call still pending for a widget when it fires again, or drop
+                its result when it already started.
+        """
+        return OffloadedHandler(
+            function,
+            (lambda: executor) if executor is not None else self._default_executor,
+            self.call_soon_threadsafe,
+            done=done,
+            error=error,
+            cancel_stale=cancel_stale,
+        )
+
+    def _default_executor(self) -> Executor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(thread_name_prefix="tktui")
+        return self._executor
+
+    def _shutdown_executor(self) -> None:
+        """Stop the thread pool of the offloaded handlers, without waiting for the calls running."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def _drain_wakeups(self) -> None:
+        try:
+            while os.read(self._wake_r, 4096):
+                pass
+        except BlockingIOError:
+            pass
+
+    def _on_wakeup(self) -> None:
+        self._drain_wakeups()
+        self._run_posted()
+
+    def _run_posted(self) -> None:
+        """Call the callbacks posted from other threads since the last batch."""
+        if not self._wake_pending:
+            return
+
+        self._drain_wakeups()
+        # reset before taking the batch, a callback posted from now on writes a new wake up
+        self._wake_pending = False
+        posted = self._posted
+        for _ in range(len(posted)):
+            callback, args = posted.popleft()
+            callback(*args)
+
+    def _next_timeout(self) -> float | None:
+        """Seconds the loop can sleep for before it has work to do. None to wait for input."""
+        return self._timers.timeout()
+
+    def _wait(self, timeout: float | None) -> bool:
+        """Block until there is input, callbacks were posted from other threads or the timeout expires.
+
+        Returns:
+            Whether there is input ready to be read.
+        """
+        ready, _, _ = select.select([self._input_fd, self._wake_r], [], [], timeout)
+        if self._wake_r in ready:
+            # read even when the callbacks were already called, the pipe would stay readable
+            self._drain_wakeups()
+        return self._input_fd in ready
+
+    def _handle_char(self, char: int) -> None:
+        if char == curses.KEY_RESIZE:
+            self._schedule_resize()
+            return
+
+        if char != curses.KEY_MOUSE:
+            y, x = self._root.box.win.getyx()
+            if self._bindings.feed(KeyEvent(x, y, char), self.in_focus):
+                return
+        self._handle_key(char)
+
+    def _handle_key(self, char: int) -> None:
+        """Handle a key no binding took, also the keys of a sequence replayed when it had none."""
+        if "q" == chr(char):
+            self.exit()
+            return
+
+        if char == curses.KEY_MOUSE:
+            self.mouse_event()
+        else:
+            # the handlers mark what they change dirty themselves
+            self.key_event(char)
+
+    def _on_sigwinch(self, signum: int, frame: Any) -> None:
+        # signal handlers run between any two bytecodes of the main thread, like another thread
+        self.call_soon_threadsafe(self._schedule_resize)
+
+    def _schedule_resize(self) -> None:
+        """Resize the app once the terminal stops changing size.
+
+        A window dragged with the mouse resizes the terminal many times a second. The resizes are
+        collapsed into one applied _RESIZE_DELAY_MS after the last of them, or after at most
+        _RESIZE_MAX_WAIT seconds so the app keeps up with a long drag.
+        """
+        now = self._timers.clock()
+        if self._resize_id is None:
+            self._resize_since = now
+        elif now - self._resize_since < _RESIZE_MAX_WAIT:
+            self.after_cancel(self._resize_id)
+        else:
+            # the resize already scheduled is due soon
+            return
+        self._resize_id = self.after(_RESIZE_DELAY_MS, self._apply_resize)
+
+    def _apply_resize(self) -> None:
+        """Fit the app in the terminal at its current size.
+
+        The windows are resized in place. The widgets and frames placed at positions are fitted in
+        their frame, and only the frames whose size changed are laid out again. The terminal does
+        not keep what it showed, so the whole screen is copied to it once on the next render.
+        """
+        self._resize_id = None
+        height, width = self.backend.terminal_size()
+        root = self._root
+        old_height, old_width = root.box.height, root.box.width
+        if height <= 0 or width <= 0 or (height, width) == (old_height, old_width):
+            return
+
+        # curses windows have to fit in their parent at every step, what shrinks is fitted before
+        # the screen and what grows after it
+        kept_height, kept_width = min(height, old_height), min(width, old_width)
+        fitted = root._fit_children(old_height, old_width, kept_height, kept_width)
+        self.backend.resize_term(height, width)
+        root.box.resize(height, width)
+        root.box.clear_outside(old_height, old_width, getbkgd(root.box.win))
+        for child, place in root._fit_children(kept_height, kept_width, height, width).items():
+            fitted.setdefault(child, place)
+
+        # what was under the places cleared is drawn again, the fitted frames with their children
+        places = list(fitted.values())
+        for child in root.children:
+            if child in fitted or any(child.box.rect.overlaps(place) for place in places):
+                child.redraw()
+        root.box.decorate()
+
+        if root._pack_slaves or root._grid_slaves:
+            self._schedule_layout(root)
+        root.box.win.touchwin()
+        root.draw()
+
+    def _read_input(self) -> Iterator[int | str | MouseReport]:
+        """The keys, pasted text and mouse events curses has buffered, in order.
+
+        Each KEY_MOUSE is read with its mouse event right away as curses only keeps a few of them.
+        Consecutive mouse motion is collapsed into the last position, so dragging across the
+        screen is handled once per read instead of once per cell the mouse went over. Text pasted
+        in bracketed paste mode comes as a single str.
+        """
+        win = self.cur_window.box.win
+        # keys read ahead of time while looking for the start of a paste
+        pushback: deque[int] = deque()
+
+        def getch() -> int:
+            return pushback.popleft() if pushback else win.getch()
+
+        if self._paste is not None:
+            # the rest of the paste cut by the end of the last read
+            text = self._read_paste(getch)
+            if text is None:
+                return
+            yield text
+
+        motion: MouseReport | None = None
         while self._running:
-            char = self.cur_window.box.win.getch()
+            char = getch()
+            item: int | str | MouseReport = char
+
+            if char == curses.KEY_MOUSE:
+                try:
+                    item = self.backend.getmouse()
+                except curses.error:
+                    continue
+
+                if _is_motion(item[4]):
+                    motion = item
+                    continue
+            elif char == 27 and self._read_ahead(getch, pushback, _PASTE_START[1:]):
+                text = self._read_paste(getch)
+                if text is None:
+                    # the rest of the paste comes with a later read
+                    char = -1
+                else:
+                    item = text
+
+            # anything else ends the run of motion, which is handled before it
+            if motion is not None:
+                yield motion
+                motion = None
 
             if char == -1:
-                continue
+                return
+            yield item
 
-            if "q" == chr(char):
+    def _read_ahead(
+        self,
+        getch: Callable[[], int],
+        pushback: deque[int],
+        expected: tuple[int, ...],
+    ) -> bool:
+        """Whether the next keys are the expected ones. They are put back when they are not."""
+        read = []
+        for key in expected:
+            char = getch()
+            if char == -1:
+                break
+            read.append(char)
+            if char != key:
                 break
+        else:
+            return True
 
-            if char == curses.KEY_MOUSE:
-                self.mouse_event()
+        pushback.extendleft(reversed(read))
+        return False
+
+    def _read_paste(self, getch: Callable[[], int]) -> str | None:
+        """The text up to the end of the paste, None when the end was not read yet.
+
+        Long pastes can arrive in several reads. The keys read are kept for the next read, and
+        handed in as they are if nothing comes for _PASTE_WAIT_MS, the end never comes if the app
+        is slow. The wait is a timer, the loop keeps running meanwhile.
+        """
+        chars = self._paste if self._paste is not None else []
+        self._paste = None
+        if self._paste_id is not None:
+            self.after_cancel(self._paste_id)
+            self._paste_id = None
+
+        end = len(_PASTE_END)
+        while True:
+            char = getch()
+            if char == -1:
+                self._paste = chars
+                self._paste_id = self.after(_PASTE_WAIT_MS, self._end_paste)
+                return None
+
+            chars.append(char)
+            if char == _PASTE_END[-1] and tuple(chars[-end:]) == _PASTE_END:
+                del chars[-end:]
+                return _paste_text(chars)
+
+    def _end_paste(self) -> None:
+        """Hand in the paste whose end did not come."""
+        self._paste_id = None
+        chars, self._paste = self._paste, None
+        if chars is not None:
+            self.paste_event(_paste_text(chars))
+
+    def _process_input(self) -> None:
+        """Handle all the input curses has buffered as one batch.
+
+        The windows are in nodelay mode so this stops once the buffer is empty. Leaving keys in the
+        curses buffer would make the next wait on the terminal sleep through them. The screen is
+        rendered once after the whole batch by the loop, not after every key.
+        """
+        for item in self._read_input():
+            if isinstance(item, str):
+                self.paste_event(item)
+            elif isinstance(item, tuple):
+                self.mouse_event(item)
             else:
-                self._root.box.win.addch(chr(char)) # for testing if they keys are being registered
-                self.key_event(char)
+                self._handle_char(item)
 
-            # important for updating the screen at the end of the loop
-            self.cur_window.box.win.refresh()
+    def mainloop(self) -> None:
+        self._running = True
+        self._root.draw()
+        self.render()
+
+        while self._running:
+            if not self.event_wait or self._wait(self._next_timeout()):
+                self._process_input()
+
+            # all the updates posted by threads while waiting, rendered once with the input
+            self._run_posted()
+            self._run_timers()
+            self.render()
 
+        self._shutdown_executor()
         self.restore_shell()
             # clears the screen but keeps the windows
             # self.cur_window.win.erase()
 
+    async def run_async(self) -> None:
+        """Run the app inside the running asyncio event loop until exit is called.
+
+        The terminal is registered as a reader of the event loop so input is dispatched as soon as
+        it arrives, and changes made to widgets by coroutines are rendered on the next iteration
+        of the event loop.
+        """
+        self._loop = asyncio.get_running_loop()
+        self._exited = self._loop.create_future()
+        self._running = True
+        self._loop.add_reader(self._input_fd, self._process_input)
+        self._loop.add_reader(self._wake_r, self._on_wakeup)
+
+        self._root.draw()
+        self.render()
+        # timers scheduled before the app was started
+        self._arm_timers()
+
+        try:
+            await self._exited
+        finally:
+            self._loop.remove_reader(self._input_fd)
+            self._loop.remove_reader(self._wake_r)
+            if self._timer_handle is not None:
+                self._timer_handle.cancel()
+                self._timer_handle = None
+            self._loop = None
+            self._exited = None
+            self._shutdown_executor()
+            self.restore_shell()
+
 
@@ -1,26 +1,32 @@
 from __future__ import annotations
-import curses
 
 from typing import TYPE_CHECKING
 from tktui.ctx import get_app
 from tktui.base import BorderPos
 from tktui.frame import Frame
 from tktui.box import Box
-from tktui.geometry import PackInfo
+from tktui.geometry import PackInfo, GridInfo, Side, Anchor, Fill, Sticky, Rect
 
 if TYPE_CHECKING:
+    from tktui.colors import Color
     from tktui.tktui import TkTui
-    from tktui.geometry import Side, Anchor, Fill
 
 # TODO:
 # 1: Padding and Marging
-# 2: Redraw on screen resize
-# 3: Container widgets with tkinter style packing
-# 4: Scrolling containers
-# 4: Custom widgets: switch, button, label, static, textarea, list, checkbox, h/v lines
+# 2: Container widgets with tkinter style packing
+# 3: Custom widgets: switch, button, label, static, textarea, list, checkbox, h/v lines
 
 class Widget:
     """Defines what it is to occupy space on a screen."""
+    # a screen can hold thousands of widgets. Subclasses without __slots__ still get a __dict__ for
+    # their own attributes, and colors keeps weak references to the widgets drawing with a pair
+    __slots__ = (
+        "parent", "parent_win", "z_index", "_stack_pos", "_stack_cache", "box", "app",
+        "_scroll_frame", "_hit_index", "focusable", "toggles_focus", "propagates_mouse_event",
+        "propagates_key_event", "req_height", "req_width", "_pack_info", "_pack_master",
+        "_grid_info", "_grid_master", "__weakref__",
+    )
+
     def __init__(
         self,
         parent: Frame | TkTui,
@@ -40,10 +46,13 @@ class Widget:
         else:
             self.parent = parent._root
 
-        self.parent_win = self.parent.box.win
+        self.parent_win = self.parent.content.win
         self.z_index = self.parent.z_index + 1
+        # position in the stacking order of the children of the parent
+        self._stack_pos = 0
+        self._stack_cache: tuple[int, tuple[int, ...]] | None = None
+        self.parent._add_child(self)
 
-        assert isinstance(self.parent_win, curses.window)
         self.box = Box(
             self.parent_win,
             x=x,
@@ -52,16 +61,33 @@ class Widget:
             height=height,
             border=border,
             border_title=border_title,
-            border_pos=border_pos
+            border_pos=border_pos,
+            parent_box=self.parent.content,
         )
 
         self.app = get_app()
+        # the scroll frame whose pad the widget is drawn in, None when it is drawn on the screen
+        self._scroll_frame = self.parent._child_scroll_frame()
+        # keep the widget hit testable by the mouse event dispatch
+        self._hit_index = (
+            self.app._hit_index if self._scroll_frame is None else self._scroll_frame._content_index
+        )
+        self._hit_index.insert(self, self.box.rect)
 
         self.focusable = True
+        # whether focusing the widget while it is in focus, e.g. clicking it again, defocuses it
+        self.toggles_focus = True
         self.propagates_mouse_event = True
         self.propagates_key_event = True
 
-        self.__pack_info: PackInfo | None = None
+        # size asked for when the widget is placed by a geometry manager
+        self.req_height = self.box.height
+        self.req_width = self.box.width
+
+        self._pack_info: PackInfo | None = None
+        self._pack_master: Frame | None = None
+        self._grid_info: GridInfo | None = None
+        self._grid_master: Frame | None = None
 
     def pack(
         self,
@@ -83,7 +109,7 @@ class Widget:
         else:
             parent = self.parent
 
-        self.__pack_info = PackInfo(
+        self._pack_info = PackInfo(
             side=side,
             expand=expand,
             fill=fill,
@@ -100,15 +126,120 @@ class Widget:
             before,
         )
 
+    def grid(
+        self,
+        column: int = 0,
+        row: int = 0,
+        rowspan: int = 1,
+        columnspan: int = 1,
+        sticky: Sticky | str = "",
+        ipadx: int = 0,
+        ipady: int = 0,
+        padx: int = 0,
+        pady: int = 0,
+        in_: Frame | None = None,
+    ) -> None:
+
+        if in_:
+            parent = in_
+        else:
+            parent = self.parent
+
+        self._grid_info = GridInfo(
+            row=row,
+            column=column,
+            rowspan=rowspan,
+            columnspan=columnspan,
+            sticky=sticky,
+            ipadx=ipadx,
+            ipady=ipady,
+            padx=padx,
+            pady=pady,
+        )
+
+        parent.grid_child(self)
+
+    @property
+    def req_size(self) -> tuple[int, int]:
+        return (self.req_height, self.req_width)
+
+    def move(self, x: int, y: int) -> None:
+        """Move the widget to (x, y) relative to its parent."""
+        old_y, height = self.box.y, self.box.height
+        self.box.clear()
+        self.box.move(x, y)
+        self._hit_index.update(self, self.box.rect)
+        self._redraw_parent(old_y, height)
+
+    def resize(self, height: int, width: int) -> None:
+        """Resize the widget. Also the size asked for from the geometry manager it is placed by."""
+        self.req_height, self.req_width = height, width
+        master = self._pack_master or self._grid_master
+        if master is not None:
+            master._slave_changed(self)
+            return
+
+        old_height, old_width = self.box.height, self.box.width
+        # only the cells a shrink uncovers go back to the parent
+        self.box.clear_outside(height, width)
+        self.box.resize(height, width)
+        self._hit_index.update(self, self.box.rect)
+        if height < old_height or width < old_width:
+            self._redraw_parent(self.box.y, old_height)
+        else:
+            self.redraw()
+
+    def _place(self, rect: Rect) -> None:
+        """Move and resize the widget relative to its parent. Used by the geometry managers."""
+        self._fit(rect)
+        self.redraw()
+
+    def _fit(self, rect: Rect) -> None:
+        """Move and resize the widget relative to its parent without redrawing it."""
+        self.box.place(rect.x, rect.y, rect.height, rect.width)
+        self._hit_index.update(self, self.box.rect)
+
+    def lift(self, above: Widget | Frame | None = None) -> None:
+        """Raise the widget above a sibling in the stacking order, to the top without one."""
+        self.parent._restack(self, above, above=True)
+
+    tkraise = lift
+
+    def lower(self, below: Widget | Frame | None = None) -> None:
+        """Lower the widget below a sibling in the stacking order, to the bottom without one."""
+        self.parent._restack(self, below, above=False)
+
+    def _redraw_parent(self, y: int, height: int) -> None:
+        """Repaint the lines of the parent the widget covered before it moved or shrank.
+
+        Only these lines of the parent are copied to the screen again, not the whole parent.
+        """
+        self.parent.content.win.touchline(y, height)
+        self.parent.draw()
+        self.redraw()
 
     def draw(self) -> None:
-        self.box.win.refresh()
+        """Mark the widget to be redrawn on the next render."""
+        self.app.mark_dirty(self)
+
+    def redraw(self) -> None:
+        """Repaint the whole widget, e.g. after it was moved or resized."""
+        self.box.repaint()
+        self.draw()
+
+    def color(self, fg: Color, bg: Color) -> int:
+        """The attribute to draw fg on bg with.
+
+        The widget is redrawn if the pair is given other colors, so ask for it again when drawing
+        instead of keeping the attribute.
+        """
+        return self.app.colors.pair(fg, bg, self)
 
     def focus(self) -> None:
         if self.focusable:
-            self.box.win.bkgd(" ", self.box.focus_bkgd)
+            self.box.set_background(self.box.focus_bkgd)
             self.draw()
 
     def defocus(self) -> None:
-        self.box.win.bkgd(" ", self.box.default_bkgd)
+        self.box.set_background(self.box.default_bkgd)
         self.draw()
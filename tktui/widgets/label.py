@@ -1,13 +1,21 @@
-from tktui.widget import Widget, Box, BorderPos
-from tktui.widgets.utils import calculate_text_size
-from tktui.ctx import get_app
+from __future__ import annotations
+from typing import TYPE_CHECKING
+
+from tktui.widget import Widget, BorderPos
+from tktui.text import TextMetrics, shared_prefix, text_width, truncate
+
+if TYPE_CHECKING:
+    from tktui.frame import Frame
+    from tktui.tktui import TkTui
 
 # TODO: 9 alignment options for text as well as padding/margin
 
 class Label(Widget):
+    __slots__ = ("text", "_metrics", "text_size", "_shown", "grow_size_only")
+
     def __init__(
         self,
-        parent:
+        parent: Frame | TkTui,
         x: int,
         y: int,
         height: int | None = None,
@@ -20,59 +28,87 @@ class Label(Widget):
         **kwargs
     ) -> None:
         assert isinstance(text, str)
-        self.parent_win = parent.win
-        self.depth = parent.depth + 1
-        self.app = get_app()
-
-        self.x = x
-        self.y = y
 
         self.text = text
-        self.text_size = calculate_text_size(text)
+        # widths of the lines of the text, measured again only for the lines that change
+        self._metrics = TextMetrics(text)
+        self.text_size = self._metrics.size
+        # lines of the text on the screen, the next text is written over them where it differs
+        self._shown: list[str] = []
 
         if height:
-            self.height = self.text_size[0] + 2 if self.text_size[0] + 2 > height else height
+            height = self.text_size[0] + 2 if self.text_size[0] + 2 > height else height
         else:
-            self.height = self.text_size[0] + 2
+            height = self.text_size[0] + 2
 
         if width:
-            self.width = self.text_size[1] + 2 if self.text_size[1] + 2 > width else width
+            width = self.text_size[1] + 2 if self.text_size[1] + 2 > width else width
         else:
-            self.width = self.text_size[1] + 2
+            width = self.text_size[1] + 2
+
+        super().__init__(
+            parent,
+            x,
+            y,
+            height=height,
+            width=width,
+            border=border,
+            border_title=border_title,
+            border_pos=border_pos,
+            **kwargs
+        )
 
         self.grow_size_only = grow_size_only
 
-        self.win = self.parent_win.derwin(self.height, self.width, self.y, self.x)
-        self.win.overlay(self.parent_win)
-        self.focus_bkgd = self.app.colors["WHITE_BLUE"]
-        self.default_bkgd = self.app.colors["WHITE_GREEN"]
-
-        self.win.bkgd(" ", self.default_bkgd)
-
-        # for mouse presses
-        self.win.keypad(True)
-        self.win.nodelay(True)
-
-        self.border = border
-        self.border_pos = border_pos
-        self.border_title = border_title
-        # self.update_border_title(border_title)
-
-        self.focusable = True
         # This will help with widgets for which it doesn't make sense for events to propagate
         # eg Buttons for mouse event
         self.propagates_mouse_event = True
         self.propagates_key_event = True
 
-        self.update_border_title(f"{self.height},{self.width}")
+        self.box.update_border_title(f"{self.box.height},{self.box.width}")
 
         self.write_text(self.text)
 
     def write_text(self, text: str) -> None:
-        for row, txt in enumerate(text.split("\n")):
-            self.win.addstr(1 + row, 1, txt)
-
-        self.win.refresh()
+        # the window can be smaller than the text until the geometry manager resizes it
+        height, width = self.box.height - 2, self.box.width - 2
+        self._shown = text.split("\n")[:height]
+        for row, txt in enumerate(self._shown):
+            # cut to the cells available, wide characters take two
+            self.box.win.addstr(1 + row, 1, truncate(txt, width))
+
+        self.draw()
+
+    def _write_changes(self, text: str) -> None:
+        """Write the text over the one on the screen, only from the first cell differing on each line."""
+        height, width = self.box.height - 2, self.box.width - 2
+        lines = text.split("\n")[:height]
+        shown = self._shown
+        changed = False
+        for row in range(max(len(lines), len(shown))):
+            old = shown[row] if row < len(shown) else ""
+            new = lines[row] if row < len(lines) else ""
+            if old == new:
+                continue
+
+            start = shared_prefix(old, new)
+            col = text_width(new[:start])
+            if col >= width:
+                continue
+
+            tail = truncate(new[start:], width - col)
+            # blank the cells of the old line past the end of the new one
+            blank = min(text_width(old), width) - col - text_width(tail)
+            self.box.win.addstr(1 + row, 1 + col, tail + " " * max(0, blank))
+            changed = True
+
+        self._shown = lines
+        if changed:
+            self.draw()
+
+    def redraw(self) -> None:
+        self.box.repaint()
+        self.write_text(self.text)
 
     def update_size(self, text: str, grow_size_only: bool | None = None) -> None:
         """Update the size of the label given the new input.
@@ -81,43 +117,41 @@ class Label(Widget):
         if grow_size_only is not None:
             self.grow_size_only = grow_size_only
 
-        if text == self.text:
-            return
-
-        text_size = calculate_text_size(text)
+        text_size = self._metrics.update(text)
 
         if text_size == self.text_size:
             return
 
         self.text_size = text_size
+        height, width = self.req_size
         if self.grow_size_only:
-            new_height = self.text_size[0] + 2 if self.text_size[0] + 2 > self.height else self.height
-            new_width = self.text_size[1] + 2 if self.text_size[1] + 2 > self.width else self.width
+            new_height = self.text_size[0] + 2 if self.text_size[0] + 2 > height else height
+            new_width = self.text_size[1] + 2 if self.text_size[1] + 2 > width else width
         else:
             new_height = self.text_size[0] + 2
             new_width = self.text_size[1] + 2
 
-        if new_height == self.height and new_width == self.width:
+        if new_height == height and new_width == width:
             return
 
-        self.height, self.width = new_height, new_width
-
-        self.win.erase()
-        self.parent_win.redrawwin()
-        self.parent_win.refresh()
-        self.win.resize(self.height, self.width)
-        self.win.refresh()
-
-        if self.border:
-            self.add_border()
+        # resizing repaints on the parent only what a shrink uncovered
+        self.resize(new_height, new_width)
 
-            self.update_border_title(f"{self.height},{self.width}")
+        if self.box.border:
+            self.box.update_border_title(f"{new_height},{new_width}")
 
     def update_text(self, text: str) -> None:
-        if not text:
+        """Show another text, writing only the cells of the lines that changed.
+
+        A label resized for the new text is drawn again whole, and only what a shrink uncovered is
+        repainted on the parent.
+        """
+        if not text or text == self.text:
             return
 
+        shape = (self.box.height, self.box.width)
+        self.text = text
         self.update_size(text)
-        self.write_text(text)
-        self.win.refresh()
-
+        if (self.box.height, self.box.width) == shape:
+            # not drawn again by a resize, the old text is still on the screen
+            self._write_changes(text)
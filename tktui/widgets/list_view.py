@@ -0,0 +1,277 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING, Callable
+import curses
+
+from tktui.box import getbkgd
+from tktui.text import text_width, truncate
+from tktui.widget import Widget, BorderPos
+
+if TYPE_CHECKING:
+    from tktui.backends.base import Window
+    from tktui.events import KeyEvent, MouseEvent
+    from tktui.frame import Frame
+    from tktui.tktui import TkTui
+
+# rows scrolled by a turn of the mouse wheel
+WHEEL_ROWS = 3
+
+class ListView(Widget):
+    """List of rows that are fetched from a callback only when they come into view.
+
+    The list holds no items, only the number of rows and a row_provider returning the text of the
+    row at an index. The window has one line per visible row, which is recycled for whatever row
+    is scrolled onto it, so memory and drawing cost the height of the list and not its number of
+    rows. Scrolling shifts the lines with curses and only asks for and draws the rows coming in.
+
+    Rows are selected with the mouse or with the arrow, page, Home and End keys while the list is
+    in focus. command is called with the index of the row selected.
+    """
+    __slots__ = (
+        "row_count", "row_provider", "command", "top", "selection", "_rows", "_lines",
+        "_lines_win", "_lines_shape",
+    )
+
+    def __init__(
+        self,
+        parent: Frame | TkTui,
+        x: int,
+        y: int,
+        height: int,
+        width: int,
+        row_count: int = 0,
+        row_provider: Callable[[int], str] = str,
+        command: Callable[[int], None] | None = None,
+        border: bool = True,
+        border_title: str = "",
+        border_pos: BorderPos = BorderPos.TOP_LEFT,
+        **kwargs
+    ) -> None:
+        self.row_count = row_count
+        self.row_provider = row_provider
+        self.command = command
+
+        # index of the row on the first line and of the selected row
+        self.top = 0
+        self.selection: int | None = None
+        # text of the rows in view, by index
+        self._rows: dict[int, str] = {}
+        # (row, selected) drawn on each line, (-1, False) when empty and None when not drawn yet.
+        # Only the lines showing something else are drawn again
+        self._lines: list[tuple[int, bool] | None] = []
+        # the window of the lines inside the border, scrolled by curses, and (height, width, inset)
+        # it was made for
+        self._lines_win: Window | None = None
+        self._lines_shape: tuple[int, int, int] | None = None
+
+        super().__init__(
+            parent,
+            x,
+            y,
+            height=height,
+            width=width,
+            border=border,
+            border_title=border_title,
+            border_pos=border_pos,
+            **kwargs
+        )
+
+        # clicking rows keeps the list in focus for the keys
+        self.toggles_focus = False
+        self._show()
+
+    @property
+    def view_height(self) -> int:
+        """The number of rows visible at once."""
+        return max(0, self.box.height - (2 if self.box.border else 0))
+
+    def size(self) -> int:
+        return self.row_count
+
+    def set_row_count(self, row_count: int) -> None:
+        """Change the number of rows, e.g. when the data the rows come from grew."""
+        self.row_count = row_count
+        if self.selection is not None and self.selection >= row_count:
+            self.selection = row_count - 1 if row_count else None
+        self._rows = {row: text for row, text in self._rows.items() if row < row_count}
+        self._scroll_to(self.top, force=True)
+
+    def invalidate(self, row: int | None = None) -> None:
+        """Ask the row provider again for the row at index, or for all the rows in view."""
+        if row is None:
+            self._rows.clear()
+        else:
+            self._rows.pop(row, None)
+        self._lines = []
+        self._show()
+
+    def curselection(self) -> int | None:
+        return self.selection
+
+    def selection_set(self, row: int | None) -> None:
+        """Select the row at index and bring it into view, or clear the selection with None."""
+        if row is not None:
+            row = max(0, min(row, self.row_count - 1))
+            if self.row_count == 0:
+                row = None
+
+        if row == self.selection:
+            return
+
+        self.selection = row
+        if row is not None:
+            self.see(row)
+        self._show()
+
+        if row is not None and self.command is not None:
+            self.command(row)
+
+    def see(self, row: int) -> None:
+        """Scroll as little as needed to bring the row at index into view."""
+        if row < self.top:
+            self._scroll_to(row)
+        elif row >= self.top + self.view_height:
+            self._scroll_to(row - self.view_height + 1)
+
+    def yview(self) -> tuple[float, float]:
+        """The (first, last) fractions of the rows in view, like Tk."""
+        if not self.row_count:
+            return (0.0, 1.0)
+        return (self.top / self.row_count, min(1.0, (self.top + self.view_height) / self.row_count))
+
+    def yview_moveto(self, fraction: float) -> None:
+        """Scroll so that the row at the fraction of the rows is on the first line."""
+        self._scroll_to(round(fraction * self.row_count))
+
+    def yview_scroll(self, number: int, what: str = "units") -> None:
+        """Scroll down by number rows, or pages with what set to "pages". Up when negative."""
+        step = max(1, self.view_height - 1) if what == "pages" else 1
+        self._scroll_to(self.top + number * step)
+
+    def _scroll_to(self, top: int, force: bool = False) -> None:
+        top = max(0, min(top, self.row_count - self.view_height))
+        if top == self.top and not force:
+            return
+
+        delta = top - self.top
+        self.top = top
+        lines = self._lines
+        if self._lines_win is not None and 0 < abs(delta) < len(lines):
+            # the lines still in view move with curses, only the ones scrolled in are drawn
+            # only while scrolling, full lines written at the bottom would scroll the window too
+            self._lines_win.scrollok(True)
+            self._lines_win.scroll(delta)
+            self._lines_win.scrollok(False)
+            self._lines_win.syncup()
+            if delta > 0:
+                self._lines = lines[delta:] + [None] * delta
+            else:
+                self._lines = [None] * -delta + lines[:delta]
+        self._show()
+
+    def _lines_window(self) -> Window | None:
+        """The window of the lines, made again when the size or the border of the list changed."""
+        inset = 1 if self.box.border else 0
+        shape = (self.view_height, self.box.width - 2 * inset, inset)
+        if shape != self._lines_shape:
+            self._lines_shape = shape
+            self._lines = []
+            self._lines_win = None
+            if shape[0] > 0 and shape[1] > 0:
+                self._lines_win = self.box.win.derwin(shape[0], shape[1], inset, inset)
+
+        win = self._lines_win
+        bkgd = getbkgd(self.box.win)
+        if win is not None and getbkgd(win) != bkgd:
+            # the lines are drawn with the background the box has, e.g. in focus
+            win.bkgd(bkgd)
+        return win
+
+    def _show(self) -> None:
+        """Draw the rows in view on the lines showing something else."""
+        win = self._lines_window()
+        if win is None:
+            return
+
+        # set along with the window
+        assert self._lines_shape is not None
+        height, width, _ = self._lines_shape
+        if len(self._lines) != height:
+            self._lines = [None] * height
+
+        visible = range(self.top, min(self.top + height, self.row_count))
+        old_rows = self._rows
+        # the rows that stay in view keep their text, only the ones coming in are fetched
+        self._rows = {
+            row: old_rows[row] if row in old_rows else self.row_provider(row).split("\n", 1)[0]
+            for row in visible
+        }
+
+        changed = False
+        for line in range(height):
+            row = self.top + line
+            shown = (row, row == self.selection) if row in self._rows else (-1, False)
+            if self._lines[line] == shown:
+                continue
+
+            self._lines[line] = shown
+            changed = True
+            # clipped and padded in cells, wide characters take two
+            text = truncate(self._rows.get(row, ""), width)
+            attr = curses.A_REVERSE if shown[1] else 0
+            try:
+                win.addstr(line, 0, text + " " * (width - text_width(text)), attr)
+            except curses.error:
+                # the last line ends in the bottom right corner, which curses writes but reports
+                # as an error as the cursor can not move past it
+                pass
+
+        if changed:
+            # the lines are written through their own window, the box has to see the change
+            win.syncup()
+            self.draw()
+
+    def redraw(self) -> None:
+        self.box.repaint()
+        self._lines = []
+        self._show()
+
+    def _on_mouse_event(self, event: MouseEvent) -> None:
+        if event.bstate & curses.BUTTON4_PRESSED:
+            self.yview_scroll(-WHEEL_ROWS)
+        elif event.bstate & curses.BUTTON5_PRESSED:
+            self.yview_scroll(WHEEL_ROWS)
+        elif event.bstate & curses.BUTTON1_CLICKED:
+            y = event.y
+            if self._scroll_frame is not None:
+                # the rectangle of the list is in the content of the scroll frame
+                point = self._scroll_frame._content_point(event.y, event.x)
+                if point is None:
+                    return
+                y = point[0]
+            line = y - self.box.rect.y - (1 if self.box.border else 0)
+            if 0 <= line < self.view_height and self.top + line < self.row_count:
+                self.selection_set(self.top + line)
+        else:
+            return
+        event.stop()
+
+    def _on_key_event(self, event: KeyEvent) -> None:
+        selection = self.selection
+        match event.key:
+            case curses.KEY_UP:
+                row = self.top if selection is None else selection - 1
+            case curses.KEY_DOWN:
+                row = self.top if selection is None else selection + 1
+            case curses.KEY_PPAGE:
+                row = (self.top if selection is None else selection) - max(1, self.view_height - 1)
+            case curses.KEY_NPAGE:
+                row = (self.top if selection is None else selection) + max(1, self.view_height - 1)
+            case curses.KEY_HOME:
+                row = 0
+            case curses.KEY_END:
+                row = self.row_count - 1
+            case _:
+                return
+
+        self.selection_set(max(0, row))
+        event.stop()
@@ -0,0 +1,154 @@
+from __future__ import annotations
+from collections import deque
+from typing import TYPE_CHECKING, Callable, Iterable
+
+from tktui.widget import BorderPos
+from tktui.widgets.list_view import ListView
+
+if TYPE_CHECKING:
+    from tktui.frame import Frame
+    from tktui.tktui import TkTui
+
+def _line_bytes(line: str) -> int:
+    return len(line) if line.isascii() else len(line.encode())
+
+class LogView(ListView):
+    """Tail of a stream of lines, like tail -f, kept in a ring buffer bounded in lines and bytes.
+
+    Lines are fed with append, extend or write, the last one taking chunks of text that do not
+    have to end on a line boundary. Once there are more than max_lines lines, or their text takes
+    more than max_bytes bytes in UTF-8, the oldest lines are dropped, so memory stays flat however
+    long the stream runs.
+
+    Feeding only queues the lines, they are drawn once per frame: the lines in view scroll with
+    curses and only the rows appended since the last frame are written. The view follows the end
+    of the log until it is scrolled up and follows it again once scrolled back to the bottom.
+
+    Lines are fed from the thread running the app, like any other change to the widgets.
+    """
+    __slots__ = ("max_lines", "max_bytes", "follow", "_ring", "_bytes", "_dropped", "_partial", "_flush_id")
+
+    def __init__(
+        self,
+        parent: Frame | TkTui,
+        x: int,
+        y: int,
+        height: int,
+        width: int,
+        max_lines: int = 10_000,
+        max_bytes: int = 1 << 20,
+        command: Callable[[int], None] | None = None,
+        border: bool = True,
+        border_title: str = "",
+        border_pos: BorderPos = BorderPos.TOP_LEFT,
+        **kwargs
+    ) -> None:
+        if max_lines <= 0 or max_bytes <= 0:
+            raise ValueError("max_lines and max_bytes must be positive")
+
+        self.max_lines = max_lines
+        self.max_bytes = max_bytes
+        # whether the view scrolls to the lines appended
+        self.follow = True
+
+        self._ring: deque[str] = deque()
+        self._bytes = 0
+        # lines dropped from the start of the ring since the last frame, the rows in view shift up
+        # by as many
+        self._dropped = 0
+        # end of the last chunk written after its last newline, waiting for the rest of its line
+        self._partial = ""
+        # id of the after_idle callback drawing the lines fed since the last frame
+        self._flush_id: str | None = None
+
+        super().__init__(
+            parent,
+            x,
+            y,
+            height,
+            width,
+            row_provider=self._ring.__getitem__,
+            command=command,
+            border=border,
+            border_title=border_title,
+            border_pos=border_pos,
+            **kwargs
+        )
+
+    @property
+    def byte_count(self) -> int:
+        """The number of bytes the text of the lines kept takes in UTF-8."""
+        return self._bytes
+
+    def append(self, line: str) -> None:
+        """Add a line at the end of the log."""
+        self.extend((line,))
+
+    def extend(self, lines: Iterable[str]) -> None:
+        """Add lines at the end of the log."""
+        ring = self._ring
+        size = self._bytes
+        for line in lines:
+            ring.append(line)
+            size += _line_bytes(line)
+        self._bytes = size
+        self._trim()
+        self._schedule_flush()
+
+    def write(self, data: str) -> None:
+        """Add a chunk of text. Its last line is held back until the newline ending it comes."""
+        lines = (self._partial + data).split("\n")
+        self._partial = lines.pop()
+        if lines:
+            self.extend(lines)
+
+    def clear(self) -> None:
+        """Drop all the lines."""
+        self._dropped += len(self._ring)
+        self._ring.clear()
+        self._bytes = 0
+        self._partial = ""
+        self._schedule_flush()
+
+    def _trim(self) -> None:
+        """Drop the oldest lines until the ring fits in max_lines and max_bytes."""
+        ring = self._ring
+        size = self._bytes
+        dropped = 0
+        while len(ring) > self.max_lines or (size > self.max_bytes and len(ring) > 1):
+            size -= _line_bytes(ring.popleft())
+            dropped += 1
+        self._bytes = size
+        self._dropped += dropped
+
+    def _schedule_flush(self) -> None:
+        if self._flush_id is None:
+            self._flush_id = self.app.after_idle(self._flush)
+
+    def _flush(self) -> None:
+        """Draw the lines fed since the last frame."""
+        self._flush_id = None
+        dropped, self._dropped = self._dropped, 0
+        if dropped:
+            # the rows keep showing the same lines under their new index
+            self.top -= dropped
+            if self.selection is not None:
+                self.selection = self.selection - dropped if self.selection >= dropped else None
+            self._rows = {row - dropped: text for row, text in self._rows.items() if row >= dropped}
+            self._lines = [
+                None if shown is None or 0 <= shown[0] < dropped
+                else shown if shown[0] < 0
+                else (shown[0] - dropped, shown[1])
+                for shown in self._lines
+            ]
+
+        self.row_count = len(self._ring)
+        if self.follow:
+            self._scroll_to(self.row_count - self.view_height, force=True)
+        else:
+            self._scroll_to(self.top, force=True)
+
+    def _scroll_to(self, top: int, force: bool = False) -> None:
+        super()._scroll_to(top, force)
+        # scrolled up the view stays where it is, at the bottom it follows the log again
+        self.follow = self.top + self.view_height >= self.row_count
@@ -1,15 +1,5 @@
-from functools import lru_cache
+from tktui.text import text_size
 
-@lru_cache
 def calculate_text_size(text: str) -> tuple[int, int]:
     """Calculates the number of rows and columns text would occupy."""
-
-    if not text:
-        return (0, 0)
-
-    txt_arr = text.strip().split("\n")
-    cols = max(len(line) for line in txt_arr)
-    rows = len(txt_arr)
-
-    return (rows, cols)
-
+    return text_size(text)